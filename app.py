@@ -7,10 +7,14 @@ Uso:
     streamlit run app.py
 """
 
+import json
 import sqlite3
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 import pandas as pd
+import pyarrow as pa
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
@@ -35,14 +39,57 @@ ENDPOINTS = {
 }
 
 
+# TTL da cache (segundos) por tipo de query: as tabelas gold so mudam quando
+# o pipeline corre (e run_pipeline limpa a cache); a silver muda a cada carga
+CACHE_TTL_GOLD = 300
+CACHE_TTL_SILVER = 60
+CACHE_MAX_ENTRIES = 4
+
+
+# Colunas categoricas (poucos valores distintos) guardadas com dictionary encoding
+COLUNAS_CATEGORICAS = ("sentimento", "categoria")
+DICT_DTYPE = pd.ArrowDtype(pa.dictionary(pa.int16(), pa.string()))
+
+
+# Estilo da coluna sentimento na tabela de artigos (calculado uma vez por carga)
+CORES_SENTIMENTO = {
+    "positive": "background-color: #d4edda",
+    "negative": "background-color: #f8d7da",
+}
+COR_SENTIMENTO_DEFAULT = "background-color: #e2e3e5"
+
+
 # ============================================================================
 # FUNCOES DE BASE DE DADOS
 # ============================================================================
 
-@st.cache_resource
+# Cache de resultados SQL em memoria (LRU), invalidada pela versao da DB
+SQL_CACHE_MAX_ENTRIES = 32
+_sql_cache = OrderedDict()
+_sql_cache_lock = threading.Lock()
+
+
+# Uma conexao de leitura por thread (sem partilhar o mutex interno do SQLite
+# entre sessoes/fragments do Streamlit)
+_tls = threading.local()
+
+
 def get_connection():
-    """Retorna conexao SQLite."""
-    return sqlite3.connect(DB_PATH, check_same_thread=False)
+    """Retorna a conexao SQLite (so de leitura) da thread actual."""
+    conn = getattr(_tls, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, isolation_level=None)
+        # WAL para leituras concorrentes com o pipeline; leituras via paginas
+        # mapeadas em memoria e cache de paginas de 128 MB
+        conn.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA query_only = 1;
+            PRAGMA mmap_size = 268435456;
+            PRAGMA cache_size = -131072;
+            PRAGMA temp_store = MEMORY;
+        """)
+        _tls.conn = conn
+    return conn
 
 
 def check_db_exists():
@@ -50,119 +97,191 @@ def check_db_exists():
     return DB_PATH.exists()
 
 
-@st.cache_data(ttl=60)
-def load_kpis():
-    """Carrega KPIs principais."""
-    if not check_db_exists():
-        return None
-
-    conn = get_connection()
-    try:
-        df = pd.read_sql_query("""
-            SELECT
-                COUNT(*) as total_artigos,
-                COUNT(DISTINCT source_id) as total_fontes,
-                AVG(sentiment_polarity) as sentimento_medio,
-                SUM(CASE WHEN sentiment_label = 'positive' THEN 1 ELSE 0 END) * 100.0 / COUNT(*) as pct_positivo
-            FROM artigos_silver
-        """, conn)
-        return df.iloc[0].to_dict()
-    except Exception:
-        return None
-
-
-@st.cache_data(ttl=60)
-def load_timeline():
-    """Carrega dados de evolucao temporal."""
-    if not check_db_exists():
-        return pd.DataFrame()
+def db_version() -> tuple:
+    """Versao da base de dados (mtime da DB e do WAL): muda a cada escrita."""
+    wal_path = DB_PATH.with_name(DB_PATH.name + "-wal")
+    return tuple(p.stat().st_mtime_ns if p.exists() else 0 for p in (DB_PATH, wal_path))
+
+
+def read_sql(sql: str, params: tuple = ()) -> pd.DataFrame:
+    """
+    Executa uma query de leitura e devolve um DataFrame.
+
+    Constroi o DataFrame directamente a partir do cursor, sem passar pela
+    camada SQL do pandas (wrapper SQLDatabase + inferencia por coluna).
+    Os resultados ficam em cache por (SQL normalizado, parametros, versao
+    da DB), partilhada entre chamadas e que sobrevive ao clear_cache().
+    """
+    key = (" ".join(sql.split()), tuple(params), db_version())
+
+    with _sql_cache_lock:
+        df = _sql_cache.get(key)
+        if df is not None:
+            _sql_cache.move_to_end(key)
+            return df.copy()
+
+    cursor = get_connection().execute(sql, params)
+    columns = [desc[0] for desc in cursor.description]
+    df = to_arrow(pd.DataFrame.from_records(cursor.fetchall(), columns=columns))
+
+    with _sql_cache_lock:
+        _sql_cache[key] = df
+        while len(_sql_cache) > SQL_CACHE_MAX_ENTRIES:
+            _sql_cache.popitem(last=False)
+    return df.copy()
+
+
+def to_arrow(df: pd.DataFrame) -> pd.DataFrame:
+    """Converte para dtypes pyarrow (strings contiguas, categoricas com dicionario)."""
+    df = df.convert_dtypes(dtype_backend="pyarrow")
+    for col in COLUNAS_CATEGORICAS:
+        if col in df.columns and pd.api.types.is_string_dtype(df[col]):
+            df[col] = df[col].astype(DICT_DTYPE)
+    return df
+
+
+# Agregados do dashboard numa unica query sobre gold_daily_summary (uma linha
+# por data/fonte/categoria, pre-agregada em processar_gold), devolvidos como
+# JSON numa so linha.
+SQL_DASHBOARD = """
+WITH kpis AS (
+    SELECT json_object(
+        'total_artigos', COALESCE(SUM(article_count), 0),
+        'total_fontes', (
+            SELECT COUNT(*) FROM (
+                SELECT 1 FROM gold_daily_summary WHERE source_id IS NOT NULL GROUP BY source_id
+            )
+        ),
+        'sentimento_medio', SUM(avg_sentiment_polarity * article_count) / SUM(article_count),
+        'pct_positivo', SUM(positive_count) * 100.0 / SUM(article_count)
+    ) as dados
+    FROM gold_daily_summary
+),
+timeline AS (
+    SELECT json_group_array(json_array(data, sentimento, artigos)) as dados
+    FROM (
+        SELECT
+            summary_date as data,
+            SUM(avg_sentiment_polarity * article_count) / SUM(article_count) as sentimento,
+            SUM(article_count) as artigos
+        FROM gold_daily_summary
+        GROUP BY summary_date
+        ORDER BY summary_date
+    )
+),
+sentimento AS (
+    SELECT json_group_array(json_array(sentimento, contagem)) as dados
+    FROM (
+        SELECT 'positive' as sentimento, SUM(positive_count) as contagem FROM gold_daily_summary
+        UNION ALL
+        SELECT 'negative', SUM(negative_count) FROM gold_daily_summary
+        UNION ALL
+        SELECT 'neutral', SUM(neutral_count) FROM gold_daily_summary
+    )
+    WHERE contagem > 0
+),
+top_fontes AS (
+    SELECT json_group_array(json_array(fonte, artigos)) as dados
+    FROM (
+        SELECT source_id as fonte, SUM(article_count) as artigos
+        FROM gold_daily_summary
+        GROUP BY source_id
+        ORDER BY artigos DESC
+        LIMIT 10
+    )
+),
+fontes AS (
+    -- GROUP BY sobre idx_gold_daily_source: leitura so do indice, ja ordenada
+    SELECT json_group_array(source_id) as dados
+    FROM (
+        SELECT source_id FROM gold_daily_summary
+        WHERE source_id IS NOT NULL
+        GROUP BY source_id
+        ORDER BY source_id
+    )
+)
+SELECT kpis.dados, timeline.dados, sentimento.dados, top_fontes.dados, fontes.dados
+FROM kpis, timeline, sentimento, top_fontes, fontes
+"""
 
-    conn = get_connection()
-    try:
-        return pd.read_sql_query("""
-            SELECT
-                pub_date as data,
-                AVG(sentiment_polarity) as sentimento,
-                COUNT(*) as artigos
-            FROM artigos_silver
-            WHERE pub_date IS NOT NULL
-            GROUP BY pub_date
-            ORDER BY pub_date
-        """, conn)
-    except Exception:
-        return pd.DataFrame()
 
+@st.cache_data(ttl=CACHE_TTL_GOLD, max_entries=CACHE_MAX_ENTRIES)
+def load_dashboard():
+    """
+    Carrega KPIs, timeline, sentimento, top fontes e lista de fontes.
 
-@st.cache_data(ttl=60)
-def load_sentiment_distribution():
-    """Carrega distribuicao de sentimento."""
+    Returns:
+        Dict com kpis, timeline, sentimento, top_fontes e fontes, ou None
+    """
     if not check_db_exists():
-        return pd.DataFrame()
+        return None
 
-    conn = get_connection()
     try:
-        return pd.read_sql_query("""
-            SELECT
-                sentiment_label as sentimento,
-                COUNT(*) as contagem
-            FROM artigos_silver
-            WHERE sentiment_label IS NOT NULL
-            GROUP BY sentiment_label
-        """, conn)
+        row = read_sql(SQL_DASHBOARD).iloc[0].tolist()
     except Exception:
-        return pd.DataFrame()
-
-
-@st.cache_data(ttl=60)
-def load_top_sources(limit=10):
-    """Carrega top fontes."""
-    if not check_db_exists():
-        return pd.DataFrame()
+        return None
 
-    conn = get_connection()
-    try:
-        return pd.read_sql_query(f"""
-            SELECT
-                source_id as fonte,
-                COUNT(*) as artigos
-            FROM artigos_silver
-            GROUP BY source_id
-            ORDER BY artigos DESC
-            LIMIT {limit}
-        """, conn)
-    except Exception:
-        return pd.DataFrame()
+    kpis, timeline, sentimento, top_fontes, fontes = (json.loads(col) for col in row)
+    return {
+        "kpis": kpis,
+        "timeline": to_arrow(pd.DataFrame(timeline, columns=["data", "sentimento", "artigos"])),
+        "sentimento": to_arrow(pd.DataFrame(sentimento, columns=["sentimento", "contagem"])),
+        "top_fontes": to_arrow(pd.DataFrame(top_fontes, columns=["fonte", "artigos"])),
+        "fontes": fontes,
+    }
+
+
+# gold_trending_topics guarda um top N por pub_date (todo o historico): o
+# grafico mostra o do dia mais recente, senao cada termo repetia-se por data
+SQL_TRENDING_TOPICS = """
+SELECT
+    term as termo,
+    frequency as frequencia
+FROM gold_trending_topics
+WHERE topic_date = (SELECT MAX(topic_date) FROM gold_trending_topics)
+ORDER BY frequency DESC, term
+LIMIT ?
+"""
 
 
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=CACHE_TTL_GOLD, max_entries=CACHE_MAX_ENTRIES)
 def load_trending_topics(limit=15):
     """Carrega trending topics."""
     if not check_db_exists():
         return pd.DataFrame()
 
-    conn = get_connection()
     try:
-        return pd.read_sql_query(f"""
-            SELECT
-                term as termo,
-                frequency as frequencia
-            FROM gold_trending_topics
-            ORDER BY frequency DESC
-            LIMIT {limit}
-        """, conn)
+        return read_sql(SQL_TRENDING_TOPICS, (limit,))
     except Exception:
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=60)
-def load_recent_articles(limit=20):
-    """Carrega artigos recentes."""
+@st.cache_data(ttl=CACHE_TTL_SILVER, max_entries=CACHE_MAX_ENTRIES)
+def load_recent_articles(limit=20, sentiments: tuple = (), sources: tuple = ()):
+    """
+    Carrega artigos recentes, filtrando por sentimento e fonte na query.
+
+    Args:
+        limit: Numero maximo de artigos
+        sentiments: Sentimentos a incluir (vazio = todos)
+        sources: source_id a incluir (vazio = todas)
+    """
     if not check_db_exists():
         return pd.DataFrame()
 
-    conn = get_connection()
+    conditions = []
+    params = []
+    if sentiments:
+        conditions.append(f"sentiment_label IN ({', '.join(['?'] * len(sentiments))})")
+        params.extend(sentiments)
+    if sources:
+        conditions.append(f"source_id IN ({', '.join(['?'] * len(sources))})")
+        params.extend(sources)
+
+    where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+
     try:
-        return pd.read_sql_query(f"""
+        df = read_sql(f"""
             SELECT
                 title_clean as titulo,
                 source_name as fonte,
@@ -170,27 +289,19 @@ def load_recent_articles(limit=20):
                 sentiment_label as sentimento,
                 category_primary as categoria
             FROM artigos_silver
+            {where_clause}
             ORDER BY pub_date DESC, processed_at DESC
-            LIMIT {limit}
-        """, conn)
+            LIMIT ?
+        """, (*params, limit))
     except Exception:
         return pd.DataFrame()
 
-
-@st.cache_data(ttl=60)
-def load_sources_list():
-    """Carrega lista de fontes unicas."""
-    if not check_db_exists():
-        return []
-
-    conn = get_connection()
-    try:
-        df = pd.read_sql_query("""
-            SELECT DISTINCT source_id FROM artigos_silver ORDER BY source_id
-        """, conn)
-        return df["source_id"].tolist()
-    except Exception:
-        return []
+    # Cor de fundo pre-calculada (fica em cache com os dados)
+    if not df.empty:
+        df["_cor"] = (
+            df["sentimento"].astype(object).map(CORES_SENTIMENTO).fillna(COR_SENTIMENTO_DEFAULT)
+        )
+    return df
 
 
 def clear_cache():
@@ -209,12 +320,10 @@ def run_pipeline(endpoint: str, size: int, process_silver: bool, process_gold: b
         fetch_news,
         json_to_dataframe,
         salvar_json_raw,
-        salvar_csv,
         salvar_parquet,
-        filtrar_duplicados,
         ENDPOINTS as EP_CONFIG,
     )
-    from src.db.loader import criar_tabela, carregar_csv as db_carregar_csv
+    from src.db.loader import abrir_conexao, criar_tabela, carregar_dataframe, filtrar_existentes
     from datetime import datetime, timezone
 
     project_root = Path(__file__).parent
@@ -252,36 +361,39 @@ def run_pipeline(endpoint: str, size: int, process_silver: bool, process_gold: b
     if df.empty:
         return {"status": "warning", "message": "Nenhum artigo retornado pela API"}
 
-    # Filtrar duplicados
-    df_novos = filtrar_duplicados(df, output_dir, endpoint)
+    conn = abrir_conexao(db_path)
+    try:
+        criar_tabela(conn)
 
-    if df_novos.empty:
-        return {"status": "info", "message": f"Todos os {len(df)} artigos ja existem"}
+        # Filtrar duplicados contra a DB (lookup pela chave primaria)
+        df_novos = filtrar_existentes(conn, df)
 
-    # Salvar CSV e Parquet
-    csv_path = salvar_csv(df_novos, output_dir, timestamp, endpoint)
-    salvar_parquet(df_novos, output_dir, timestamp, endpoint)
+        if df_novos.empty:
+            return {"status": "info", "message": f"Todos os {len(df)} artigos ja existem"}
 
-    # Carregar na DB
-    conn = sqlite3.connect(db_path)
-    criar_tabela(conn)
-    db_carregar_csv(conn, csv_path, endpoint)
+        # Salvar Parquet
+        parquet_path = salvar_parquet(df_novos, output_dir, timestamp, endpoint)
 
-    result = {"status": "success", "artigos_novos": len(df_novos)}
+        # Carregar na DB (directamente do DataFrame, sem reler o ficheiro)
+        carregar_dataframe(conn, df_novos, endpoint, parquet_path.name)
 
-    # Processar Silver
-    if process_silver:
-        from src.silver.transform import processar_silver
-        n_silver = processar_silver(conn, verbose=False)
-        result["silver"] = n_silver
+        result = {"status": "success", "artigos_novos": len(df_novos)}
 
-    # Processar Gold
-    if process_gold and process_silver:
-        from src.gold.aggregate import processar_gold
-        gold_stats = processar_gold(conn, verbose=False)
-        result["gold"] = sum(gold_stats.values())
+        # Processar Silver
+        if process_silver:
+            from src.silver.transform import processar_silver
+            # Sem pool de processos: nao fazer fork dentro do servidor
+            # Streamlit (multithreaded); o pool fica para o CLI
+            n_silver = processar_silver(conn, verbose=False, workers=1)
+            result["silver"] = n_silver
 
-    conn.close()
+        # Processar Gold
+        if process_gold and process_silver:
+            from src.gold.aggregate import processar_gold
+            gold_stats = processar_gold(conn, verbose=False)
+            result["gold"] = sum(gold_stats.values())
+    finally:
+        conn.close()
 
     # Limpar cache
     clear_cache()
@@ -289,10 +401,152 @@ def run_pipeline(endpoint: str, size: int, process_silver: bool, process_gold: b
     return result
 
 
+# ============================================================================
+# GRAFICOS
+# ============================================================================
+
+# As figuras ficam em cache (chave = hash dos dados), para nao serem
+# reconstruidas a cada rerun enquanto os dados gold nao mudam
+
+@st.cache_resource(ttl=CACHE_TTL_GOLD, max_entries=CACHE_MAX_ENTRIES)
+def build_timeline_fig(df_timeline: pd.DataFrame) -> go.Figure:
+    """Grafico de sentimento medio e artigos por dia."""
+    # Datas como strings ISO (o Plotly nao converte ponto a ponto) e
+    # trace WebGL para a linha
+    datas = df_timeline["data"].astype("string[pyarrow]").to_numpy(dtype=object)
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scattergl(
+        x=datas,
+        y=df_timeline["sentimento"],
+        name="Sentimento",
+        line=dict(color="#1f77b4", width=2),
+        yaxis="y"
+    ))
+
+    fig.add_trace(go.Bar(
+        x=datas,
+        y=df_timeline["artigos"],
+        name="Artigos",
+        marker_color="#90EE90",
+        opacity=0.5,
+        yaxis="y2"
+    ))
+
+    fig.update_layout(
+        yaxis=dict(title="Sentimento", side="left", range=[-1, 1]),
+        yaxis2=dict(title="Artigos", side="right", overlaying="y"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02),
+        margin=dict(t=30, b=30),
+        height=300,
+    )
+    return fig
+
+
+@st.cache_resource(ttl=CACHE_TTL_GOLD, max_entries=CACHE_MAX_ENTRIES)
+def build_sentiment_fig(df_sentiment: pd.DataFrame) -> go.Figure:
+    """Grafico circular da distribuicao de sentimento."""
+    colors = {"positive": "#2ecc71", "negative": "#e74c3c", "neutral": "#95a5a6"}
+
+    fig = px.pie(
+        df_sentiment,
+        values="contagem",
+        names="sentimento",
+        color="sentimento",
+        color_discrete_map=colors,
+        hole=0.4,
+    )
+    fig.update_layout(margin=dict(t=20, b=20), height=300)
+    return fig
+
+
+@st.cache_resource(ttl=CACHE_TTL_GOLD, max_entries=CACHE_MAX_ENTRIES)
+def build_sources_fig(df_sources: pd.DataFrame) -> go.Figure:
+    """Grafico de barras das fontes com mais artigos."""
+    fig = px.bar(
+        df_sources,
+        x="artigos",
+        y="fonte",
+        orientation="h",
+        color="artigos",
+        color_continuous_scale="Blues",
+    )
+    fig.update_layout(
+        margin=dict(t=20, b=20),
+        height=300,
+        showlegend=False,
+        yaxis=dict(categoryorder="total ascending"),
+        coloraxis_showscale=False,
+    )
+    return fig
+
+
+@st.cache_resource(ttl=CACHE_TTL_GOLD, max_entries=CACHE_MAX_ENTRIES)
+def build_trending_fig(df_trending: pd.DataFrame) -> go.Figure:
+    """Grafico de barras dos trending topics."""
+    fig = px.bar(
+        df_trending,
+        x="frequencia",
+        y="termo",
+        orientation="h",
+        color="frequencia",
+        color_continuous_scale="Oranges",
+    )
+    fig.update_layout(
+        margin=dict(t=20, b=20),
+        height=400,
+        yaxis=dict(categoryorder="total ascending"),
+        coloraxis_showscale=False,
+    )
+    return fig
+
+
 # ============================================================================
 # INTERFACE
 # ============================================================================
 
+@st.fragment
+def render_articles(sources: list):
+    """Tabela de artigos recentes com filtros (rerun so deste bloco)."""
+    st.subheader("📋 Artigos Recentes")
+
+    col_sources, col_sent = st.columns(2)
+
+    with col_sources:
+        selected_sources = st.multiselect(
+            "Fontes",
+            options=sources,
+            default=[],
+            placeholder="Todas as fontes"
+        )
+
+    with col_sent:
+        selected_sentiment = st.multiselect(
+            "Sentimento",
+            options=["positive", "negative", "neutral"],
+            default=[],
+            placeholder="Todos"
+        )
+
+    df_articles = load_recent_articles(
+        sentiments=tuple(selected_sentiment),
+        sources=tuple(selected_sources),
+    )
+
+    if not df_articles.empty:
+        # Formatar sentimento com a coluna de cores pre-calculada (uma chamada
+        # por coluna em vez de um callback por celula)
+        st.dataframe(
+            df_articles.style.apply(lambda _: df_articles["_cor"], subset=["sentimento"]),
+            column_order=[col for col in df_articles.columns if col != "_cor"],
+            use_container_width=True,
+            height=400,
+        )
+    else:
+        st.info("Sem artigos disponiveis")
+
+
 def main():
     """Funcao principal da app."""
 
@@ -342,24 +596,6 @@ def main():
 
         st.divider()
 
-        # Filtros
-        st.header("🔍 Filtros")
-
-        sources = load_sources_list()
-        selected_sources = st.multiselect(
-            "Fontes",
-            options=sources,
-            default=[],
-            placeholder="Todas as fontes"
-        )
-
-        selected_sentiment = st.multiselect(
-            "Sentimento",
-            options=["positive", "negative", "neutral"],
-            default=[],
-            placeholder="Todos"
-        )
-
         if st.button("🔄 Actualizar Dashboard", use_container_width=True):
             clear_cache()
             st.rerun()
@@ -373,13 +609,15 @@ def main():
         st.info("👈 Use a sidebar para executar o pipeline e carregar dados.")
         return
 
-    # KPIs
-    kpis = load_kpis()
+    dados = load_dashboard()
 
-    if kpis is None:
-        st.warning("⚠️ Sem dados na camada Silver. Execute o pipeline com 'Processar Silver' activo.")
+    # KPIs
+    if dados is None:
+        st.warning("⚠️ Sem dados na camada Gold. Execute o pipeline com 'Calcular Gold' activo.")
         return
 
+    kpis = dados["kpis"]
+
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
@@ -402,37 +640,10 @@ def main():
     # Grafico 1: Timeline
     st.subheader("📈 Evolucao Temporal")
 
-    df_timeline = load_timeline()
+    df_timeline = dados["timeline"]
 
     if not df_timeline.empty:
-        fig = go.Figure()
-
-        fig.add_trace(go.Scatter(
-            x=df_timeline["data"],
-            y=df_timeline["sentimento"],
-            name="Sentimento",
-            line=dict(color="#1f77b4", width=2),
-            yaxis="y"
-        ))
-
-        fig.add_trace(go.Bar(
-            x=df_timeline["data"],
-            y=df_timeline["artigos"],
-            name="Artigos",
-            marker_color="#90EE90",
-            opacity=0.5,
-            yaxis="y2"
-        ))
-
-        fig.update_layout(
-            yaxis=dict(title="Sentimento", side="left", range=[-1, 1]),
-            yaxis2=dict(title="Artigos", side="right", overlaying="y"),
-            legend=dict(orientation="h", yanchor="bottom", y=1.02),
-            margin=dict(t=30, b=30),
-            height=300,
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_timeline_fig(df_timeline), use_container_width=True)
     else:
         st.info("Sem dados temporais disponiveis")
 
@@ -442,47 +653,20 @@ def main():
     with col_sent:
         st.subheader("🥧 Distribuicao Sentimento")
 
-        df_sentiment = load_sentiment_distribution()
+        df_sentiment = dados["sentimento"]
 
         if not df_sentiment.empty:
-            colors = {"positive": "#2ecc71", "negative": "#e74c3c", "neutral": "#95a5a6"}
-            df_sentiment["cor"] = df_sentiment["sentimento"].map(colors)
-
-            fig = px.pie(
-                df_sentiment,
-                values="contagem",
-                names="sentimento",
-                color="sentimento",
-                color_discrete_map=colors,
-                hole=0.4,
-            )
-            fig.update_layout(margin=dict(t=20, b=20), height=300)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(build_sentiment_fig(df_sentiment), use_container_width=True)
         else:
             st.info("Sem dados de sentimento")
 
     with col_sources:
         st.subheader("📊 Top Fontes")
 
-        df_sources = load_top_sources()
+        df_sources = dados["top_fontes"]
 
         if not df_sources.empty:
-            fig = px.bar(
-                df_sources,
-                x="artigos",
-                y="fonte",
-                orientation="h",
-                color="artigos",
-                color_continuous_scale="Blues",
-            )
-            fig.update_layout(
-                margin=dict(t=20, b=20),
-                height=300,
-                showlegend=False,
-                yaxis=dict(categoryorder="total ascending"),
-                coloraxis_showscale=False,
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(build_sources_fig(df_sources), use_container_width=True)
         else:
             st.info("Sem dados de fontes")
 
@@ -492,53 +676,12 @@ def main():
     df_trending = load_trending_topics()
 
     if not df_trending.empty:
-        fig = px.bar(
-            df_trending,
-            x="frequencia",
-            y="termo",
-            orientation="h",
-            color="frequencia",
-            color_continuous_scale="Oranges",
-        )
-        fig.update_layout(
-            margin=dict(t=20, b=20),
-            height=400,
-            yaxis=dict(categoryorder="total ascending"),
-            coloraxis_showscale=False,
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_trending_fig(df_trending), use_container_width=True)
     else:
         st.info("Sem trending topics. Execute o pipeline com 'Calcular Gold' activo.")
 
-    # Tabela: Artigos recentes
-    st.subheader("📋 Artigos Recentes")
-
-    df_articles = load_recent_articles()
-
-    if not df_articles.empty:
-        # Aplicar filtros se selecionados
-        if selected_sources:
-            # Filtrar por fonte (se a coluna existir com nome diferente)
-            pass  # A query ja retorna source_name, nao source_id
-
-        if selected_sentiment:
-            df_articles = df_articles[df_articles["sentimento"].isin(selected_sentiment)]
-
-        # Formatar sentimento com cores
-        def color_sentiment(val):
-            if val == "positive":
-                return "background-color: #d4edda"
-            elif val == "negative":
-                return "background-color: #f8d7da"
-            return "background-color: #e2e3e5"
-
-        st.dataframe(
-            df_articles.style.applymap(color_sentiment, subset=["sentimento"]),
-            use_container_width=True,
-            height=400,
-        )
-    else:
-        st.info("Sem artigos disponiveis")
+    # Tabela: Artigos recentes (filtros dentro do fragment)
+    render_articles(dados["fontes"])
 
 
 if __name__ == "__main__":
@@ -11,8 +11,10 @@ setup(
     python_requires=">=3.10",
     install_requires=[
         "requests>=2.31.0",
+        "orjson>=3.9.0",
         "python-dotenv>=1.0.0",
         "pandas>=2.0.0",
+        "pyarrow>=14.0.0",
     ],
     extras_require={
         "dev": [
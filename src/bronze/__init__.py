@@ -2,5 +2,5 @@
 Bronze Layer – Ingestão de dados brutos.
 
 Pipeline:
-    API → JSON (raw) → DataFrame → CSV
+    API → JSON (raw) → DataFrame → Parquet (+ CSV opcional)
 """
@@ -5,29 +5,28 @@ Exemplo simples e direto:
 1. Definir API Key
 2. Fazer request na NewsData.io (Latest ou Crypto)
 3. Converter JSON → pandas DataFrame
-4. Salvar CSV (bronze)
+4. Salvar Parquet (bronze); CSV opcional com --csv
 
 Uso:
     python -m src.bronze.ingest [opções]
 """
 
 import argparse
-import io
-import json
 import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+import orjson
 import requests
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from src.utils.console import ensure_utf8
 
-# Forcar UTF-8 no stdout/stderr (Windows cp1252 nao suporta caracteres especiais)
-if sys.stdout.encoding != "utf-8":
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-if sys.stderr.encoding != "utf-8":
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
 
 
 # ============================================================================
@@ -70,6 +69,23 @@ ENDPOINTS = {
 }
 
 
+# Sessao HTTP partilhada: reutiliza a ligacao TCP/TLS entre pedidos
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+
+# Colunas do DataFrame bronze (ordem das colunas nos ficheiros tabulares)
+COLUNAS_BRONZE = [
+    "title", "description", "content",
+    "source_id", "source_name", "source_url", "creator",
+    "pubDate", "category", "country", "language",
+    "link", "image_url", "article_id",
+]
+
+# Campos que a API devolve como listas de strings
+COLUNAS_LISTA = ("creator", "category", "country")
+
+
 # ============================================================================
 # [1] CONFIGURACAO
 # ============================================================================
@@ -149,7 +165,7 @@ def fetch_news(
     print(f"      Endpoint: {endpoint_config['nome']}")
     print(f"      Parametros: {', '.join(f'{k}={v}' for k, v in params.items() if k != 'apikey')}")
     
-    response = requests.get(base_url, params=params, timeout=30)
+    response = SESSION.get(base_url, params=params, timeout=(5, 30))
     
     print(f"   Status: {response.status_code}")
     
@@ -177,9 +193,9 @@ def salvar_json_raw(data: dict, output_dir: Path, timestamp: str, endpoint: str
         Caminho do ficheiro guardado
     """
     raw_path = output_dir / f"newsdata_{endpoint}_raw_{timestamp}.json"
-    
-    with open(raw_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+
+    # orjson serializa em C directamente para bytes UTF-8 (sem escapes ASCII)
+    raw_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     
     print(f"[SAVE] JSON raw guardado: {raw_path}")
     return raw_path
@@ -189,6 +205,21 @@ def salvar_json_raw(data: dict, output_dir: Path, timestamp: str, endpoint: str
 # [4] CONVERTER JSON -> DATAFRAME
 # ============================================================================
 
+def juntar_listas(listas: pa.Array, separador: str = ", ") -> pa.Array:
+    """
+    Junta cada lista de strings numa string (ex: categorias "a, b").
+
+    Args:
+        listas: Array Arrow do tipo list<string>
+        separador: Separador entre elementos
+
+    Returns:
+        Array de strings (None para listas vazias ou em falta)
+    """
+    juntas = pc.binary_join(listas, separador)
+    return pc.if_else(pc.greater(pc.list_value_length(listas), 0), juntas, None)
+
+
 def json_to_dataframe(data: dict) -> pd.DataFrame:
     """
     Converte JSON da API para DataFrame
@@ -211,35 +242,17 @@ def json_to_dataframe(data: dict) -> pd.DataFrame:
         print("[AVISO] Nenhum resultado encontrado")
         return pd.DataFrame()
     
-    rows = []
-    
-    for item in results:
-        # Extrair categorias como string
-        categories = item.get("category", [])
-        category_str = ", ".join(categories) if categories else None
-        
-        # Extrair criadores como string
-        creators = item.get("creator", [])
-        creator_str = ", ".join(creators) if creators else None
-        
-        rows.append({
-            "title": item.get("title"),
-            "description": item.get("description"),
-            "content": item.get("content"),
-            "source_id": item.get("source_id"),
-            "source_name": item.get("source_name"),
-            "source_url": item.get("source_url"),
-            "creator": creator_str,
-            "pubDate": item.get("pubDate"),
-            "category": category_str,
-            "country": ", ".join(item.get("country", [])) if item.get("country") else None,
-            "language": item.get("language"),
-            "link": item.get("link"),
-            "image_url": item.get("image_url"),
-            "article_id": item.get("article_id"),
-        })
-    
-    df = pd.DataFrame(rows)
+    # Colunas construidas directamente em Arrow; as listas (categorias,
+    # criadores, paises) ficam como list<string> e sao juntas numa so chamada
+    colunas = {}
+    for col in COLUNAS_BRONZE:
+        valores = [item.get(col) for item in results]
+        if col in COLUNAS_LISTA:
+            colunas[col] = juntar_listas(pa.array(valores, type=pa.list_(pa.string())))
+        else:
+            colunas[col] = pa.array(valores, type=pa.string())
+
+    df = pa.table(colunas).to_pandas()
     print(f"[DATA] DataFrame criado: {len(df)} linhas x {len(df.columns)} colunas")
     
     return df
@@ -356,7 +369,7 @@ def salvar_parquet(df: pd.DataFrame, output_dir: Path, timestamp: str, endpoint:
     """
     parquet_path = output_dir / f"newsdata_{endpoint}_tabular_{timestamp}.parquet"
 
-    df.to_parquet(parquet_path, index=False, engine="pyarrow")
+    df.to_parquet(parquet_path, index=False, engine="pyarrow", compression="snappy")
 
     print(f"[SAVE] Parquet tabular guardado: {parquet_path}")
     return parquet_path
@@ -412,12 +425,18 @@ Exemplos:
         default=10,
         help="Número de resultados (1-50, default: 10)"
     )
+    parser.add_argument(
+        "--csv",
+        action="store_true",
+        help="Gravar também o CSV tabular (por defeito só Parquet)"
+    )
     
     return parser.parse_args()
 
 
 def main() -> int:
     """Pipeline Bronze principal"""
+    ensure_utf8()
 
     print("\n" + "=" * 60)
     print("    NEWSDATA.IO - PIPELINE BRONZE")
@@ -494,18 +513,24 @@ def main() -> int:
     [JSON] {raw_path.name}
            -> JSON original da API guardado (para referencia)
 
-    Nenhum ficheiro CSV/Parquet criado (sem dados novos).
+    Nenhum ficheiro Parquet criado (sem dados novos).
 """)
             return 0
 
-        # [7] Salvar CSV
-        print("\n[6] A salvar CSV (bronze tabular)...")
-        csv_path = salvar_csv(df_novos, output_dir, timestamp, args.endpoint)
-
-        # [8] Salvar Parquet
-        print("\n[7] A salvar Parquet (bronze tabular)...")
+        # [7] Salvar Parquet
+        print("\n[6] A salvar Parquet (bronze tabular)...")
         parquet_path = salvar_parquet(df_novos, output_dir, timestamp, args.endpoint)
 
+        # [8] Salvar CSV (opcional)
+        csv_info = ""
+        if args.csv:
+            print("\n[7] A salvar CSV (bronze tabular)...")
+            csv_path = salvar_csv(df_novos, output_dir, timestamp, args.endpoint)
+            csv_info = f"""
+    [CSV] {csv_path.name}
+          -> Dados tabulares CSV ({len(df_novos)} registos novos)
+"""
+
         # Conclusao
         print("\n" + "=" * 60)
         print("[OK] PIPELINE BRONZE EXECUTADA COM SUCESSO!")
@@ -517,28 +542,24 @@ def main() -> int:
     [JSON] {raw_path.name}
            -> JSON original da API (raw)
 
-    [CSV] {csv_path.name}
-          -> Dados tabulares CSV ({len(df_novos)} registos novos)
-
     [PARQUET] {parquet_path.name}
               -> Dados tabulares Parquet ({len(df_novos)} registos novos)
-
-    Pipeline: API -> JSON (raw) -> DataFrame -> Dedup -> CSV + Parquet
+{csv_info}
+    Pipeline: API -> JSON (raw) -> DataFrame -> Dedup -> Parquet
 """)
 
         # Perguntar se quer carregar na DB
         resposta = input("[DB] Carregar dados na base de dados SQLite? (s/N): ").strip().lower()
         if resposta == "s":
-            import sqlite3
-            from src.db.loader import criar_tabela, carregar_csv as db_carregar_csv
+            from src.db.loader import abrir_conexao, criar_tabela, carregar_dataframe
 
             db_dir = project_root / "db"
             db_dir.mkdir(parents=True, exist_ok=True)
             db_path = db_dir / "newsdata.db"
 
-            conn = sqlite3.connect(db_path)
+            conn = abrir_conexao(db_path)
             criar_tabela(conn)
-            db_carregar_csv(conn, csv_path, args.endpoint)
+            carregar_dataframe(conn, df_novos, args.endpoint, parquet_path.name)
             print(f"[OK] Dados carregados em {db_path}")
 
             # Perguntar se quer processar Silver
@@ -8,19 +8,29 @@ Scraping de páginas da Wikipédia portuguesa:
 4. Salvar JSON raw + CSV (bronze)
 
 Uso:
-    python -m src.bronze.wiki_scraper
+    python -m src.bronze.wiki_scraper [opções]
 """
 
-import json
+import argparse
+import csv
+import re
 import sqlite3
 import sys
-import io
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING
 from urllib.parse import unquote, urlparse
 
+import orjson
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.utils.console import ensure_utf8
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 # ============================================================================
@@ -29,6 +39,9 @@ import pandas as pd
 
 MAX_PAGINAS = 10
 
+# Limite de pedidos em simultâneo à Wikipédia (evita respostas 429)
+MAX_PEDIDOS_PARALELOS = 8
+
 IDIOMAS = {
     "pt": {
         "nome": "Portugues",
@@ -40,10 +53,33 @@ IDIOMAS = {
     },
 }
 
+# URL de página da Wikipédia (ex: https://pt.wikipedia.org/wiki/Python)
+RE_URL_WIKI = re.compile(r"^https?://[a-z]{2,3}(?:\.m)?\.wikipedia\.org/wiki/([^?#]+?)/?$")
+
 HEADERS = {
     "User-Agent": "NewsDataBot/1.0 (educational project; Python/requests)",
 }
 
+# Erros transitórios (limite de pedidos, 5xx) são repetidos com backoff
+# exponencial, respeitando o Retry-After, em vez de perder a página
+RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(["GET"]),
+    respect_retry_after_header=True,
+)
+
+# Sessão HTTP partilhada: reutiliza as ligações TCP/TLS (keep-alive) entre
+# pedidos, com um pool à medida dos pedidos em paralelo
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=len(IDIOMAS),
+    pool_maxsize=MAX_PEDIDOS_PARALELOS,
+    max_retries=RETRY,
+))
+
 
 def obter_urls(idioma: str = "pt") -> tuple[str, str]:
     """
@@ -86,11 +122,12 @@ def pesquisar_por_tema(tema: str, api_url: str, limite: int = MAX_PAGINAS) -> li
     }
 
     print(f"   A pesquisar '{tema}'...")
-    response = requests.get(api_url, params=params, headers=HEADERS, timeout=30)
+    response = SESSION.get(api_url, params=params, timeout=30)
     response.raise_for_status()
 
     data = response.json()
-    titulos = data[1] if len(data) > 1 else []
+    # dict.fromkeys remove duplicados mantendo a ordem
+    titulos = list(dict.fromkeys(data[1] if len(data) > 1 else []))
 
     print(f"   Encontrados: {len(titulos)} resultados")
     return titulos[:limite]
@@ -122,12 +159,13 @@ def obter_aleatorias(api_url: str, limite: int = MAX_PAGINAS) -> list[str]:
     }
 
     print(f"   A obter {limite} páginas aleatórias...")
-    response = requests.get(api_url, params=params, headers=HEADERS, timeout=30)
+    response = SESSION.get(api_url, params=params, timeout=30)
     response.raise_for_status()
 
     data = response.json()
     paginas = data.get("query", {}).get("random", [])
-    titulos = [p["title"] for p in paginas]
+    # A API pode, raramente, devolver a mesma página duas vezes
+    titulos = list(dict.fromkeys(p["title"] for p in paginas))
 
     print(f"   Obtidas: {len(titulos)} páginas")
     return titulos[:limite]
@@ -148,7 +186,13 @@ def extrair_titulos_de_urls(urls: list[str]) -> list[str]:
         Lista de títulos extraídos
     """
     titulos = []
-    for url in urls[:MAX_PAGINAS]:
+    for url in urls:
+        # Caminho rápido para URLs normais da Wikipédia (um só match)
+        match = RE_URL_WIKI.match(url)
+        if match:
+            titulos.append(unquote(match.group(1)).replace("_", " "))
+            continue
+
         parsed = urlparse(url)
         if "/wiki/" in parsed.path:
             titulo = unquote(parsed.path.split("/wiki/")[-1])
@@ -157,20 +201,77 @@ def extrair_titulos_de_urls(urls: list[str]) -> list[str]:
         else:
             print(f"   Aviso: URL ignorado (formato inválido): {url}")
 
-    return titulos
+    # O mesmo URL colado duas vezes não gera um pedido repetido
+    return list(dict.fromkeys(titulos))[:MAX_PAGINAS]
 
 
 # ============================================================================
 # [4] EXTRAIR RESUMO DE UMA PAGINA
 # ============================================================================
 
-def extrair_resumo(titulo: str, rest_url: str) -> dict | None:
+def obter_json_condicional(url: str, cache_db: Path) -> dict:
+    """
+    GET com validação (ETag / Last-Modified) contra a cache em http_cache.
+
+    Se a página já estiver em cache, envia If-None-Match / If-Modified-Since;
+    uma resposta 304 não traz corpo e devolve o JSON guardado.
+
+    Args:
+        url: URL a pedir
+        cache_db: Base de dados SQLite com a tabela http_cache já criada
+            (ver criar_tabela_http_cache)
+
+    Returns:
+        JSON da resposta (ou da cache, se não mudou)
+    """
+    # Uma conexão por chamada: extrair_resumo corre em várias threads e uma
+    # conexão sqlite3 não se partilha entre elas
+    conn = sqlite3.connect(cache_db, timeout=30)
+    try:
+        row = conn.execute(
+            "SELECT etag, last_modified, body FROM http_cache WHERE url = ?", (url,)
+        ).fetchone()
+
+        headers = {}
+        if row:
+            etag, last_modified, _ = row
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response = SESSION.get(url, headers=headers, timeout=30)
+
+        if row and response.status_code == 304:
+            return orjson.loads(row[2])
+
+        response.raise_for_status()
+
+        conn.execute(
+            "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, body, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                url,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                response.content,
+                datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+            ),
+        )
+        conn.commit()
+        return response.json()
+    finally:
+        conn.close()
+
+
+def extrair_resumo(titulo: str, rest_url: str, cache_db: Path | None = None) -> dict | None:
     """
     Extrai título e resumo de uma página da Wikipédia via REST API.
 
     Args:
         titulo: Título da página
         rest_url: URL base da REST API
+        cache_db: Base de dados para a cache HTTP (None = sem cache)
 
     Returns:
         Dicionário com titulo, resumo, url, pageid ou None se falhar
@@ -179,9 +280,12 @@ def extrair_resumo(titulo: str, rest_url: str) -> dict | None:
     url = f"{rest_url}/{titulo_url}"
 
     try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        if cache_db:
+            data = obter_json_condicional(url, cache_db)
+        else:
+            response = SESSION.get(url, timeout=30)
+            response.raise_for_status()
+            data = response.json()
 
         return {
             "titulo": data.get("title", titulo),
@@ -199,24 +303,106 @@ def extrair_resumo(titulo: str, rest_url: str) -> dict | None:
 # [5] SCRAPING COMPLETO
 # ============================================================================
 
-def scrape_paginas(titulos: list[str], rest_url: str) -> list[dict]:
+def extrair_resumos_em_lote(titulos: list[str], api_url: str) -> dict[str, dict]:
+    """
+    Extrai os resumos de várias páginas num só pedido (prop=extracts).
+
+    Args:
+        titulos: Lista de títulos (máx 20 por pedido)
+        api_url: URL da API MediaWiki
+
+    Returns:
+        Dicionário título pedido -> dados (titulo, resumo, url, pageid);
+        títulos inexistentes ficam de fora
+    """
+    params = {
+        "action": "query",
+        "prop": "extracts|info",
+        "exintro": 1,
+        "explaintext": 1,
+        "exlimit": "max",
+        "inprop": "url",
+        "redirects": 1,
+        "titles": "|".join(titulos),
+        "format": "json",
+    }
+
+    response = SESSION.get(api_url, params=params, timeout=30)
+    response.raise_for_status()
+    query = response.json().get("query", {})
+
+    # Título pedido -> título final (normalização e redirects da API)
+    destino = {t: t for t in titulos}
+    for chave in ("normalized", "redirects"):
+        mapa = {m["from"]: m["to"] for m in query.get(chave, [])}
+        destino = {t: mapa.get(final, final) for t, final in destino.items()}
+
+    paginas = {
+        p["title"]: {
+            "titulo": p["title"],
+            "resumo": p.get("extract", ""),
+            "url": p.get("fullurl", ""),
+            "pageid": p.get("pageid", ""),
+        }
+        for p in query.get("pages", {}).values()
+        if "missing" not in p and "invalid" not in p
+    }
+
+    return {t: paginas[final] for t, final in destino.items() if final in paginas}
+
+
+def scrape_paginas(titulos: list[str], rest_url: str,
+                   concurrency: int = MAX_PEDIDOS_PARALELOS,
+                   cache_db: Path | None = None,
+                   api_url: str | None = None,
+                   timestamp: str | None = None) -> list[dict]:
     """
     Faz scraping de uma lista de páginas da Wikipédia.
 
+    Com api_url, os resumos vêm de um só pedido em lote; a REST API por
+    página fica apenas para os títulos que faltarem na resposta.
+
     Args:
         titulos: Lista de títulos (máx 10)
         rest_url: URL base da REST API
+        concurrency: Número máximo de pedidos em simultâneo
+        cache_db: Base de dados para a cache HTTP (None = sem cache)
+        api_url: URL da API MediaWiki para o pedido em lote (opcional)
+        timestamp: Timestamp ISO da execução (None = agora)
 
     Returns:
         Lista de dicionários com dados extraídos
     """
     titulos = titulos[:MAX_PAGINAS]
     resultados = []
-    timestamp = datetime.now(timezone.utc).isoformat()
-
-    for i, titulo in enumerate(titulos, 1):
-        print(f"   [{i}/{len(titulos)}] A extrair: {titulo}")
-        dados = extrair_resumo(titulo, rest_url)
+    timestamp = timestamp or datetime.now(timezone.utc).isoformat()
+
+    if not titulos:
+        print("   Total extraído: 0 páginas")
+        return resultados
+
+    resumos = {}
+    if api_url:
+        print(f"   A extrair {len(titulos)} resumos num só pedido...")
+        try:
+            resumos = extrair_resumos_em_lote(titulos, api_url)
+        except requests.RequestException as e:
+            print(f"   Erro no pedido em lote: {e}")
+
+    em_falta = [t for t in titulos if t not in resumos]
+
+    for i, titulo in enumerate(em_falta, 1):
+        print(f"   [{i}/{len(em_falta)}] A extrair: {titulo}")
+
+    # Pedidos em paralelo (I/O): o tempo total passa a ser o do pedido mais
+    # lento em vez da soma de todos; map mantém a ordem dos títulos
+    if em_falta:
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(em_falta)))) as executor:
+            fetch = executor.map(lambda titulo: extrair_resumo(titulo, rest_url, cache_db), em_falta)
+            resumos.update(zip(em_falta, fetch))
+
+    for titulo in titulos:
+        dados = resumos.get(titulo)
         if dados:
             dados["timestamp_scrape"] = timestamp
             resultados.append(dados)
@@ -243,18 +429,18 @@ def salvar_json_raw(data: list[dict], output_dir: Path, timestamp: str) -> Path:
     """
     raw_path = output_dir / f"wiki_scrape_raw_{timestamp}.json"
 
-    with open(raw_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # orjson serializa em C directamente para bytes UTF-8 (JSON compacto)
+    raw_path.write_bytes(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
 
     print(f"   JSON raw guardado: {raw_path}")
     return raw_path
 
 
 # ============================================================================
-# [7] CONVERTER PARA DATAFRAME + SALVAR CSV
+# [7] CONVERTER PARA DATAFRAME / SALVAR CSV
 # ============================================================================
 
-def resultados_to_dataframe(resultados: list[dict]) -> pd.DataFrame:
+def resultados_to_dataframe(resultados: list[dict]) -> "pd.DataFrame":
     """
     Converte lista de resultados para DataFrame.
 
@@ -264,6 +450,9 @@ def resultados_to_dataframe(resultados: list[dict]) -> pd.DataFrame:
     Returns:
         DataFrame com as páginas
     """
+    # Import local: o CLI (preview + CSV) não precisa de pandas
+    import pandas as pd
+
     if not resultados:
         print("   Nenhum resultado para converter")
         return pd.DataFrame()
@@ -273,12 +462,15 @@ def resultados_to_dataframe(resultados: list[dict]) -> pd.DataFrame:
     return df
 
 
-def salvar_csv(df: pd.DataFrame, output_dir: Path, timestamp: str) -> Path:
+COLUNAS_CSV = ["titulo", "resumo", "url", "pageid", "timestamp_scrape"]
+
+
+def salvar_csv(resultados: list[dict], output_dir: Path, timestamp: str) -> Path:
     """
-    Salva DataFrame como CSV.
+    Salva os resultados como CSV, escritos directamente (sem DataFrame).
 
     Args:
-        df: DataFrame com os dados
+        resultados: Lista de dicionários com dados extraídos
         output_dir: Pasta de output
         timestamp: Timestamp para o nome do ficheiro
 
@@ -287,7 +479,10 @@ def salvar_csv(df: pd.DataFrame, output_dir: Path, timestamp: str) -> Path:
     """
     csv_path = output_dir / f"wiki_scrape_tabular_{timestamp}.csv"
 
-    df.to_csv(csv_path, index=False, encoding="utf-8")
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUNAS_CSV, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(resultados)
 
     print(f"   CSV tabular guardado: {csv_path}")
     return csv_path
@@ -310,13 +505,38 @@ CREATE TABLE IF NOT EXISTS paginas (
 """
 
 
+SQL_INSERIR_PAGINA = (
+    "INSERT OR IGNORE INTO paginas (pageid, titulo, resumo, url, modo, timestamp_scrape, loaded_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
 def criar_tabela_wiki(conn: sqlite3.Connection) -> None:
     """Cria a tabela paginas se não existir."""
     conn.execute(SQL_CRIAR_TABELA_WIKI)
     conn.commit()
 
 
-def carregar_na_db(conn: sqlite3.Connection, resultados: list[dict], modo: str) -> int:
+# Cache de validação HTTP (ETag / Last-Modified) dos resumos REST
+SQL_CRIAR_TABELA_HTTP_CACHE = """
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB,
+    fetched_at TEXT
+);
+"""
+
+
+def criar_tabela_http_cache(conn: sqlite3.Connection) -> None:
+    """Cria a tabela http_cache se não existir."""
+    conn.execute(SQL_CRIAR_TABELA_HTTP_CACHE)
+    conn.commit()
+
+
+def carregar_na_db(conn: sqlite3.Connection, resultados: list[dict], modo: str,
+                   loaded_at: str | None = None) -> int:
     """
     Insere resultados do scraping na tabela paginas.
 
@@ -326,15 +546,16 @@ def carregar_na_db(conn: sqlite3.Connection, resultados: list[dict], modo: str)
         conn: Conexão SQLite
         resultados: Lista de dicionários com dados extraídos
         modo: Modo de scraping (tema, aleatorio, urls)
+        loaded_at: Data de carga (None = agora)
 
     Returns:
         Número de registos inseridos
     """
-    loaded_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    loaded_at = loaded_at or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
-    registos = []
-    for r in resultados:
-        registos.append((
+    # Registos gerados à medida que o executemany os consome (sem lista)
+    registos = (
+        (
             str(r.get("pageid", "")),
             r.get("titulo", ""),
             r.get("resumo", ""),
@@ -342,15 +563,43 @@ def carregar_na_db(conn: sqlite3.Connection, resultados: list[dict], modo: str)
             modo,
             r.get("timestamp_scrape", ""),
             loaded_at,
-        ))
+        )
+        for r in resultados
+    )
 
-    sql = "INSERT OR IGNORE INTO paginas (pageid, titulo, resumo, url, modo, timestamp_scrape, loaded_at) VALUES (?, ?, ?, ?, ?, ?, ?)"
-    cursor = conn.executemany(sql, registos)
+    cursor = conn.executemany(SQL_INSERIR_PAGINA, registos)
     conn.commit()
 
     return cursor.rowcount
 
 
+def carregar_wiki_db(db_path: Path, resultados: list[dict], modo: str,
+                     loaded_at: str | None = None) -> int:
+    """
+    Abre a base de dados, cria a tabela paginas e insere os resultados.
+
+    Abre a própria conexão, para poder correr numa thread à parte.
+
+    Args:
+        db_path: Caminho do ficheiro SQLite
+        resultados: Lista de dicionários com dados extraídos
+        modo: Modo de scraping (tema, aleatorio, urls)
+        loaded_at: Data de carga (None = agora)
+
+    Returns:
+        Número de registos inseridos
+    """
+    # Import local: o loader traz pandas/pyarrow (~0.4 s), só precisos na carga
+    from src.db.loader import abrir_conexao
+
+    conn = abrir_conexao(db_path)
+    try:
+        criar_tabela_wiki(conn)
+        return carregar_na_db(conn, resultados, modo, loaded_at)
+    finally:
+        conn.close()
+
+
 # ============================================================================
 # MENU INTERATIVO
 # ============================================================================
@@ -394,14 +643,10 @@ def escolher_modo(api_url: str) -> tuple[str, list[str]]:
 
     if opcao == "1":
         tema = input("   Tema de pesquisa: ").strip()
-        if not tema:
-            raise ValueError("Tema não pode ser vazio")
-        titulos = pesquisar_por_tema(tema, api_url)
-        return "tema", titulos
+        return "tema", obter_titulos("tema", api_url, tema=tema)
 
     elif opcao == "2":
-        titulos = obter_aleatorias(api_url)
-        return "aleatorio", titulos
+        return "aleatorio", obter_titulos("aleatorio", api_url)
 
     elif opcao == "3":
         print(f"   Introduz até {MAX_PAGINAS} URLs (um por linha, linha vazia para terminar):")
@@ -411,43 +656,128 @@ def escolher_modo(api_url: str) -> tuple[str, list[str]]:
             if not url:
                 break
             urls.append(url)
-        if not urls:
-            raise ValueError("Nenhum URL fornecido")
-        titulos = extrair_titulos_de_urls(urls)
-        return "urls", titulos
+        return "urls", obter_titulos("urls", api_url, urls=urls)
 
     else:
         raise ValueError(f"Opção inválida: {opcao}")
 
 
+def obter_titulos(modo: str, api_url: str, tema: str | None = None,
+                  urls: list[str] | None = None) -> list[str]:
+    """
+    Obtém os títulos a extrair para um modo de scraping.
+
+    Args:
+        modo: tema, aleatorio ou urls
+        api_url: URL da API MediaWiki
+        tema: Termo de pesquisa (modo tema)
+        urls: Lista de URLs (modo urls)
+
+    Returns:
+        Lista de títulos
+    """
+    if modo == "tema":
+        if not tema:
+            raise ValueError("Tema não pode ser vazio")
+        return pesquisar_por_tema(tema, api_url)
+
+    if modo == "aleatorio":
+        return obter_aleatorias(api_url)
+
+    if modo == "urls":
+        if not urls:
+            raise ValueError("Nenhum URL fornecido")
+        return extrair_titulos_de_urls(urls)
+
+    raise ValueError(f"Modo inválido: {modo}")
+
+
 # ============================================================================
 # MAIN
 # ============================================================================
 
+def parse_args() -> argparse.Namespace:
+    """Parse argumentos da linha de comandos"""
+    parser = argparse.ArgumentParser(
+        description="Wikipédia – Web Scraping Bronze",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Sem argumentos, as opções em falta são pedidas no menu interativo.
+Sem terminal (cron, CI), o idioma por defeito é pt e --modo é obrigatório.
+
+Exemplos:
+  python -m src.bronze.wiki_scraper --idioma pt --modo tema --tema "Lisboa" --db
+  python -m src.bronze.wiki_scraper --idioma en --modo aleatorio
+  python -m src.bronze.wiki_scraper --modo urls --urls urls.txt
+        """
+    )
+
+    parser.add_argument(
+        "--idioma", "-i",
+        choices=list(IDIOMAS),
+        help="Idioma da Wikipédia (pt, en)"
+    )
+    parser.add_argument(
+        "--modo", "-m",
+        choices=["tema", "aleatorio", "urls"],
+        help="Modo de scraping"
+    )
+    parser.add_argument(
+        "--tema", "-t",
+        help="Termo de pesquisa (modo tema)"
+    )
+    parser.add_argument(
+        "--urls", "-u",
+        type=Path,
+        help="Ficheiro com URLs, um por linha (modo urls)"
+    )
+    parser.add_argument(
+        "--db",
+        action="store_true",
+        help="Carregar os resultados em db/wiki.db sem perguntar "
+             "(e usar a cache HTTP dos resumos guardada na mesma DB)"
+    )
+
+    return parser.parse_args()
+
+
 def main() -> int:
     """Pipeline de scraping da Wikipédia PT"""
 
     # Garantir UTF-8 no Windows
-    if sys.stdout.encoding != "utf-8":
-        sys.stdout = io.TextIOWrapper(
-            sys.stdout.buffer, encoding="utf-8", errors="replace"
-        )
+    ensure_utf8()
+
+    args = parse_args()
 
     print("\n" + "=" * 60)
     print("    WIKIPEDIA - WEB SCRAPING BRONZE")
     print("=" * 60 + "\n")
 
+    # Sem terminal (cron, CI) não há menu: o input() bloquearia ou falharia.
+    # O idioma fica o por defeito (pt) e o modo tem de vir de --modo
+    interativo = sys.stdin.isatty()
+
     try:
         # 1️⃣ Escolher idioma
         print("1. A escolher idioma...")
-        idioma = escolher_idioma()
+        idioma = args.idioma or (escolher_idioma() if interativo else "pt")
         api_url, rest_url = obter_urls(idioma)
         nome_idioma = IDIOMAS[idioma]["nome"]
         print(f"   Wikipedia: {nome_idioma} ({idioma})\n")
 
         # 2️⃣ Escolher modo
         print("2. A escolher modo de scraping...")
-        modo, titulos = escolher_modo(api_url)
+        if args.modo:
+            urls = None
+            if args.urls:
+                linhas = args.urls.read_text(encoding="utf-8").splitlines()
+                urls = [u.strip() for u in linhas if u.strip()]
+            modo = args.modo
+            titulos = obter_titulos(modo, api_url, tema=args.tema, urls=urls)
+        elif interativo:
+            modo, titulos = escolher_modo(api_url)
+        else:
+            raise ValueError("Sem terminal interativo: indica o modo com --modo")
 
         if not titulos:
             print("\n   Nenhuma pagina encontrada.")
@@ -461,36 +791,65 @@ def main() -> int:
         output_dir = project_root / "collection" / "bronze"
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-
-        # 4️⃣ Scraping
+        # Um só instante para toda a execução: ficheiros, timestamp_scrape
+        # e loaded_at ficam coerentes entre si
+        run_ts = datetime.now(timezone.utc)
+        timestamp = run_ts.strftime("%Y%m%dT%H%M%SZ")
+        timestamp_iso = run_ts.isoformat()
+        loaded_at = run_ts.strftime("%Y-%m-%d %H:%M:%S")
+
+        db_dir = project_root / "db"
+        db_dir.mkdir(parents=True, exist_ok=True)
+        db_path = db_dir / "wiki.db"
+
+        # A cache HTTP vive em db/wiki.db, por isso só com --db: sem a flag
+        # o scraping não cria nem escreve a base de dados. A tabela é criada
+        # uma vez aqui e não a cada pedido
+        cache_db = None
+        if args.db:
+            cache_db = db_path
+            conn = sqlite3.connect(cache_db)
+            try:
+                criar_tabela_http_cache(conn)
+            finally:
+                conn.close()
+
+        # 4️⃣ Scraping (pedido em lote; REST com cache HTTP para o que faltar)
         print("3. A extrair resumos das paginas...")
-        resultados = scrape_paginas(titulos, rest_url)
+        resultados = scrape_paginas(titulos, rest_url, cache_db=cache_db, api_url=api_url,
+                                    timestamp=timestamp_iso)
 
         if not resultados:
             print("\n   Nenhum resultado extraido.")
             return 1
 
-        # 5️⃣ Salvar JSON raw
-        print("\n4. A salvar JSON raw...")
-        raw_path = salvar_json_raw(resultados, output_dir, timestamp)
-
-        # 6️⃣ Converter para DataFrame + CSV
-        print("\n5. A converter para DataFrame...")
-        df = resultados_to_dataframe(resultados)
-
-        if not df.empty:
-            print("\n   Preview:")
-            print(df[["titulo", "resumo"]].head().to_string(index=False))
-
-        print("\n6. A salvar CSV (bronze tabular)...")
-        csv_path = salvar_csv(df, output_dir, timestamp)
-
-        # Conclusao
-        print("\n" + "=" * 60)
-        print("SCRAPING CONCLUIDO COM SUCESSO!")
-        print("=" * 60)
-        print(f"""
+        # Com --db, a carga na DB corre numa thread em paralelo com a
+        # escrita dos ficheiros (ambas são I/O bloqueante)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            carga_db = None
+            if args.db:
+                carga_db = executor.submit(carregar_wiki_db, db_path, resultados, modo, loaded_at)
+
+            # Esperar pela carga também se a escrita dos ficheiros falhar:
+            # o erro de cada uma é mostrado, nenhum se perde na thread
+            try:
+                # 5️⃣ Salvar JSON raw
+                print("\n4. A salvar JSON raw...")
+                raw_path = salvar_json_raw(resultados, output_dir, timestamp)
+
+                # 6️⃣ Preview + CSV (escrito directamente dos resultados)
+                print("\n5. Preview:")
+                for r in resultados[:5]:
+                    print(f"   {r['titulo']}: {r['resumo'][:80]}")
+
+                print("\n6. A salvar CSV (bronze tabular)...")
+                csv_path = salvar_csv(resultados, output_dir, timestamp)
+
+                # Conclusao
+                print("\n" + "=" * 60)
+                print("SCRAPING CONCLUIDO COM SUCESSO!")
+                print("=" * 60)
+                print(f"""
    Modo: {modo}
    Ficheiros gerados em: {output_dir}
 
@@ -498,25 +857,24 @@ def main() -> int:
       -> JSON original (raw)
 
    {csv_path.name}
-      -> Dados tabulares ({len(df)} registos)
+      -> Dados tabulares ({len(resultados)} registos)
 
-   Pipeline: Wikipedia API -> JSON (raw) -> DataFrame -> CSV
+   Pipeline: Wikipedia API -> JSON (raw) -> CSV
 """)
 
-        # Perguntar se quer carregar na DB
-        resposta = input("   Carregar dados na base de dados SQLite? (s/N): ").strip().lower()
-        if resposta == "s":
-            db_dir = project_root / "db"
-            db_dir.mkdir(parents=True, exist_ok=True)
-            db_path = db_dir / "wiki.db"
-
-            conn = sqlite3.connect(db_path)
-            criar_tabela_wiki(conn)
-            inseridos = carregar_na_db(conn, resultados, modo)
-            conn.close()
-            print(f"   {inseridos} registos inseridos em {db_path}")
-
-        return 0
+                # Carregar na DB (--db, ou perguntar se houver terminal)
+                if carga_db is None and sys.stdin.isatty():
+                    resposta = input("   Carregar dados na base de dados SQLite? (s/N): ").strip().lower()
+                    if resposta == "s":
+                        carga_db = executor.submit(carregar_wiki_db, db_path, resultados, modo, loaded_at)
+            finally:
+                erro_carga = carga_db.exception() if carga_db is not None else None
+                if erro_carga is not None:
+                    print(f"\n   Erro ao carregar na DB: {erro_carga}")
+                elif carga_db is not None:
+                    print(f"   {carga_db.result()} registos inseridos em {db_path}")
+
+        return 1 if erro_carga is not None else 0
 
     except ValueError as e:
         print(f"\n   Erro: {e}")
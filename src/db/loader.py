@@ -1,28 +1,26 @@
 """
 NewsData.io – Carregamento para SQLite
 
-Carrega os CSV da collection bronze para uma base de dados SQLite.
+Carrega os ficheiros tabulares (Parquet/CSV) da collection bronze para SQLite.
 
 Uso:
-    python -m src.db.loader                    # Carrega todos os CSV
+    python -m src.db.loader                    # Carrega todos os ficheiros
     python -m src.db.loader --db-path outro.db # Caminho personalizado
 """
 
 import argparse
-import io
+import csv
 import re
 import sqlite3
 import sys
 from datetime import datetime, timezone
+from itertools import repeat
 from pathlib import Path
 
-# Forçar UTF-8 no stdout/stderr (Windows cp1252 não suporta emojis)
-if sys.stdout.encoding != "utf-8":
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-if sys.stderr.encoding != "utf-8":
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
-
 import pandas as pd
+import pyarrow as pa
+
+from src.utils.console import ensure_utf8
 
 
 # ============================================================================
@@ -55,72 +53,206 @@ CREATE TABLE IF NOT EXISTS artigos (
 # FUNÇÕES DE BASE DE DADOS
 # ============================================================================
 
+def abrir_conexao(db_path: Path) -> sqlite3.Connection:
+    """
+    Abre a base de dados configurada para as escritas do pipeline.
+
+    WAL com synchronous=NORMAL faz um único fsync por checkpoint em vez
+    de um por commit, sem arriscar corromper a base de dados. Temporários
+    em memória, cache de páginas de 64 MB e leituras via mmap.
+
+    Args:
+        db_path: Caminho do ficheiro SQLite
+
+    Returns:
+        Conexão SQLite
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    return conn
+
+
 def criar_tabela(conn: sqlite3.Connection) -> None:
     """Cria a tabela artigos se não existir."""
     conn.execute(SQL_CRIAR_TABELA)
     conn.commit()
 
 
-def carregar_csv(conn: sqlite3.Connection, csv_path: Path, endpoint: str) -> int:
+def atualizar_estatisticas(conn: sqlite3.Connection) -> None:
     """
-    Lê um CSV e insere os registos na tabela artigos.
+    Actualiza as estatísticas do planeador de queries (ANALYZE).
+
+    Sem sqlite_stat1 o SQLite usa estimativas fixas de selectividade e pode
+    escolher o índice errado (ou nenhum). O analysis_limit faz o ANALYZE
+    amostrar cada índice em vez de o ler todo, para o custo não crescer
+    com a base de dados.
+
+    Args:
+        conn: Conexão SQLite
+    """
+    conn.execute("PRAGMA analysis_limit = 1000")
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+COLUNAS_ARTIGOS = [
+    "article_id", "title", "description", "content",
+    "source_id", "source_name", "source_url", "creator",
+    "pubDate", "category", "country", "language",
+    "link", "image_url", "endpoint", "loaded_at",
+]
+
+SQL_INSERIR_ARTIGO = (
+    f"INSERT OR IGNORE INTO artigos ({', '.join(COLUNAS_ARTIGOS)}) "
+    f"VALUES ({', '.join(['?'] * len(COLUNAS_ARTIGOS))})"
+)
+
+
+def carregar_dataframe(conn: sqlite3.Connection, df: pd.DataFrame, endpoint: str,
+                       origem: str = "DataFrame", commit: bool = True) -> int:
+    """
+    Insere os registos de um DataFrame bronze na tabela artigos.
 
     Usa INSERT OR IGNORE para evitar duplicados (pelo article_id).
 
     Args:
         conn: Conexão SQLite
-        csv_path: Caminho do ficheiro CSV
+        df: DataFrame com as colunas bronze (json_to_dataframe)
         endpoint: Nome do endpoint (latestPT, crypto, etc.)
+        origem: Nome a mostrar no log (ex: nome do ficheiro)
+        commit: Se False, deixa o commit para quem chama (carga em lote)
 
     Returns:
         Número de registos inseridos
     """
-    try:
-        df = pd.read_csv(csv_path, encoding="utf-8")
-    except pd.errors.EmptyDataError:
-        print(f"   [AVISO] CSV vazio: {csv_path.name}")
-        return 0
-
     if df.empty:
-        print(f"   [AVISO] CSV vazio: {csv_path.name}")
+        print(f"   [AVISO] Sem registos: {origem}")
         return 0
 
     loaded_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-    df["endpoint"] = endpoint
-    df["loaded_at"] = loaded_at
 
+    # Uma lista Python por coluna, pela ordem da tabela: o Arrow converte
+    # NaN/NA em None (SQLite NULL) sem copiar o DataFrame para object;
+    # colunas em falta ficam NULL
+    nulos = [None] * len(df)
     colunas = [
-        "article_id", "title", "description", "content",
-        "source_id", "source_name", "source_url", "creator",
-        "pubDate", "category", "country", "language",
-        "link", "image_url", "endpoint", "loaded_at",
+        pa.array(df[col], from_pandas=True).to_pylist() if col in df.columns else nulos
+        for col in COLUNAS_ARTIGOS[:-2]
     ]
 
-    # Garantir que todas as colunas existem
-    for col in colunas:
-        if col not in df.columns:
-            df[col] = None
+    # Linhas geradas à medida (sem lista intermédia), com um só statement
+    # preparado e uma só transacção
+    linhas = zip(*colunas, repeat(endpoint), repeat(loaded_at))
+    cursor = conn.executemany(SQL_INSERIR_ARTIGO, linhas)
+    if commit:
+        conn.commit()
 
-    df = df[colunas]
+    inseridos = cursor.rowcount
+    print(f"   [LOAD] {origem}: {inseridos} registos inseridos")
+    return inseridos
 
-    # Converter NaN para None (SQLite NULL)
-    df = df.where(df.notna(), None)
 
-    placeholders = ", ".join(["?"] * len(colunas))
-    sql = f"INSERT OR IGNORE INTO artigos ({', '.join(colunas)}) VALUES ({placeholders})"
+def filtrar_existentes(conn: sqlite3.Connection, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Remove do DataFrame os artigos que já existem na tabela artigos.
 
-    registos = df.values.tolist()
-    cursor = conn.executemany(sql, registos)
-    conn.commit()
+    Procura apenas os article_id do lote na chave primária, em vez de
+    reler os ficheiros bronze anteriores.
+
+    Args:
+        conn: Conexão SQLite (tabela artigos criada)
+        df: DataFrame com novos artigos
+
+    Returns:
+        DataFrame apenas com artigos novos
+    """
+    if df.empty:
+        return df
+
+    ids = df["article_id"].dropna().unique().tolist()
+    existentes = set()
+    if ids:
+        placeholders = ", ".join(["?"] * len(ids))
+        cursor = conn.execute(
+            f"SELECT article_id FROM artigos WHERE article_id IN ({placeholders})", ids
+        )
+        existentes = {row[0] for row in cursor}
+
+    total_antes = len(df)
+    df_novos = df[~df["article_id"].isin(existentes)]
+    duplicados = total_antes - len(df_novos)
+
+    if duplicados > 0:
+        print(f"   [DEDUP] Removidos {duplicados} artigos duplicados ({len(df_novos)} novos de {total_antes})")
+    else:
+        print(f"   [DEDUP] Todos os {total_antes} artigos são novos")
+
+    return df_novos
+
+
+def carregar_csv(conn: sqlite3.Connection, csv_path: Path, endpoint: str,
+                 commit: bool = True) -> int:
+    """
+    Lê um CSV e insere os registos na tabela artigos.
+
+    Args:
+        conn: Conexão SQLite
+        csv_path: Caminho do ficheiro CSV
+        endpoint: Nome do endpoint (latestPT, crypto, etc.)
+        commit: Se False, deixa o commit para quem chama (carga em lote)
+
+    Returns:
+        Número de registos inseridos
+    """
+    loaded_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    colunas = COLUNAS_ARTIGOS[:-2]  # endpoint e loaded_at vêm dos argumentos
+
+    # Linhas lidas em streaming e inseridas directamente (sem DataFrame);
+    # campos vazios ou em falta ficam NULL
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames:
+            print(f"   [AVISO] CSV vazio: {csv_path.name}")
+            return 0
+
+        linhas = (
+            tuple(row.get(col) or None for col in colunas) + (endpoint, loaded_at)
+            for row in reader
+        )
+        cursor = conn.executemany(SQL_INSERIR_ARTIGO, linhas)
+    if commit:
+        conn.commit()
 
     inseridos = cursor.rowcount
     print(f"   [LOAD] {csv_path.name}: {inseridos} registos inseridos")
     return inseridos
 
 
+def carregar_parquet(conn: sqlite3.Connection, parquet_path: Path, endpoint: str,
+                     commit: bool = True) -> int:
+    """
+    Lê um Parquet bronze e insere os registos na tabela artigos.
+
+    Args:
+        conn: Conexão SQLite
+        parquet_path: Caminho do ficheiro Parquet
+        endpoint: Nome do endpoint (latestPT, crypto, etc.)
+        commit: Se False, deixa o commit para quem chama (carga em lote)
+
+    Returns:
+        Número de registos inseridos
+    """
+    df = pd.read_parquet(parquet_path, engine="pyarrow")
+    return carregar_dataframe(conn, df, endpoint, parquet_path.name, commit)
+
+
 def extrair_endpoint(nome_ficheiro: str) -> str:
     """
-    Extrai o nome do endpoint a partir do nome do ficheiro CSV.
+    Extrai o nome do endpoint a partir do nome do ficheiro tabular.
 
     Exemplo: newsdata_crypto_tabular_20260202T222534Z.csv → crypto
     """
@@ -130,9 +262,12 @@ def extrair_endpoint(nome_ficheiro: str) -> str:
     return "desconhecido"
 
 
-def carregar_todos_csv(db_path: Path) -> int:
+def carregar_todos_ficheiros(db_path: Path) -> int:
     """
-    Percorre collection/bronze/*.csv e carrega todos na base de dados.
+    Percorre collection/bronze e carrega todos os ficheiros tabulares na DB.
+
+    Os Parquet são a saída por defeito da Bronze; um CSV só é lido quando
+    não existe o Parquet correspondente (mesmo endpoint e timestamp).
 
     Args:
         db_path: Caminho do ficheiro SQLite
@@ -141,28 +276,37 @@ def carregar_todos_csv(db_path: Path) -> int:
         Total de registos inseridos
     """
     project_root = Path(__file__).parent.parent.parent
-    csv_dir = project_root / "collection" / "bronze"
+    bronze_dir = project_root / "collection" / "bronze"
 
-    ficheiros = sorted(csv_dir.glob("*_tabular_*.csv"))
+    parquets = sorted(bronze_dir.glob("*_tabular_*.parquet"))
+    stems = {p.stem for p in parquets}
+    csvs = [p for p in sorted(bronze_dir.glob("*_tabular_*.csv")) if p.stem not in stems]
+    ficheiros = sorted(parquets + csvs)
 
     if not ficheiros:
-        print("[AVISO] Nenhum ficheiro CSV encontrado em collection/bronze/")
+        print("[AVISO] Nenhum ficheiro tabular encontrado em collection/bronze/")
         return 0
 
-    print(f"[DIR] Encontrados {len(ficheiros)} ficheiro(s) CSV\n")
+    print(f"[DIR] Encontrados {len(ficheiros)} ficheiro(s) tabulares\n")
 
     # Criar pasta db se necessário
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(db_path)
+    conn = abrir_conexao(db_path)
     criar_tabela(conn)
 
+    # Todos os ficheiros numa só transacção (um commit no fim)
     total = 0
-    for csv_path in ficheiros:
-        endpoint = extrair_endpoint(csv_path.name)
-        total += carregar_csv(conn, csv_path, endpoint)
-
-    conn.close()
+    try:
+        for path in ficheiros:
+            endpoint = extrair_endpoint(path.name)
+            if path.suffix == ".parquet":
+                total += carregar_parquet(conn, path, endpoint, commit=False)
+            else:
+                total += carregar_csv(conn, path, endpoint, commit=False)
+        conn.commit()
+    finally:
+        conn.close()
 
     print(f"\n[OK] Total: {total} registos inseridos em {db_path}")
     return total
@@ -175,7 +319,7 @@ def carregar_todos_csv(db_path: Path) -> int:
 def parse_args() -> argparse.Namespace:
     """Parse argumentos da linha de comandos."""
     parser = argparse.ArgumentParser(
-        description="NewsData.io – Carregar CSV para SQLite",
+        description="NewsData.io – Carregar Bronze para SQLite",
     )
     parser.add_argument(
         "--db-path",
@@ -186,7 +330,8 @@ def parse_args() -> argparse.Namespace:
 
 
 def main() -> int:
-    """Carrega todos os CSV da collection bronze para SQLite."""
+    """Carrega todos os ficheiros da collection bronze para SQLite."""
+    ensure_utf8()
 
     print("\n" + "=" * 60)
     print("    NEWSDATA.IO - CARREGAR PARA SQLITE")
@@ -198,7 +343,7 @@ def main() -> int:
     db_path = Path(args.db_path) if args.db_path else project_root / "db" / "newsdata.db"
 
     try:
-        total = carregar_todos_csv(db_path)
+        total = carregar_todos_ficheiros(db_path)
         if total == 0:
             print("\nNenhum registo novo inserido.")
         return 0
@@ -5,25 +5,26 @@ Agregacoes de dados Silver -> Gold.
 
 Uso:
     python -m src.gold.aggregate
+    python -m src.gold.aggregate --explain   # Mostra o plano de cada query
 """
 
 import argparse
-import io
-import json
+import heapq
 import re
 import sqlite3
 import sys
-from collections import Counter
+from collections import defaultdict
+from collections.abc import Iterable
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
 import pandas as pd
 
-# Forcar UTF-8 no stdout/stderr (Windows)
-if sys.stdout.encoding != "utf-8":
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-if sys.stderr.encoding != "utf-8":
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+from src.db.loader import abrir_conexao, atualizar_estatisticas
+from src.utils.console import ensure_utf8
+
 
 
 # ============================================================================
@@ -31,7 +32,7 @@ if sys.stderr.encoding != "utf-8":
 # ============================================================================
 
 # Stopwords para trending topics (PT + EN)
-STOPWORDS = {
+STOPWORDS = frozenset({
     # Portugues
     "o", "a", "os", "as", "um", "uma", "uns", "umas", "de", "da", "do", "das", "dos",
     "em", "na", "no", "nas", "nos", "por", "para", "com", "sem", "sob", "sobre",
@@ -53,7 +54,15 @@ STOPWORDS = {
     "most", "other", "some", "such", "no", "not", "only", "same", "so", "than",
     "too", "very", "just", "also", "now", "new", "first", "last", "long", "great",
     "after", "before", "between", "under", "over", "through", "during",
-}
+})
+
+# Palavras com 3+ caracteres (sequencias de letras/digitos/'_' Unicode); um so
+# findall substitui remover pontuacao + split + filtro de comprimento
+RE_PALAVRA = re.compile(r"\w{3,}")
+
+# Artigos/dia a partir dos quais a contagem em FTS5 compensa o custo fixo
+# (medido: ~500; abaixo disso o ciclo Python com lru_cache e mais rapido)
+LIMIAR_CONTAGEM_FTS = 500
 
 
 # ============================================================================
@@ -86,6 +95,7 @@ CREATE TABLE IF NOT EXISTS gold_daily_summary (
 );
 
 CREATE INDEX IF NOT EXISTS idx_gold_daily_date ON gold_daily_summary(summary_date);
+CREATE INDEX IF NOT EXISTS idx_gold_daily_source ON gold_daily_summary(source_id);
 
 -- Estatisticas por fonte
 CREATE TABLE IF NOT EXISTS gold_source_stats (
@@ -145,6 +155,48 @@ CREATE TABLE IF NOT EXISTS gold_trending_topics (
 CREATE INDEX IF NOT EXISTS idx_gold_trending_date ON gold_trending_topics(topic_date);
 CREATE INDEX IF NOT EXISTS idx_gold_trending_term ON gold_trending_topics(term);
 
+-- Marca de agua (ultimo processed_at da silver ja agregado) por tabela gold
+CREATE TABLE IF NOT EXISTS gold_watermarks (
+    table_name TEXT PRIMARY KEY,
+    processed_at TEXT
+);
+
+-- Contagens da silver por dia/fonte/categoria (vista materializada interna).
+-- Guarda somas e contagens (nao medias) para as agregacoes gold poderem
+-- juntar varios dias: media = soma / contagem de valores nao nulos.
+CREATE TABLE IF NOT EXISTS silver_daily_counts (
+    pub_date DATE NOT NULL,
+    source_id TEXT,
+    category_primary TEXT,
+    source_name TEXT,
+
+    article_count INTEGER,
+
+    polarity_count INTEGER,
+    sum_polarity REAL,
+    sumsq_polarity REAL,
+    min_polarity REAL,
+    max_polarity REAL,
+
+    subjectivity_count INTEGER,
+    sum_subjectivity REAL,
+
+    positive_count INTEGER,
+    negative_count INTEGER,
+    neutral_count INTEGER,
+
+    word_count_count INTEGER,
+    sum_word_count INTEGER,
+
+    title_length_count INTEGER,
+    sum_title_length INTEGER,
+    content_length_count INTEGER,
+    sum_content_length INTEGER,
+    articles_with_content INTEGER,
+
+    PRIMARY KEY(pub_date, source_id, category_primary)
+);
+
 -- Timeline de sentimento
 CREATE TABLE IF NOT EXISTS gold_sentiment_timeline (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -201,54 +253,298 @@ CREATE INDEX IF NOT EXISTS idx_gold_matrix_category ON gold_category_matrix(cate
 """
 
 
+SQL_INSERIR_TRENDING = """
+INSERT INTO gold_trending_topics (
+    topic_date, term, term_type, frequency, article_count,
+    sample_titles, sources, categories, avg_sentiment, rank, calculated_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(topic_date, term, term_type) DO UPDATE SET
+    frequency = excluded.frequency,
+    article_count = excluded.article_count,
+    sample_titles = excluded.sample_titles,
+    sources = excluded.sources,
+    categories = excluded.categories,
+    avg_sentiment = excluded.avg_sentiment,
+    rank = excluded.rank,
+    calculated_at = excluded.calculated_at
+"""
+
+
 # ============================================================================
 # FUNCOES AUXILIARES
 # ============================================================================
 
-def extrair_palavras_significativas(texto: str | None) -> list[str]:
+@lru_cache(maxsize=8192)
+def extrair_palavras_significativas(texto: str | None) -> tuple[str, ...]:
     """
     Extrai palavras significativas de um texto (sem stopwords).
 
+    Memoizada pelo texto: os mesmos titulos repetem-se entre agregacoes
+    (a cache e limpa no fim de processar_gold).
+
     Args:
         texto: Texto a processar
 
     Returns:
-        Lista de palavras significativas
+        Tuplo de palavras significativas
     """
     if not texto:
-        return []
+        return ()
 
-    # Remover pontuacao e converter para minusculas
-    texto = re.sub(r"[^\w\s]", " ", texto.lower())
+    # Minusculas, tokenizar (ja sem palavras curtas) e filtrar stopwords
+    return tuple(p for p in RE_PALAVRA.findall(texto.lower()) if p not in STOPWORDS)
 
-    # Dividir em palavras
-    palavras = texto.split()
 
-    # Filtrar stopwords e palavras curtas
-    palavras = [p for p in palavras if p not in STOPWORDS and len(p) > 2]
+def contar_palavras(rows: Iterable[tuple], top_n: int) -> tuple[list[tuple[str, int]], dict[str, list[tuple]]]:
+    """
+    Conta em quantos artigos aparece cada palavra e devolve o top N.
 
-    return palavras
+    Args:
+        rows: Linhas (titulo, fonte, categoria, sentimento); pode ser um
+            cursor, consumido linha a linha
+        top_n: Numero de palavras a devolver
+
+    Returns:
+        Tuplo (top [(palavra, frequencia)], palavra -> lista de artigos)
+    """
+    # palavra -> lista de (titulo, fonte, categoria, sentimento); a frequencia
+    # e o tamanho da lista (set: cada artigo conta uma vez por palavra)
+    word_articles = defaultdict(list)
+
+    for title, source, category, sentiment in rows:
+        artigo = (title, source, category, sentiment or 0)
+        for palavra in set(extrair_palavras_significativas(title)):
+            word_articles[palavra].append(artigo)
+
+    # Top N sem ordenar o vocabulario todo (O(V log N)). Empates por ordem
+    # alfabetica, como o "ORDER BY doc DESC, term" de contar_palavras_fts:
+    # o top N nao depende do caminho escolhido
+    top = heapq.nsmallest(top_n, word_articles.items(), key=lambda item: (-len(item[1]), item[0]))
+    return [(palavra, len(artigos)) for palavra, artigos in top], word_articles
+
+
+def contar_palavras_fts(conn: sqlite3.Connection, data: str,
+                       top_n: int) -> tuple[list[tuple[str, int]], dict[str, list[tuple]]]:
+    """
+    Versao de contar_palavras que tokeniza e conta dentro do SQLite (FTS5).
+
+    Os titulos do dia sao indexados numa tabela FTS5 temporaria (o INSERT
+    ... SELECT nao passa por Python) e a tabela fts5vocab da, em C, o
+    numero de artigos por palavra. So as palavras mais frequentes e os
+    artigos do top N voltam a Python.
+
+    Args:
+        conn: Conexao SQLite
+        data: Data (YYYY-MM-DD)
+        top_n: Numero de palavras a devolver
+
+    Returns:
+        Tuplo (top [(palavra, frequencia)], palavra -> lista de artigos)
+
+    Raises:
+        sqlite3.OperationalError: Se o SQLite nao tiver FTS5
+    """
+    # unicode61 sem remover acentos e com '_' como letra = mesmos tokens que
+    # RE_PALAVRA (minusculas incluidas)
+    conn.execute("DROP TABLE IF EXISTS temp.trending_titulos")
+    conn.execute("""
+        CREATE VIRTUAL TABLE temp.trending_titulos USING fts5(
+            title, tokenize = "unicode61 remove_diacritics 0 tokenchars '_'", detail = none
+        )
+    """)
+    try:
+        conn.execute("""
+            INSERT INTO temp.trending_titulos (rowid, title)
+            SELECT rowid, title_clean FROM artigos_silver
+            WHERE pub_date = ? AND title_clean IS NOT NULL AND length(title_clean) >= 3
+        """, (data,))
+        conn.execute("CREATE VIRTUAL TABLE temp.trending_vocab USING fts5vocab(trending_titulos, row)")
+
+        # doc = numero de artigos com a palavra; stopwords saltadas aqui
+        top_words = []
+        for term, doc in conn.execute("""
+            SELECT term, doc FROM temp.trending_vocab
+            WHERE length(term) > 2
+            ORDER BY doc DESC, term
+        """):
+            if term not in STOPWORDS:
+                top_words.append((term, doc))
+                if len(top_words) == top_n:
+                    break
+
+        word_articles = {}
+        for term, _ in top_words:
+            word_articles[term] = [
+                (title, source, category, sentiment or 0)
+                for title, source, category, sentiment in conn.execute("""
+                    SELECT s.title_clean, s.source_id, s.category_primary, s.sentiment_polarity
+                    FROM temp.trending_titulos t
+                    JOIN artigos_silver s ON s.rowid = t.rowid
+                    WHERE t.trending_titulos MATCH ?
+                    ORDER BY s.rowid
+                """, ('"' + term.replace('"', '""') + '"',))
+            ]
+    finally:
+        conn.execute("DROP TABLE IF EXISTS temp.trending_vocab")
+        conn.execute("DROP TABLE IF EXISTS temp.trending_titulos")
+
+    return top_words, word_articles
+
+
+# ============================================================================
+# MARCAS DE AGUA / CONTAGENS DIARIAS
+# ============================================================================
+
+def ler_marca_de_agua(conn: sqlite3.Connection, tabela: str) -> str | None:
+    """Devolve o ultimo processed_at agregado para uma tabela (ou None)."""
+    row = conn.execute(
+        "SELECT processed_at FROM gold_watermarks WHERE table_name = ?", (tabela,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def gravar_marca_de_agua(conn: sqlite3.Connection, tabela: str, processed_at: str) -> None:
+    """Avanca a marca de agua de uma tabela (sem commit)."""
+    conn.execute("""
+        INSERT INTO gold_watermarks (table_name, processed_at)
+        VALUES (?, ?)
+        ON CONFLICT(table_name) DO UPDATE SET processed_at = excluded.processed_at
+    """, (tabela, processed_at))
+
+
+def datas_com_novos_artigos(conn: sqlite3.Connection,
+                            watermark: str | None) -> tuple[list[str], str | None]:
+    """
+    Lista as datas com artigos silver processados desde a marca de agua
+    (inclusive).
+
+    Args:
+        conn: Conexao SQLite
+        watermark: Ultimo processed_at agregado (None = todas as datas)
+
+    Returns:
+        Tuplo (datas, maior processed_at encontrado ou None)
+    """
+    # ">=" e nao ">": a silver grava um so processed_at por execucao, em
+    # varios commits, por isso podem chegar artigos com o mesmo processed_at
+    # da marca depois de a gold a ter gravado. Os dias da fronteira voltam a
+    # ser recalculados (idempotente) em vez de perder esses artigos.
+    # Duas formas do WHERE (em vez de "? IS NULL OR ..."): assim o filtro
+    # por processed_at usa o indice idx_silver_processed
+    where = "processed_at >= ? AND pub_date IS NOT NULL" if watermark else "pub_date IS NOT NULL"
+    params = (watermark,) if watermark else ()
+
+    datas, max_processed = [], None
+    for pub_date, processed_at in conn.execute(f"""
+        SELECT pub_date, MAX(processed_at)
+        FROM artigos_silver
+        WHERE {where}
+        GROUP BY pub_date
+    """, params):
+        datas.append(pub_date)
+        if processed_at and (max_processed is None or processed_at > max_processed):
+            max_processed = processed_at
+
+    return datas, max_processed
+
+
+def atualizar_silver_daily_counts(conn: sqlite3.Connection) -> int:
+    """
+    Actualiza silver_daily_counts apenas para os dias com artigos novos.
+
+    Cada dia afectado e recalculado por inteiro (DELETE + INSERT ... SELECT),
+    por isso grupos que deixaram de existir tambem saem. As agregacoes gold
+    leem esta tabela (O(dias x fontes x categorias)) em vez da silver
+    (O(artigos)). Nao faz commit: fica na transaccao de quem chama.
+
+    Args:
+        conn: Conexao SQLite
+
+    Returns:
+        Numero de dias recalculados
+    """
+    datas, max_processed = datas_com_novos_artigos(
+        conn, ler_marca_de_agua(conn, "silver_daily_counts")
+    )
+    if not datas:
+        return 0
+
+    datas_json = orjson.dumps(datas).decode()
+    conn.execute(
+        "DELETE FROM silver_daily_counts WHERE pub_date IN (SELECT value FROM json_each(?))",
+        (datas_json,),
+    )
+    conn.execute("""
+        INSERT INTO silver_daily_counts
+        SELECT
+            pub_date,
+            source_id,
+            category_primary,
+            MAX(source_name),
+            COUNT(*),
+            COUNT(sentiment_polarity),
+            SUM(sentiment_polarity),
+            SUM(sentiment_polarity * sentiment_polarity),
+            MIN(sentiment_polarity),
+            MAX(sentiment_polarity),
+            COUNT(sentiment_subjectivity),
+            SUM(sentiment_subjectivity),
+            SUM(CASE WHEN sentiment_label = 'positive' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN sentiment_label = 'negative' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN sentiment_label = 'neutral' THEN 1 ELSE 0 END),
+            COUNT(word_count),
+            SUM(word_count),
+            COUNT(title_length),
+            SUM(title_length),
+            COUNT(content_length),
+            SUM(content_length),
+            SUM(CASE WHEN content_length > 0 THEN 1 ELSE 0 END)
+        FROM artigos_silver
+        WHERE pub_date IN (SELECT value FROM json_each(?))
+        GROUP BY pub_date, source_id, category_primary
+    """, (datas_json,))
+
+    if max_processed:
+        gravar_marca_de_agua(conn, "silver_daily_counts", max_processed)
+
+    return len(datas)
 
 
 # ============================================================================
 # FUNCOES DE AGREGACAO
 # ============================================================================
 
-def calcular_daily_summary(conn: sqlite3.Connection, data: str | None = None) -> int:
+def calcular_daily_summary(conn: sqlite3.Connection, data: str | None = None,
+                           calculated_at: str | None = None,
+                           commit: bool = True,
+                           refresh: bool = True) -> int:
     """
     Calcula resumo diario por fonte e categoria.
 
     Args:
         conn: Conexao SQLite
         data: Data especifica (YYYY-MM-DD) ou None para todas
+        calculated_at: Timestamp UTC da execucao (o mesmo em todas as
+            tabelas gold); se None, usa o momento actual
+        commit: Se False, deixa o commit para quem chama (transaccao unica)
+        refresh: Se True, actualiza antes silver_daily_counts; False quando
+            quem chama ja o fez (processar_gold actualiza uma so vez)
 
     Returns:
         Numero de registos inseridos
     """
-    where_clause = f"WHERE pub_date = '{data}'" if data else ""
+    if refresh:
+        atualizar_silver_daily_counts(conn)
+
+    # Valores sempre como parametros; so a forma do WHERE varia
+    # ("WHERE true" evita que o ON CONFLICT seja lido como ON de um JOIN)
+    where_clause = "WHERE pub_date = ?" if data else "WHERE true"
+    params = (calculated_at or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),)
+    if data:
+        params += (data,)
 
     sql = f"""
-    INSERT OR REPLACE INTO gold_daily_summary (
+    INSERT INTO gold_daily_summary (
         summary_date, source_id, category_primary,
         article_count, unique_sources,
         avg_sentiment_polarity, avg_sentiment_subjectivity,
@@ -260,29 +556,43 @@ def calcular_daily_summary(conn: sqlite3.Connection, data: str | None = None) ->
         pub_date as summary_date,
         source_id,
         category_primary,
-        COUNT(*) as article_count,
-        COUNT(DISTINCT source_id) as unique_sources,
-        AVG(sentiment_polarity) as avg_sentiment_polarity,
-        AVG(sentiment_subjectivity) as avg_sentiment_subjectivity,
-        SUM(CASE WHEN sentiment_label = 'positive' THEN 1 ELSE 0 END) as positive_count,
-        SUM(CASE WHEN sentiment_label = 'negative' THEN 1 ELSE 0 END) as negative_count,
-        SUM(CASE WHEN sentiment_label = 'neutral' THEN 1 ELSE 0 END) as neutral_count,
-        AVG(word_count) as avg_word_count,
-        SUM(word_count) as total_word_count,
-        '{datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")}' as calculated_at
-    FROM artigos_silver
+        article_count,
+        CASE WHEN source_id IS NULL THEN 0 ELSE 1 END as unique_sources,
+        sum_polarity / polarity_count as avg_sentiment_polarity,
+        sum_subjectivity / subjectivity_count as avg_sentiment_subjectivity,
+        positive_count,
+        negative_count,
+        neutral_count,
+        CAST(sum_word_count AS REAL) / word_count_count as avg_word_count,
+        sum_word_count as total_word_count,
+        ? as calculated_at
+    FROM silver_daily_counts
     {where_clause}
-    GROUP BY pub_date, source_id, category_primary
+    ON CONFLICT(summary_date, source_id, category_primary) DO UPDATE SET
+        article_count = excluded.article_count,
+        unique_sources = excluded.unique_sources,
+        avg_sentiment_polarity = excluded.avg_sentiment_polarity,
+        avg_sentiment_subjectivity = excluded.avg_sentiment_subjectivity,
+        positive_count = excluded.positive_count,
+        negative_count = excluded.negative_count,
+        neutral_count = excluded.neutral_count,
+        avg_word_count = excluded.avg_word_count,
+        total_word_count = excluded.total_word_count,
+        calculated_at = excluded.calculated_at
     """
 
-    cursor = conn.execute(sql)
-    conn.commit()
+    cursor = conn.execute(sql, params)
+    if commit:
+        conn.commit()
     return cursor.rowcount
 
 
 def calcular_source_stats(conn: sqlite3.Connection,
                           period_start: str | None = None,
-                          period_end: str | None = None) -> int:
+                          period_end: str | None = None,
+                          calculated_at: str | None = None,
+                          commit: bool = True,
+                          refresh: bool = True) -> int:
     """
     Calcula estatisticas por fonte.
 
@@ -290,6 +600,11 @@ def calcular_source_stats(conn: sqlite3.Connection,
         conn: Conexao SQLite
         period_start: Data inicio (YYYY-MM-DD)
         period_end: Data fim (YYYY-MM-DD)
+        calculated_at: Timestamp UTC da execucao (o mesmo em todas as
+            tabelas gold); se None, usa o momento actual
+        commit: Se False, deixa o commit para quem chama (transaccao unica)
+        refresh: Se True, actualiza antes silver_daily_counts; False quando
+            quem chama ja o fez (processar_gold actualiza uma so vez)
 
     Returns:
         Numero de registos inseridos
@@ -307,11 +622,16 @@ def calcular_source_stats(conn: sqlite3.Connection,
     d2 = dt.strptime(period_end, "%Y-%m-%d")
     dias = max((d2 - d1).days, 1)
 
-    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    now = calculated_at or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
-    # Query principal
-    sql = f"""
-    INSERT OR REPLACE INTO gold_source_stats (
+    if refresh:
+        atualizar_silver_daily_counts(conn)
+
+    # Query principal (texto fixo: o SQLite reutiliza o statement preparado).
+    # Um so GROUP BY fonte/categoria; ROW_NUMBER marca a categoria principal
+    # de cada fonte (em vez de uma subquery correlacionada por fonte)
+    sql = """
+    INSERT INTO gold_source_stats (
         source_id, source_name,
         period_start, period_end,
         total_articles, articles_per_day,
@@ -321,44 +641,79 @@ def calcular_source_stats(conn: sqlite3.Connection,
         articles_with_content, content_ratio,
         calculated_at
     )
+    WITH por_categoria AS (
+        SELECT
+            source_id,
+            category_primary,
+            MAX(source_name) as source_name,
+            SUM(article_count) as article_count,
+            SUM(polarity_count) as polarity_count,
+            SUM(sum_polarity) as sum_polarity,
+            SUM(sumsq_polarity) as sumsq_polarity,
+            SUM(title_length_count) as title_length_count,
+            SUM(sum_title_length) as sum_title_length,
+            SUM(content_length_count) as content_length_count,
+            SUM(sum_content_length) as sum_content_length,
+            SUM(articles_with_content) as articles_with_content,
+            ROW_NUMBER() OVER (
+                PARTITION BY source_id ORDER BY SUM(article_count) DESC, category_primary
+            ) as rn
+        FROM silver_daily_counts
+        WHERE pub_date BETWEEN :period_start AND :period_end
+        GROUP BY source_id, category_primary
+    )
     SELECT
         source_id,
         MAX(source_name) as source_name,
-        '{period_start}' as period_start,
-        '{period_end}' as period_end,
-        COUNT(*) as total_articles,
-        CAST(COUNT(*) AS REAL) / {dias} as articles_per_day,
+        :period_start as period_start,
+        :period_end as period_end,
+        SUM(article_count) as total_articles,
+        CAST(SUM(article_count) AS REAL) / :dias as articles_per_day,
         GROUP_CONCAT(DISTINCT category_primary) as categories_covered,
         COUNT(DISTINCT category_primary) as category_count,
-        (
-            SELECT category_primary
-            FROM artigos_silver s2
-            WHERE s2.source_id = artigos_silver.source_id
-              AND pub_date BETWEEN '{period_start}' AND '{period_end}'
-            GROUP BY category_primary
-            ORDER BY COUNT(*) DESC
-            LIMIT 1
-        ) as primary_category,
-        AVG(sentiment_polarity) as avg_sentiment_polarity,
-        SQRT(AVG(sentiment_polarity * sentiment_polarity) - AVG(sentiment_polarity) * AVG(sentiment_polarity)) as sentiment_std_dev,
-        AVG(title_length) as avg_title_length,
-        AVG(content_length) as avg_content_length,
-        SUM(CASE WHEN content_length > 0 THEN 1 ELSE 0 END) as articles_with_content,
-        CAST(SUM(CASE WHEN content_length > 0 THEN 1 ELSE 0 END) AS REAL) / COUNT(*) as content_ratio,
-        '{now}' as calculated_at
-    FROM artigos_silver
-    WHERE pub_date BETWEEN '{period_start}' AND '{period_end}'
+        MAX(CASE WHEN rn = 1 THEN category_primary END) as primary_category,
+        SUM(sum_polarity) / SUM(polarity_count) as avg_sentiment_polarity,
+        SQRT(SUM(sumsq_polarity) / SUM(polarity_count) - (SUM(sum_polarity) / SUM(polarity_count)) * (SUM(sum_polarity) / SUM(polarity_count))) as sentiment_std_dev,
+        CAST(SUM(sum_title_length) AS REAL) / SUM(title_length_count) as avg_title_length,
+        CAST(SUM(sum_content_length) AS REAL) / SUM(content_length_count) as avg_content_length,
+        SUM(articles_with_content) as articles_with_content,
+        CAST(SUM(articles_with_content) AS REAL) / SUM(article_count) as content_ratio,
+        :now as calculated_at
+    FROM por_categoria
+    WHERE true
     GROUP BY source_id
+    ON CONFLICT(source_id, period_start, period_end) DO UPDATE SET
+        source_name = excluded.source_name,
+        total_articles = excluded.total_articles,
+        articles_per_day = excluded.articles_per_day,
+        categories_covered = excluded.categories_covered,
+        category_count = excluded.category_count,
+        primary_category = excluded.primary_category,
+        avg_sentiment_polarity = excluded.avg_sentiment_polarity,
+        sentiment_std_dev = excluded.sentiment_std_dev,
+        avg_title_length = excluded.avg_title_length,
+        avg_content_length = excluded.avg_content_length,
+        articles_with_content = excluded.articles_with_content,
+        content_ratio = excluded.content_ratio,
+        calculated_at = excluded.calculated_at
     """
 
-    cursor = conn.execute(sql)
-    conn.commit()
+    cursor = conn.execute(sql, {
+        "period_start": period_start,
+        "period_end": period_end,
+        "dias": dias,
+        "now": now,
+    })
+    if commit:
+        conn.commit()
     return cursor.rowcount
 
 
 def calcular_trending_topics(conn: sqlite3.Connection,
                              data: str | None = None,
-                             top_n: int = 20) -> int:
+                             top_n: int = 20,
+                             calculated_at: str | None = None,
+                             commit: bool = True) -> int:
     """
     Identifica topicos em tendencia para um dia.
 
@@ -366,6 +721,9 @@ def calcular_trending_topics(conn: sqlite3.Connection,
         conn: Conexao SQLite
         data: Data especifica (YYYY-MM-DD) ou None para hoje
         top_n: Numero de topicos a retornar
+        calculated_at: Timestamp UTC da execucao (o mesmo em todas as
+            tabelas gold); se None, usa o momento actual
+        commit: Se False, deixa o commit para quem chama (transaccao unica)
 
     Returns:
         Numero de registos inseridos
@@ -375,40 +733,46 @@ def calcular_trending_topics(conn: sqlite3.Connection,
         row = cursor.fetchone()
         data = row[0] if row[0] else datetime.now().strftime("%Y-%m-%d")
 
-    # Buscar titulos do dia
-    cursor = conn.execute("""
-        SELECT title_clean, source_id, category_primary, sentiment_polarity
-        FROM artigos_silver
-        WHERE pub_date = ?
-    """, (data,))
+    total = conn.execute(
+        "SELECT COUNT(*) FROM artigos_silver WHERE pub_date = ?", (data,)
+    ).fetchone()[0]
 
-    rows = cursor.fetchall()
-
-    if not rows:
+    if not total:
         return 0
 
-    # Contar palavras
-    word_counter = Counter()
-    word_articles = {}  # palavra -> lista de (titulo, fonte, categoria, sentimento)
-
-    for title, source, category, sentiment in rows:
-        palavras = extrair_palavras_significativas(title)
-        for palavra in set(palavras):  # set para contar uma vez por artigo
-            word_counter[palavra] += 1
-            if palavra not in word_articles:
-                word_articles[palavra] = []
-            word_articles[palavra].append((title, source, category, sentiment or 0))
-
-    # Top N palavras
-    top_words = word_counter.most_common(top_n)
+    # Dias grandes: tokenizar e contar no SQLite (FTS5), sem trazer os
+    # titulos para Python; sem FTS5 (ou dias pequenos), o ciclo Python
+    top_words = None
+    if total >= LIMIAR_CONTAGEM_FTS:
+        try:
+            top_words, word_articles = contar_palavras_fts(conn, data, top_n)
+        except sqlite3.OperationalError:
+            top_words = None
+
+    if top_words is None:
+        # Titulos do dia em streaming: o cursor e consumido pelo contador,
+        # sem materializar todas as linhas (fetchall) antes de contar.
+        # Titulos nulos ou com menos de 3 caracteres nao tem nenhuma palavra
+        # significativa: o SQLite filtra-os antes de passarem para Python
+        cursor = conn.execute("""
+            SELECT title_clean, source_id, category_primary, sentiment_polarity
+            FROM artigos_silver
+            WHERE pub_date = ? AND title_clean IS NOT NULL AND length(title_clean) >= 3
+        """, (data,))
+        top_words, word_articles = contar_palavras(cursor, top_n)
 
     if not top_words:
         return 0
 
-    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    now = calculated_at or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
-    # Inserir na tabela
-    inseridos = 0
+    # Substituir o top do dia (termos que sairam do top nao ficam)
+    conn.execute("DELETE FROM gold_trending_topics WHERE topic_date = ?", (data,))
+
+    # Uma linha por termo; um so executemany (statement preparado uma vez),
+    # na mesma transaccao que o DELETE acima. As colunas JSON vao por orjson
+    # (serializa em C, UTF-8 sem escapes)
+    registos = []
     for rank, (term, freq) in enumerate(top_words, 1):
         articles = word_articles[term]
 
@@ -418,35 +782,75 @@ def calcular_trending_topics(conn: sqlite3.Connection,
         categories = list(set(a[2] for a in articles if a[2]))
         avg_sentiment = sum(a[3] for a in articles) / len(articles) if articles else 0
 
-        sql = """
-        INSERT OR REPLACE INTO gold_trending_topics (
-            topic_date, term, term_type, frequency, article_count,
-            sample_titles, sources, categories, avg_sentiment, rank, calculated_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        conn.execute(sql, (
+        registos.append((
             data,
             term,
             "word",
             freq,
             len(articles),
-            json.dumps(sample_titles, ensure_ascii=False),
-            json.dumps(sources),
-            json.dumps(categories),
+            orjson.dumps(sample_titles).decode(),
+            orjson.dumps(sources).decode(),
+            orjson.dumps(categories).decode(),
             round(avg_sentiment, 4),
             rank,
             now,
         ))
-        inseridos += 1
 
-    conn.commit()
+    conn.executemany(SQL_INSERIR_TRENDING, registos)
+    inseridos = len(registos)
+
+    if commit:
+        conn.commit()
+    return inseridos
+
+
+def atualizar_trending_topics(conn: sqlite3.Connection, top_n: int = 20,
+                              calculated_at: str | None = None,
+                              commit: bool = True) -> int:
+    """
+    Recalcula os trending topics apenas dos dias com artigos silver novos.
+
+    Usa a marca de agua em gold_watermarks: so as datas com processed_at
+    posterior ao ultimo processamento sao recalculadas (O(novos) em vez de
+    O(todos)). Recalcular um dia e idempotente, por isso a marca so avanca
+    depois de todos os dias estarem gravados.
+
+    Args:
+        conn: Conexao SQLite
+        top_n: Numero de topicos por dia
+        calculated_at: Timestamp UTC da execucao (o mesmo em todas as
+            tabelas gold); se None, usa o momento actual
+        commit: Se False, deixa o commit para quem chama (transaccao unica)
+
+    Returns:
+        Numero de registos inseridos
+    """
+    # Sem marca de agua (ou silver sem processed_at): todas as datas
+    datas, max_processed = datas_com_novos_artigos(
+        conn, ler_marca_de_agua(conn, "gold_trending_topics")
+    )
+
+    # Um so timestamp para todos os dias recalculados
+    calculated_at = calculated_at or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    inseridos = sum(
+        calcular_trending_topics(conn, data, top_n, calculated_at, commit=False) for data in datas
+    )
+
+    if max_processed:
+        gravar_marca_de_agua(conn, "gold_trending_topics", max_processed)
+    if commit:
+        conn.commit()
+
     return inseridos
 
 
 def calcular_sentiment_timeline(conn: sqlite3.Connection,
                                 granularity: str = "daily",
                                 source_id: str | None = None,
-                                category: str | None = None) -> int:
+                                category: str | None = None,
+                                calculated_at: str | None = None,
+                                commit: bool = True,
+                                refresh: bool = True) -> int:
     """
     Calcula evolucao do sentimento ao longo do tempo.
 
@@ -455,16 +859,28 @@ def calcular_sentiment_timeline(conn: sqlite3.Connection,
         granularity: "daily", "weekly", "monthly"
         source_id: Filtrar por fonte (opcional)
         category: Filtrar por categoria (opcional)
+        calculated_at: Timestamp UTC da execucao (o mesmo em todas as
+            tabelas gold); se None, usa o momento actual
+        commit: Se False, deixa o commit para quem chama (transaccao unica)
+        refresh: Se True, actualiza antes silver_daily_counts; False quando
+            quem chama ja o fez (processar_gold actualiza uma so vez)
 
     Returns:
         Numero de registos inseridos
     """
-    # Construir clausulas WHERE
+    now = calculated_at or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    source_val = source_id or "ALL"
+    category_val = category or "ALL"
+
+    # Construir clausulas WHERE (valores como parametros, pela ordem do SQL)
     conditions = []
+    params = [granularity, source_val, category_val, now]
     if source_id:
-        conditions.append(f"source_id = '{source_id}'")
+        conditions.append("source_id = ?")
+        params.append(source_id)
     if category:
-        conditions.append(f"category_primary = '{category}'")
+        conditions.append("category_primary = ?")
+        params.append(category)
 
     where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
 
@@ -476,12 +892,11 @@ def calcular_sentiment_timeline(conn: sqlite3.Connection,
     else:
         date_expr = "pub_date"
 
-    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-    source_val = source_id or "ALL"
-    category_val = category or "ALL"
+    if refresh:
+        atualizar_silver_daily_counts(conn)
 
     sql = f"""
-    INSERT OR REPLACE INTO gold_sentiment_timeline (
+    INSERT INTO gold_sentiment_timeline (
         timeline_date, granularity, source_id, category_primary,
         avg_polarity, avg_subjectivity, min_polarity, max_polarity, std_polarity,
         positive_pct, negative_pct, neutral_pct,
@@ -489,32 +904,47 @@ def calcular_sentiment_timeline(conn: sqlite3.Connection,
     )
     SELECT
         {date_expr} as timeline_date,
-        '{granularity}' as granularity,
-        '{source_val}' as source_id,
-        '{category_val}' as category_primary,
-        AVG(sentiment_polarity) as avg_polarity,
-        AVG(sentiment_subjectivity) as avg_subjectivity,
-        MIN(sentiment_polarity) as min_polarity,
-        MAX(sentiment_polarity) as max_polarity,
-        SQRT(AVG(sentiment_polarity * sentiment_polarity) - AVG(sentiment_polarity) * AVG(sentiment_polarity)) as std_polarity,
-        CAST(SUM(CASE WHEN sentiment_label = 'positive' THEN 1 ELSE 0 END) AS REAL) * 100 / COUNT(*) as positive_pct,
-        CAST(SUM(CASE WHEN sentiment_label = 'negative' THEN 1 ELSE 0 END) AS REAL) * 100 / COUNT(*) as negative_pct,
-        CAST(SUM(CASE WHEN sentiment_label = 'neutral' THEN 1 ELSE 0 END) AS REAL) * 100 / COUNT(*) as neutral_pct,
-        COUNT(*) as article_count,
-        '{now}' as calculated_at
-    FROM artigos_silver
+        ? as granularity,
+        ? as source_id,
+        ? as category_primary,
+        SUM(sum_polarity) / SUM(polarity_count) as avg_polarity,
+        SUM(sum_subjectivity) / SUM(subjectivity_count) as avg_subjectivity,
+        MIN(min_polarity) as min_polarity,
+        MAX(max_polarity) as max_polarity,
+        SQRT(SUM(sumsq_polarity) / SUM(polarity_count) - (SUM(sum_polarity) / SUM(polarity_count)) * (SUM(sum_polarity) / SUM(polarity_count))) as std_polarity,
+        CAST(SUM(positive_count) AS REAL) * 100 / SUM(article_count) as positive_pct,
+        CAST(SUM(negative_count) AS REAL) * 100 / SUM(article_count) as negative_pct,
+        CAST(SUM(neutral_count) AS REAL) * 100 / SUM(article_count) as neutral_pct,
+        SUM(article_count) as article_count,
+        ? as calculated_at
+    FROM silver_daily_counts
     {where_clause}
     GROUP BY {date_expr}
+    ON CONFLICT(timeline_date, granularity, source_id, category_primary) DO UPDATE SET
+        avg_polarity = excluded.avg_polarity,
+        avg_subjectivity = excluded.avg_subjectivity,
+        min_polarity = excluded.min_polarity,
+        max_polarity = excluded.max_polarity,
+        std_polarity = excluded.std_polarity,
+        positive_pct = excluded.positive_pct,
+        negative_pct = excluded.negative_pct,
+        neutral_pct = excluded.neutral_pct,
+        article_count = excluded.article_count,
+        calculated_at = excluded.calculated_at
     """
 
-    cursor = conn.execute(sql)
-    conn.commit()
+    cursor = conn.execute(sql, params)
+    if commit:
+        conn.commit()
     return cursor.rowcount
 
 
 def calcular_category_matrix(conn: sqlite3.Connection,
                              period_start: str | None = None,
-                             period_end: str | None = None) -> int:
+                             period_end: str | None = None,
+                             calculated_at: str | None = None,
+                             commit: bool = True,
+                             refresh: bool = True) -> int:
     """
     Calcula matriz de distribuicao categorias x fontes.
 
@@ -522,6 +952,11 @@ def calcular_category_matrix(conn: sqlite3.Connection,
         conn: Conexao SQLite
         period_start: Data inicio (YYYY-MM-DD)
         period_end: Data fim (YYYY-MM-DD)
+        calculated_at: Timestamp UTC da execucao (o mesmo em todas as
+            tabelas gold); se None, usa o momento actual
+        commit: Se False, deixa o commit para quem chama (transaccao unica)
+        refresh: Se True, actualiza antes silver_daily_counts; False quando
+            quem chama ja o fez (processar_gold actualiza uma so vez)
 
     Returns:
         Numero de registos inseridos
@@ -533,45 +968,71 @@ def calcular_category_matrix(conn: sqlite3.Connection,
         period_start = row[0] or datetime.now().strftime("%Y-%m-%d")
         period_end = row[1] or datetime.now().strftime("%Y-%m-%d")
 
-    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    now = calculated_at or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
-    sql = f"""
-    INSERT OR REPLACE INTO gold_category_matrix (
+    if refresh:
+        atualizar_silver_daily_counts(conn)
+
+    sql = """
+    INSERT INTO gold_category_matrix (
         period_start, period_end,
         source_id, source_name, category_primary,
         article_count, pct_of_source, pct_of_category,
         avg_sentiment, calculated_at
     )
+    WITH base AS (
+        SELECT
+            source_id,
+            MAX(source_name) as source_name,
+            category_primary,
+            SUM(article_count) as article_count,
+            SUM(sum_polarity) / SUM(polarity_count) as avg_sentiment
+        FROM silver_daily_counts
+        WHERE pub_date BETWEEN :period_start AND :period_end
+        GROUP BY source_id, category_primary
+    ),
+    matriz AS (
+        -- Totais por fonte e por categoria como SUM() OVER sobre o mesmo
+        -- agregado (antes: dois GROUP BY extra juntos por JOIN)
+        SELECT
+            *,
+            CAST(article_count AS REAL) * 100
+                / SUM(article_count) OVER (PARTITION BY source_id) as pct_of_source,
+            CAST(article_count AS REAL) * 100
+                / SUM(article_count) OVER (PARTITION BY category_primary) as pct_of_category
+        FROM base
+    )
     SELECT
-        '{period_start}' as period_start,
-        '{period_end}' as period_end,
-        s.source_id,
-        s.source_name,
-        s.category_primary,
-        COUNT(*) as article_count,
-        CAST(COUNT(*) AS REAL) * 100 / source_total.total as pct_of_source,
-        CAST(COUNT(*) AS REAL) * 100 / category_total.total as pct_of_category,
-        AVG(s.sentiment_polarity) as avg_sentiment,
-        '{now}' as calculated_at
-    FROM artigos_silver s
-    JOIN (
-        SELECT source_id, COUNT(*) as total
-        FROM artigos_silver
-        WHERE pub_date BETWEEN '{period_start}' AND '{period_end}'
-        GROUP BY source_id
-    ) source_total ON s.source_id = source_total.source_id
-    JOIN (
-        SELECT category_primary, COUNT(*) as total
-        FROM artigos_silver
-        WHERE pub_date BETWEEN '{period_start}' AND '{period_end}'
-        GROUP BY category_primary
-    ) category_total ON s.category_primary = category_total.category_primary
-    WHERE s.pub_date BETWEEN '{period_start}' AND '{period_end}'
-    GROUP BY s.source_id, s.category_primary
+        :period_start as period_start,
+        :period_end as period_end,
+        source_id,
+        source_name,
+        category_primary,
+        article_count,
+        pct_of_source,
+        pct_of_category,
+        avg_sentiment,
+        :now as calculated_at
+    FROM matriz
+    -- Filtro depois das janelas: fontes/categorias NULL contam nos totais
+    -- (como no JOIN anterior) mas nao geram linhas
+    WHERE source_id IS NOT NULL AND category_primary IS NOT NULL
+    ON CONFLICT(period_start, period_end, source_id, category_primary) DO UPDATE SET
+        source_name = excluded.source_name,
+        article_count = excluded.article_count,
+        pct_of_source = excluded.pct_of_source,
+        pct_of_category = excluded.pct_of_category,
+        avg_sentiment = excluded.avg_sentiment,
+        calculated_at = excluded.calculated_at
     """
 
-    cursor = conn.execute(sql)
-    conn.commit()
+    cursor = conn.execute(sql, {
+        "period_start": period_start,
+        "period_end": period_end,
+        "now": now,
+    })
+    if commit:
+        conn.commit()
     return cursor.rowcount
 
 
@@ -579,6 +1040,26 @@ def calcular_category_matrix(conn: sqlite3.Connection,
 # FUNCOES DE BASE DE DADOS
 # ============================================================================
 
+def abrir_conexao_gold(db_path: Path) -> sqlite3.Connection:
+    """
+    Abre a base de dados configurada para as agregacoes gold.
+
+    Parte da configuracao de escrita do pipeline (WAL, synchronous=NORMAL,
+    temporarios em memoria, mmap) e junta o que pesa nas agregacoes: cache
+    de paginas de 128 MB e ate 4 threads auxiliares para ordenacoes grandes.
+
+    Args:
+        db_path: Caminho do ficheiro SQLite
+
+    Returns:
+        Conexao SQLite
+    """
+    conn = abrir_conexao(db_path)
+    conn.execute("PRAGMA cache_size = -131072")
+    conn.execute("PRAGMA threads = 4")
+    return conn
+
+
 def criar_tabelas_gold(conn: sqlite3.Connection) -> None:
     """Cria todas as tabelas gold se nao existirem."""
     conn.executescript(SQL_CRIAR_TABELAS_GOLD)
@@ -600,8 +1081,9 @@ def processar_gold(conn: sqlite3.Connection, verbose: bool = True) -> dict:
     Returns:
         Dict com contagens por tipo de agregacao
     """
-    # Criar tabelas
+    # Criar tabelas e dar ao planeador estatisticas reais (indices da silver)
     criar_tabelas_gold(conn)
+    atualizar_estatisticas(conn)
 
     results = {
         "daily_summary": 0,
@@ -611,40 +1093,63 @@ def processar_gold(conn: sqlite3.Connection, verbose: bool = True) -> dict:
         "category_matrix": 0,
     }
 
-    # 1. Daily Summary
-    if verbose:
-        print("   [1/5] Calculando daily_summary...")
-    results["daily_summary"] = calcular_daily_summary(conn)
-    if verbose:
-        print(f"         {results['daily_summary']} registos")
-
-    # 2. Source Stats
-    if verbose:
-        print("   [2/5] Calculando source_stats...")
-    results["source_stats"] = calcular_source_stats(conn)
-    if verbose:
-        print(f"         {results['source_stats']} registos")
-
-    # 3. Trending Topics
-    if verbose:
-        print("   [3/5] Calculando trending_topics...")
-    results["trending_topics"] = calcular_trending_topics(conn)
-    if verbose:
-        print(f"         {results['trending_topics']} registos")
-
-    # 4. Sentiment Timeline
-    if verbose:
-        print("   [4/5] Calculando sentiment_timeline...")
-    results["sentiment_timeline"] = calcular_sentiment_timeline(conn)
-    if verbose:
-        print(f"         {results['sentiment_timeline']} registos")
+    # Um so timestamp para toda a execucao: as cinco tabelas ficam com o
+    # mesmo calculated_at (passado como parametro, nunca interpolado)
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
-    # 5. Category Matrix
-    if verbose:
-        print("   [5/5] Calculando category_matrix...")
-    results["category_matrix"] = calcular_category_matrix(conn)
-    if verbose:
-        print(f"         {results['category_matrix']} registos")
+    # Uma so transaccao para as cinco agregacoes: um commit (um fsync) no
+    # fim, leituras consistentes entre elas e rollback de tudo se falhar
+    with conn:
+        # silver_daily_counts actualizada uma so vez: as quatro agregacoes
+        # que a leem usam refresh=False (com a marca ">=" cada actualizacao
+        # volta a reconstruir o dia da fronteira)
+        atualizar_silver_daily_counts(conn)
+
+        # 1. Daily Summary
+        if verbose:
+            print("   [1/5] Calculando daily_summary...")
+        results["daily_summary"] = calcular_daily_summary(
+            conn, calculated_at=now, commit=False, refresh=False
+        )
+        if verbose:
+            print(f"         {results['daily_summary']} registos")
+
+        # 2. Source Stats
+        if verbose:
+            print("   [2/5] Calculando source_stats...")
+        results["source_stats"] = calcular_source_stats(
+            conn, calculated_at=now, commit=False, refresh=False
+        )
+        if verbose:
+            print(f"         {results['source_stats']} registos")
+
+        # 3. Trending Topics
+        if verbose:
+            print("   [3/5] Calculando trending_topics...")
+        results["trending_topics"] = atualizar_trending_topics(conn, calculated_at=now, commit=False)
+        if verbose:
+            print(f"         {results['trending_topics']} registos")
+
+        # 4. Sentiment Timeline
+        if verbose:
+            print("   [4/5] Calculando sentiment_timeline...")
+        results["sentiment_timeline"] = calcular_sentiment_timeline(
+            conn, calculated_at=now, commit=False, refresh=False
+        )
+        if verbose:
+            print(f"         {results['sentiment_timeline']} registos")
+
+        # 5. Category Matrix
+        if verbose:
+            print("   [5/5] Calculando category_matrix...")
+        results["category_matrix"] = calcular_category_matrix(
+            conn, calculated_at=now, commit=False, refresh=False
+        )
+        if verbose:
+            print(f"         {results['category_matrix']} registos")
+
+    # Libertar a memoria da cache de tokenizacao entre execucoes
+    extrair_palavras_significativas.cache_clear()
 
     if verbose:
         total = sum(results.values())
@@ -667,11 +1172,50 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Caminho do ficheiro SQLite (default: db/newsdata.db)",
     )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Mostrar o EXPLAIN QUERY PLAN das queries executadas",
+    )
     return parser.parse_args()
 
 
+def mostrar_planos(conn: sqlite3.Connection, statements: list[str]) -> None:
+    """
+    Imprime o EXPLAIN QUERY PLAN de cada query executada.
+
+    O mesmo statement repete-se com parametros diferentes (ex: um por dia
+    nos trending topics): cada plano distinto so e impresso uma vez, e os
+    statements sem plano (INSERT ... VALUES) sao omitidos.
+
+    Args:
+        conn: Conexao SQLite
+        statements: SQL recolhido com conn.set_trace_callback
+    """
+    vistos = set()
+    for sql in statements:
+        if not sql.lstrip().upper().startswith(("SELECT", "INSERT", "WITH", "DELETE")):
+            continue
+        try:
+            plano = tuple(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql))
+        except sqlite3.Error:
+            # Ex: tabelas temporarias do FTS5 ja removidas
+            continue
+
+        resumo = " ".join(sql.split())[:80]
+        if not plano or (resumo.split(" WHERE")[0], plano) in vistos:
+            continue
+        vistos.add((resumo.split(" WHERE")[0], plano))
+
+        print(f"\n[PLAN] {resumo}")
+        for detalhe in plano:
+            print(f"       {detalhe}")
+
+
 def main() -> int:
     """Processa Gold Layer standalone."""
+    ensure_utf8()
+
     print("\n" + "=" * 60)
     print("    NEWSDATA.IO - GOLD LAYER")
     print("=" * 60 + "\n")
@@ -685,20 +1229,32 @@ def main() -> int:
         print(f"[ERRO] Base de dados nao encontrada: {db_path}")
         return 1
 
+    conn = abrir_conexao_gold(db_path)
     try:
-        conn = sqlite3.connect(db_path)
         print(f"[DB] Conectado a {db_path}\n")
 
+        # Recolher o SQL executado (com os parametros expandidos)
+        statements = []
+        if args.explain:
+            conn.set_trace_callback(statements.append)
+
         print("[GOLD] A calcular agregacoes...")
         results = processar_gold(conn, verbose=True)
 
-        conn.close()
+        if args.explain:
+            conn.set_trace_callback(None)
+            mostrar_planos(conn, statements)
         return 0
 
     except Exception as e:
         print(f"\n[ERRO] {e}")
         return 1
 
+    finally:
+        # Estatisticas que ficaram desactualizadas nesta sessao
+        conn.execute("PRAGMA optimize")
+        conn.close()
+
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -8,24 +8,26 @@ Uso:
 """
 
 import argparse
-import io
-import json
+import os
 import re
 import sqlite3
 import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime, timezone
+from functools import partial
+from itertools import islice, repeat
+from operator import itemgetter
 from pathlib import Path
 from urllib.parse import urlparse
 
+import orjson
 import pandas as pd
-from textblob import TextBlob
-
-# Forcar UTF-8 no stdout/stderr (Windows)
-if sys.stdout.encoding != "utf-8":
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-if sys.stderr.encoding != "utf-8":
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+from textblob.en import sentiment as pattern_sentiment
 
+from src.db.loader import abrir_conexao, atualizar_estatisticas
+from src.utils.console import ensure_utf8
 from src.utils.text_processing import (
     limpar_texto_completo,
     extrair_dominio,
@@ -86,9 +88,86 @@ CIDADES_CONHECIDAS = {
     "moscovo", "moscow", "pequim", "beijing", "toquio", "tokyo",
 }
 
+# Maximo de caracteres do texto passado a analise de sentimento, entidades
+# e deteccao de lingua: o custo destas e linear no tamanho do texto e o
+# sinal de uma noticia esta quase todo no titulo e nos primeiros paragrafos
+LIMITE_TEXTO_NLP = 4096
+
+# Caracteres usados na deteccao de lingua: o langdetect extrai os n-gramas
+# do texto todo (custo linear, o maior do NLP por artigo), mas umas
+# centenas de caracteres ja chegam para identificar a lingua
+LIMITE_TEXTO_LINGUA = 1000
+
+# Nomes de lingua dos metadados -> codigos do langdetect
+CODIGOS_LINGUA = {
+    "portuguese": "pt",
+    "english": "en",
+    "spanish": "es",
+    "french": "fr",
+    "german": "de",
+    "italian": "it",
+}
+
 # Organizacoes comuns (sufixos)
 ORG_SUFIXOS = ["sa", "lda", "inc", "corp", "ltd", "gmbh", "spa", "ag"]
 
+# Padroes de entidades compilados uma vez (evita o lookup na cache do re
+# por artigo e por padrao)
+# Nomes proprios: 2-4 palavras capitalizadas consecutivas
+# Exemplo: "Antonio Costa", "Maria da Silva"
+NOME_PATTERN = re.compile(
+    r"\b([A-Z][a-záàâãéèêíïóôõöúçñ]+(?:\s+(?:da|de|do|dos|das|e)?\s*[A-Z][a-záàâãéèêíïóôõöúçñ]+){1,3})\b"
+)
+ORG_PATTERNS = {
+    sufixo: re.compile(rf"\b([A-Z][A-Za-záàâãéèêíïóôõöúçñ\s]+\s+{sufixo}\.?)\b", re.IGNORECASE)
+    for sufixo in ORG_SUFIXOS
+}
+# Pre-filtro das organizacoes: os padroes acima fazem muito backtracking e
+# so podem encontrar algo se o sufixo aparecer como palavra depois de um
+# espaco; uma passagem linear diz quais vale a pena correr
+RE_SUFIXO_ORG = re.compile(r"\s(" + "|".join(ORG_SUFIXOS) + r")\b", re.IGNORECASE)
+
+
+def regex_trie(palavras: set[str]) -> str:
+    """
+    Constroi uma alternancia regex com os prefixos comuns fatorizados.
+
+    "lisboa|lisbon|london" passa a "l(?:isbo(?:a|n)|ondon)": em cada posicao
+    do texto o motor do re testa um caracter por ramo em vez de tentar cada
+    palavra desde o inicio. Aceita as mesmas palavras que a alternancia
+    simples com as mais longas primeiro.
+
+    Args:
+        palavras: Palavras literais
+
+    Returns:
+        Padrao regex (sem grupo de captura)
+    """
+    trie = {}
+    for palavra in palavras:
+        no = trie
+        for c in palavra:
+            no = no.setdefault(c, {})
+        no[""] = {}  # fim de palavra
+
+    def construir(no: dict) -> str:
+        ramos = [re.escape(c) + construir(filho) for c, filho in sorted(no.items()) if c]
+        if not ramos:
+            return ""
+        padrao = "(?:" + "|".join(ramos) + ")"
+        # Fim de palavra aqui: o resto e opcional (greedy, tenta o mais longo)
+        return padrao + "?" if "" in no else padrao
+
+    return construir(trie)
+
+
+# Localizacoes: todos os paises e cidades numa so alternancia em trie,
+# percorrida numa so passagem pelo texto
+LOC_PATTERN = re.compile(
+    r"\b(" + regex_trie(PAISES_CONHECIDOS | CIDADES_CONHECIDAS) + r")\b",
+    re.IGNORECASE,
+)
+
 
 # ============================================================================
 # SQL - SCHEMA SILVER
@@ -153,12 +232,85 @@ CREATE TABLE IF NOT EXISTS artigos_silver (
     processed_at TEXT
 );
 
-CREATE INDEX IF NOT EXISTS idx_silver_pub_date ON artigos_silver(pub_date);
 CREATE INDEX IF NOT EXISTS idx_silver_source ON artigos_silver(source_id);
 CREATE INDEX IF NOT EXISTS idx_silver_category ON artigos_silver(category_primary);
 CREATE INDEX IF NOT EXISTS idx_silver_sentiment ON artigos_silver(sentiment_label);
+
+-- Dashboard: so le da silver os artigos recentes (os agregados vem da gold)
+CREATE INDEX IF NOT EXISTS idx_silver_recent ON artigos_silver(pub_date DESC, processed_at DESC);
+
+-- Indices sem leitores (cada indice custa em todos os INSERT): os agregados
+-- do dashboard leem gold_daily_summary e as procuras por pub_date (titulos
+-- do trending, contagem do dia) usam o prefixo de idx_silver_recent ou de
+-- idx_silver_gold_covering
+DROP INDEX IF EXISTS idx_silver_dashboard;
+DROP INDEX IF EXISTS idx_silver_pub_date;
+DROP INDEX IF EXISTS idx_silver_date_title;
+
+-- Marcas de agua da gold: datas com processed_at novo sem ler a tabela toda
+CREATE INDEX IF NOT EXISTS idx_silver_processed ON artigos_silver(processed_at, pub_date);
+
+-- Indice de cobertura da gold: o refresh de silver_daily_counts (filtro por
+-- pub_date, GROUP BY fonte/categoria) le so o indice, nunca a tabela
+CREATE INDEX IF NOT EXISTS idx_silver_gold_covering ON artigos_silver(
+    pub_date, source_id, category_primary,
+    source_name, sentiment_polarity, sentiment_subjectivity, sentiment_label,
+    word_count, title_length, content_length
+);
+"""
+
+
+# Artigos a partir dos quais o NLP e distribuido por varios processos (abaixo
+# disto o arranque dos processos custa mais do que poupa)
+LIMIAR_PARALELO = 200
+
+# Artigos silver gravados por transaccao: commits periodicos limitam o
+# crescimento do WAL e o que se perde numa falha, sem voltar ao custo de um
+# commit por artigo
+TAMANHO_LOTE_COMMIT = 5000
+
+# Colunas escritas por processar_silver (chaves do dict de transformar_artigo)
+COLUNAS_SILVER = [
+    "article_id", "title_clean", "description_clean", "content_clean",
+    "pub_date", "pub_datetime", "pub_year", "pub_month", "pub_day", "pub_hour",
+    "source_id", "source_name",
+    "category_primary", "category_list", "category_count",
+    "link", "link_valid", "link_domain",
+    "language", "language_detected", "language_match",
+    "sentiment_polarity", "sentiment_subjectivity", "sentiment_label",
+    "entities_persons", "entities_orgs", "entities_locations", "entity_count",
+    "title_length", "description_length", "content_length", "word_count",
+    "country", "endpoint", "processed_at",
+]
+
+SQL_INSERIR_SILVER = (
+    f"INSERT OR REPLACE INTO artigos_silver ({', '.join(COLUNAS_SILVER)}) "
+    f"VALUES ({', '.join(['?'] * len(COLUNAS_SILVER))})"
+)
+
+# Colunas bronze lidas por transformar_artigo (as restantes, como
+# image_url ou loaded_at, nao passam para a silver)
+COLUNAS_BRONZE_SILVER = [
+    "article_id", "title", "description", "content", "pubDate",
+    "category", "link", "language", "source_id", "source_name",
+    "country", "endpoint",
+]
+
+# Artigos bronze sem linha silver. Anti-join: por artigo bronze, uma
+# procura no indice da chave primaria da silver (article_id), que cobre a
+# subquery sem ler a tabela
+SQL_ARTIGOS_PENDENTES = f"""
+SELECT {', '.join('a.' + col for col in COLUNAS_BRONZE_SILVER)}
+FROM artigos a
+WHERE NOT EXISTS (
+    SELECT 1 FROM artigos_silver s WHERE s.article_id = a.article_id
+)
 """
 
+# Extrai de um dict silver o tuplo de valores pela ordem de COLUNAS_SILVER
+# (itemgetter construido uma vez; a extraccao corre em C)
+LINHA_SILVER = itemgetter(*COLUNAS_SILVER)
+
 
 # ============================================================================
 # FUNCOES DE PARSING DE DATAS
@@ -211,6 +363,40 @@ def parse_pub_date(date_str: str | None) -> dict:
     return result
 
 
+def parse_pub_dates(datas: list[str | None]) -> list[dict]:
+    """
+    Versao vectorizada de parse_pub_date para uma coluna inteira.
+
+    O formato padrao e convertido de uma vez com pd.to_datetime; so as
+    datas noutro formato (ISO, com fuso) passam por parse_pub_date.
+
+    Args:
+        datas: Lista de pubDate
+
+    Returns:
+        Lista de dicts como os de parse_pub_date, pela mesma ordem
+    """
+    dt = pd.to_datetime(pd.Series(datas, dtype=object), format="%Y-%m-%d %H:%M:%S", errors="coerce")
+
+    colunas = pd.DataFrame({
+        "pub_date": dt.dt.strftime("%Y-%m-%d"),
+        "pub_datetime": dt.dt.strftime("%Y-%m-%dT%H:%M:%S"),
+        "pub_year": dt.dt.year.astype("Int64"),
+        "pub_month": dt.dt.month.astype("Int64"),
+        "pub_day": dt.dt.day.astype("Int64"),
+        "pub_hour": dt.dt.hour.astype("Int64"),
+    }).astype(object)
+    # NaN/NA -> None (e int do Python) para o sqlite3
+    resultado = colunas.where(colunas.notna(), None).to_dict("records")
+
+    # Formatos alternativos: linha a linha
+    for i, (data, valida) in enumerate(zip(datas, dt.notna())):
+        if data and not valida:
+            resultado[i] = parse_pub_date(data)
+
+    return resultado
+
+
 # ============================================================================
 # FUNCOES DE NORMALIZACAO
 # ============================================================================
@@ -241,15 +427,11 @@ def normalizar_categoria(categoria_str: str | None) -> dict:
     if not categorias:
         return result
 
-    # Normalizar cada categoria
-    categorias_norm = []
-    for cat in categorias:
-        cat_norm = CATEGORIAS_NORMALIZADAS.get(cat, cat)
-        if cat_norm not in categorias_norm:
-            categorias_norm.append(cat_norm)
+    # Normalizar cada categoria (dict.fromkeys: sem repetidas, pela ordem)
+    categorias_norm = list(dict.fromkeys(CATEGORIAS_NORMALIZADAS.get(cat, cat) for cat in categorias))
 
     result["category_primary"] = categorias_norm[0] if categorias_norm else "general"
-    result["category_list"] = json.dumps(categorias_norm)
+    result["category_list"] = orjson.dumps(categorias_norm).decode()
     result["category_count"] = len(categorias_norm)
 
     return result
@@ -290,7 +472,11 @@ def validar_url(url: str | None) -> dict:
 
 def analisar_sentimento(texto: str | None) -> dict:
     """
-    Analisa sentimento usando TextBlob.
+    Analisa sentimento usando o lexico do TextBlob (PatternAnalyzer).
+
+    Chama directamente o analisador do lexico: criar um TextBlob por artigo
+    (e o namedtuple que o PatternAnalyzer monta a cada chamada) custava
+    mais do que a propria pontuacao. O resultado e o mesmo.
 
     Args:
         texto: Texto a analisar
@@ -308,9 +494,7 @@ def analisar_sentimento(texto: str | None) -> dict:
         return result
 
     try:
-        blob = TextBlob(texto)
-        polarity = blob.sentiment.polarity
-        subjectivity = blob.sentiment.subjectivity
+        polarity, subjectivity = pattern_sentiment(texto)
 
         result["sentiment_polarity"] = round(polarity, 4)
         result["sentiment_subjectivity"] = round(subjectivity, 4)
@@ -353,50 +537,42 @@ def extrair_entidades(texto: str | None) -> dict:
     if not texto:
         return result
 
-    texto_lower = texto.lower()
     persons = set()
     orgs = set()
     locations = set()
 
     # Extrair nomes proprios (2-4 palavras capitalizadas consecutivas)
-    # Exemplo: "Antonio Costa", "Maria da Silva"
-    nome_pattern = r"\b([A-Z][a-záàâãéèêíïóôõöúçñ]+(?:\s+(?:da|de|do|dos|das|e)?\s*[A-Z][a-záàâãéèêíïóôõöúçñ]+){1,3})\b"
-    matches = re.findall(nome_pattern, texto)
+    matches = NOME_PATTERN.findall(texto)
     for match in matches:
         # Filtrar se for localizacao conhecida
         if match.lower() not in PAISES_CONHECIDOS and match.lower() not in CIDADES_CONHECIDAS:
             persons.add(match)
 
     # Extrair organizacoes (palavras com sufixos conhecidos)
-    for sufixo in ORG_SUFIXOS:
-        org_pattern = rf"\b([A-Z][A-Za-záàâãéèêíïóôõöúçñ\s]+\s+{sufixo}\.?)\b"
-        matches = re.findall(org_pattern, texto, re.IGNORECASE)
-        orgs.update(matches)
-
-    # Extrair localizacoes conhecidas
-    for pais in PAISES_CONHECIDOS:
-        if pais in texto_lower:
-            # Encontrar versao capitalizada no texto original
-            pattern = rf"\b({re.escape(pais)})\b"
-            match = re.search(pattern, texto, re.IGNORECASE)
-            if match:
-                locations.add(match.group(1))
-
-    for cidade in CIDADES_CONHECIDAS:
-        if cidade in texto_lower:
-            pattern = rf"\b({re.escape(cidade)})\b"
-            match = re.search(pattern, texto, re.IGNORECASE)
-            if match:
-                locations.add(match.group(1))
+    # (casefold: o IGNORECASE do re tambem aceita, p.ex., "ſ" por "s")
+    sufixos_presentes = {m.group(1).casefold() for m in RE_SUFIXO_ORG.finditer(texto)}
+    for sufixo, org_pattern in ORG_PATTERNS.items():
+        if sufixo in sufixos_presentes:
+            orgs.update(org_pattern.findall(texto))
+
+    # Extrair localizacoes conhecidas (paises e cidades), guardando a
+    # versao capitalizada da primeira ocorrencia de cada uma
+    vistas = set()
+    for match in LOC_PATTERN.finditer(texto):
+        local = match.group(1)
+        if local.lower() not in vistas:
+            vistas.add(local.lower())
+            locations.add(local)
 
     # Limitar a 10 entidades de cada tipo
     persons = list(persons)[:10]
     orgs = list(orgs)[:10]
     locations = list(locations)[:10]
 
-    result["entities_persons"] = json.dumps(persons)
-    result["entities_orgs"] = json.dumps(orgs)
-    result["entities_locations"] = json.dumps(locations)
+    # orjson: serializacao em C, JSON compacto em UTF-8 (como na gold)
+    result["entities_persons"] = orjson.dumps(persons).decode()
+    result["entities_orgs"] = orjson.dumps(orgs).decode()
+    result["entities_locations"] = orjson.dumps(locations).decode()
     result["entity_count"] = len(persons) + len(orgs) + len(locations)
 
     return result
@@ -427,21 +603,12 @@ def detectar_lingua(texto: str | None, lingua_declarada: str | None) -> dict:
 
     try:
         from langdetect import detect
-        detected = detect(texto)
+        detected = detect(texto[:LIMITE_TEXTO_LINGUA])
         result["language_detected"] = detected
 
-        # Comparar com declarada
+        # Comparar com declarada (nomes mapeados para codigos)
         if lingua_declarada:
-            # Mapear nomes para codigos
-            lang_map = {
-                "portuguese": "pt",
-                "english": "en",
-                "spanish": "es",
-                "french": "fr",
-                "german": "de",
-                "italian": "it",
-            }
-            declarada_code = lang_map.get(lingua_declarada.lower(), lingua_declarada.lower()[:2])
+            declarada_code = CODIGOS_LINGUA.get(lingua_declarada.lower(), lingua_declarada.lower()[:2])
             if detected == declarada_code:
                 result["language_match"] = 1
 
@@ -471,14 +638,13 @@ def calcular_metricas_texto(titulo: str | None, descricao: str | None, conteudo:
     descricao = descricao or ""
     conteudo = conteudo or ""
 
-    # Texto completo para contagem de palavras
-    texto_completo = f"{titulo} {descricao} {conteudo}"
-
+    # Palavras contadas por campo (separados por espaco, a soma e a mesma
+    # que no texto completo) sem construir a copia concatenada
     return {
         "title_length": len(titulo),
         "description_length": len(descricao),
         "content_length": len(conteudo),
-        "word_count": contar_palavras(texto_completo),
+        "word_count": contar_palavras(titulo) + contar_palavras(descricao) + contar_palavras(conteudo),
     }
 
 
@@ -486,12 +652,45 @@ def calcular_metricas_texto(titulo: str | None, descricao: str | None, conteudo:
 # FUNCAO PRINCIPAL DE TRANSFORMACAO
 # ============================================================================
 
-def transformar_artigo(row: dict) -> dict:
+def calcular_colunas_lote(artigos: list[dict]) -> list[dict]:
+    """
+    Calcula por coluna, para um lote inteiro, as transformacoes que nao
+    dependem do texto (datas, categorias e URLs).
+
+    As datas sao convertidas com pandas (parse_pub_dates); categorias e
+    links repetem-se muito entre artigos, por isso cada valor distinto e
+    normalizado/validado uma so vez.
+
+    Args:
+        artigos: Lista de dicts com dados dos artigos bronze
+
+    Returns:
+        Lista de dicts (um por artigo, pela mesma ordem) para transformar_artigo
+    """
+    datas = parse_pub_dates([a.get("pubDate") for a in artigos])
+
+    categorias = [a.get("category") for a in artigos]
+    categorias_info = {c: normalizar_categoria(c) for c in dict.fromkeys(categorias)}
+
+    links = [a.get("link") for a in artigos]
+    links_info = {u: validar_url(u) for u in dict.fromkeys(links)}
+
+    return [
+        {**date_info, **categorias_info[categoria], **links_info[link]}
+        for date_info, categoria, link in zip(datas, categorias, links)
+    ]
+
+
+def transformar_artigo(row: dict, colunas: dict | None = None,
+                       processed_at: str | None = None) -> dict:
     """
     Aplica todas as transformacoes a um artigo.
 
     Args:
         row: Dict com dados do artigo bronze
+        colunas: Datas/categorias/URL ja calculadas em lote
+            (calcular_colunas_lote); se None, sao calculadas aqui
+        processed_at: Timestamp UTC do lote; se None, usa o momento actual
 
     Returns:
         Dict com dados transformados para silver
@@ -501,13 +700,18 @@ def transformar_artigo(row: dict) -> dict:
     description_clean = limpar_texto_completo(row.get("description"))
     content_clean = limpar_texto_completo(row.get("content"))
 
-    # Texto combinado para NLP
-    texto_nlp = " ".join(filter(None, [title_clean, description_clean, content_clean]))
+    # Texto combinado para NLP, limitado aos primeiros LIMITE_TEXTO_NLP
+    # caracteres (titulo e lead vem primeiro)
+    texto_nlp = " ".join(filter(None, (title_clean, description_clean, content_clean)))
+    texto_nlp = texto_nlp[:LIMITE_TEXTO_NLP]
 
     # Aplicar transformacoes
-    date_info = parse_pub_date(row.get("pubDate"))
-    category_info = normalizar_categoria(row.get("category"))
-    url_info = validar_url(row.get("link"))
+    if colunas is None:
+        colunas = {
+            **parse_pub_date(row.get("pubDate")),
+            **normalizar_categoria(row.get("category")),
+            **validar_url(row.get("link")),
+        }
     sentiment_info = analisar_sentimento(texto_nlp)
     entities_info = extrair_entidades(texto_nlp)
     language_info = detectar_lingua(texto_nlp, row.get("language"))
@@ -519,12 +723,10 @@ def transformar_artigo(row: dict) -> dict:
         "title_clean": title_clean,
         "description_clean": description_clean,
         "content_clean": content_clean,
-        **date_info,
+        **colunas,
         "source_id": row.get("source_id"),
         "source_name": row.get("source_name"),
-        **category_info,
         "link": row.get("link"),
-        **url_info,
         "language": row.get("language"),
         **language_info,
         **sentiment_info,
@@ -532,10 +734,30 @@ def transformar_artigo(row: dict) -> dict:
         **metrics_info,
         "country": row.get("country"),
         "endpoint": row.get("endpoint"),
-        "processed_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+        "processed_at": processed_at or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
     }
 
 
+def transformar_artigo_protegido(item: tuple[dict, dict, str]) -> tuple[dict | None, str | None]:
+    """
+    transformar_artigo para uso com map/ProcessPoolExecutor.map.
+
+    Devolve o erro em vez de o lancar, para um artigo com erro nao
+    interromper o lote (nem o pool de processos).
+
+    Args:
+        item: Tuplo (artigo bronze, colunas de calcular_colunas_lote, processed_at)
+
+    Returns:
+        Tuplo (artigo silver ou None, mensagem de erro ou None)
+    """
+    artigo, colunas, processed_at = item
+    try:
+        return transformar_artigo(artigo, colunas, processed_at), None
+    except Exception as e:
+        return None, str(e)
+
+
 # ============================================================================
 # FUNCOES DE BASE DE DADOS
 # ============================================================================
@@ -546,6 +768,27 @@ def criar_tabela_silver(conn: sqlite3.Connection) -> None:
     conn.commit()
 
 
+def remover_indices_silver(conn: sqlite3.Connection) -> None:
+    """
+    Remove os indices secundarios de artigos_silver (criar_tabela_silver
+    volta a cria-los).
+
+    Numa carga inicial e mais barato criar cada indice uma vez no fim,
+    a partir dos dados ja gravados, do que mante-los linha a linha durante
+    os INSERT.
+
+    Args:
+        conn: Conexao SQLite
+    """
+    cursor = conn.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type = 'index' AND tbl_name = 'artigos_silver' AND name LIKE 'idx_silver_%'
+    """)
+    for (nome,) in cursor.fetchall():
+        conn.execute(f"DROP INDEX {nome}")
+    conn.commit()
+
+
 def obter_artigos_pendentes(conn: sqlite3.Connection) -> list[dict]:
     """
     Obtem artigos bronze que ainda nao foram processados para silver.
@@ -554,39 +797,75 @@ def obter_artigos_pendentes(conn: sqlite3.Connection) -> list[dict]:
         conn: Conexao SQLite
 
     Returns:
-        Lista de dicts com artigos pendentes
+        Lista de dicts com artigos pendentes (so as COLUNAS_BRONZE_SILVER)
     """
-    sql = """
-    SELECT a.*
-    FROM artigos a
-    LEFT JOIN artigos_silver s ON a.article_id = s.article_id
-    WHERE s.article_id IS NULL
+    # Dicts (e nao sqlite3.Row) porque os artigos vao por pickle para os
+    # processos do pool; construidos a partir do cursor, sem a lista
+    # intermedia de tuplos
+    cursor = conn.execute(SQL_ARTIGOS_PENDENTES)
+    return [dict(zip(COLUNAS_BRONZE_SILVER, row)) for row in cursor]
+
+
+def inserir_artigos_silver(conn: sqlite3.Connection, artigos: Iterable[dict]) -> int:
     """
-    cursor = conn.execute(sql)
-    columns = [desc[0] for desc in cursor.description]
-    rows = cursor.fetchall()
-    return [dict(zip(columns, row)) for row in rows]
+    Insere artigos transformados na tabela silver.
 
+    Um so statement preparado (SQL_INSERIR_SILVER) para o lote inteiro, via
+    executemany; o commit fica para quem chama.
+
+    Args:
+        conn: Conexao SQLite
+        artigos: Dicts devolvidos por transformar_artigo (lista ou iterador)
 
-def inserir_artigo_silver(conn: sqlite3.Connection, artigo: dict) -> None:
-    """Insere artigo transformado na tabela silver."""
-    colunas = list(artigo.keys())
-    placeholders = ", ".join(["?"] * len(colunas))
-    sql = f"INSERT OR REPLACE INTO artigos_silver ({', '.join(colunas)}) VALUES ({placeholders})"
-    conn.execute(sql, list(artigo.values()))
+    Returns:
+        Numero de artigos inseridos
+    """
+    linhas = map(LINHA_SILVER, artigos)
+    return conn.executemany(SQL_INSERIR_SILVER, linhas).rowcount
 
 
 # ============================================================================
 # FUNCAO PRINCIPAL
 # ============================================================================
 
-def processar_silver(conn: sqlite3.Connection, verbose: bool = True) -> int:
+def artigos_transformados(artigos: list[dict],
+                          resultados: Iterable[tuple[dict | None, str | None]],
+                          verbose: bool = True) -> Iterator[dict]:
+    """
+    Percorre os resultados de transformar_artigo_protegido, devolvendo os
+    artigos silver e registando os erros.
+
+    Args:
+        artigos: Artigos bronze, pela ordem dos resultados
+        resultados: Tuplos (artigo silver ou None, erro ou None)
+        verbose: Se True, imprime erros e progresso
+
+    Yields:
+        Artigos silver transformados sem erro
+    """
+    for i, (artigo, (artigo_silver, erro)) in enumerate(zip(artigos, resultados), 1):
+        if erro is None:
+            yield artigo_silver
+        elif verbose:
+            print(f"   [ERRO] Artigo {artigo.get('article_id')}: {erro}")
+
+        if verbose and i % 10 == 0:
+            print(f"   Processados {i}/{len(artigos)}...")
+
+
+def processar_silver(conn: sqlite3.Connection, verbose: bool = True,
+                     workers: int | None = None) -> int:
     """
     Processa todos os artigos bronze -> silver.
 
+    Lotes grandes (>= LIMIAR_PARALELO) sao transformados em paralelo num
+    ProcessPoolExecutor: o NLP e CPU puro e o GIL impede ganhos com threads.
+    A escrita fica no processo principal (a conexao SQLite nao se partilha).
+
     Args:
         conn: Conexao SQLite
         verbose: Se True, imprime progresso
+        workers: Numero de processos (default: os.cpu_count(); 1 = sequencial)
 
     Returns:
         Numero de artigos processados
@@ -605,22 +884,42 @@ def processar_silver(conn: sqlite3.Connection, verbose: bool = True) -> int:
     if verbose:
         print(f"   {len(artigos)} artigos pendentes")
 
-    # Processar cada artigo
-    processados = 0
-    for i, artigo in enumerate(artigos, 1):
-        try:
-            artigo_silver = transformar_artigo(artigo)
-            inserir_artigo_silver(conn, artigo_silver)
-            processados += 1
-
-            if verbose and i % 10 == 0:
-                print(f"   Processados {i}/{len(artigos)}...")
-
-        except Exception as e:
-            if verbose:
-                print(f"   [ERRO] Artigo {artigo.get('article_id')}: {e}")
-
-    conn.commit()
+    # Colunas sem NLP calculadas de uma vez para o lote, e um so
+    # processed_at para todos os artigos do lote
+    colunas_lote = calcular_colunas_lote(artigos)
+    processed_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+    # Carga inicial (silver vazia): gravar sem indices secundarios e cria-los
+    # no fim, de uma vez (se algo falhar, a proxima execucao recria-os)
+    carga_inicial = not conn.execute("SELECT 1 FROM artigos_silver LIMIT 1").fetchone()
+    if carga_inicial:
+        remover_indices_silver(conn)
+
+    # Transformar cada artigo (um artigo com erro nao trava o lote);
+    # map mantem a ordem dos artigos
+    workers = workers or os.cpu_count() or 1
+    itens = zip(artigos, colunas_lote, repeat(processed_at))
+    with ExitStack() as stack:
+        mapear = map
+        if workers > 1 and len(artigos) >= LIMIAR_PARALELO:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            mapear = partial(executor.map, chunksize=64)
+        resultados = mapear(transformar_artigo_protegido, itens)
+
+        # Gravar em blocos de TAMANHO_LOTE_COMMIT (um executemany e um
+        # commit por bloco), consumindo os resultados a medida que chegam
+        transformados = artigos_transformados(artigos, resultados, verbose)
+        processados = 0
+        while bloco := list(islice(transformados, TAMANHO_LOTE_COMMIT)):
+            with conn:
+                processados += inserir_artigos_silver(conn, bloco)
+
+    if carga_inicial:
+        criar_tabela_silver(conn)
+
+    # Carga em massa muda a distribuicao dos dados: refrescar estatisticas
+    if processados:
+        atualizar_estatisticas(conn)
 
     if verbose:
         print(f"   [OK] {processados} artigos processados para Silver")
@@ -647,6 +946,8 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> int:
     """Processa Silver Layer standalone."""
+    ensure_utf8()
+
     print("\n" + "=" * 60)
     print("    NEWSDATA.IO - SILVER LAYER")
     print("=" * 60 + "\n")
@@ -661,7 +962,7 @@ def main() -> int:
         return 1
 
     try:
-        conn = sqlite3.connect(db_path)
+        conn = abrir_conexao(db_path)
         print(f"[DB] Conectado a {db_path}\n")
 
         print("[SILVER] A processar artigos...")
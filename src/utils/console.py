@@ -0,0 +1,19 @@
+"""
+NewsData.io - Consola
+
+Configuracao do stdout/stderr para os scripts de linha de comandos.
+"""
+
+import sys
+
+
+def ensure_utf8() -> None:
+    """
+    Garante stdout/stderr em UTF-8 (Windows cp1252 nao suporta emojis).
+
+    Usa reconfigure() sobre os streams existentes em vez de os substituir
+    por um novo TextIOWrapper: mantem o line buffering e o redireccionamento.
+    """
+    for stream in (sys.stdout, sys.stderr):
+        if stream.encoding.lower() != "utf-8" and hasattr(stream, "reconfigure"):
+            stream.reconfigure(encoding="utf-8", errors="replace")
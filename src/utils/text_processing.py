@@ -9,6 +9,34 @@ import re
 import unicodedata
 
 
+# Padroes compilados uma vez, no import (sem lookup na cache do re por chamada)
+RE_TAG_HTML = re.compile(r"<[^>]+>")
+RE_ESPACOS = re.compile(r"[ \t]+")
+RE_NEWLINES = re.compile(r"\n{3,}")
+RE_DOMINIO = re.compile(r"https?://(?:www\.)?([^/]+)")
+
+# Caracteres especiais: aspas tipograficas -> aspas normais, travessoes ->
+# hifen, reticencias -> tres pontos; os de controlo (exceto \t, \n, \r)
+# nao estao no dict e sao removidos. Um so regex percorre o texto uma vez
+SUBSTITUICOES_CARACTERES = {
+    "\u201c": '"', "\u201d": '"', "\u201e": '"',
+    "\u2018": "'", "\u2019": "'", "\u201a": "'",
+    "\u2013": "-", "\u2014": "-",
+    "\u2026": "...",
+}
+RE_CARACTERES_ESPECIAIS = re.compile(
+    "[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f" + "".join(SUBSTITUICOES_CARACTERES) + "]"
+)
+
+# Tudo o que faz limpar_texto_completo mudar um texto ja em NFC, alem do
+# strip: entidades (&), tags (<), caracteres especiais, tabs, espacos
+# repetidos e 3+ newlines. Sem nenhum, o texto ja esta limpo
+RE_PRECISA_LIMPEZA = re.compile(
+    "[&<\t\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f" + "".join(SUBSTITUICOES_CARACTERES) + "]"
+    "|  |\n\n\n"
+)
+
+
 def limpar_html(texto: str | None) -> str | None:
     """
     Remove tags HTML e decodifica entidades HTML.
@@ -22,11 +50,14 @@ def limpar_html(texto: str | None) -> str | None:
     if not texto:
         return texto
 
-    # Decodificar entidades HTML (&amp; -> &, &lt; -> <, etc.)
+    # Decodificar entidades HTML (&amp; -> &, &lt; -> <, etc.); o proprio
+    # html.unescape devolve o texto logo se nao houver "&"
     texto = html.unescape(texto)
 
-    # Remover tags HTML
-    texto = re.sub(r"<[^>]+>", " ", texto)
+    # Remover tags HTML (o "in" e uma procura em C, bem mais barata que
+    # correr o regex sobre um texto sem tags)
+    if "<" in texto:
+        texto = RE_TAG_HTML.sub(" ", texto)
 
     return texto
 
@@ -47,20 +78,14 @@ def limpar_caracteres_especiais(texto: str | None) -> str | None:
     # Normalizar unicode (NFD -> NFC)
     texto = unicodedata.normalize("NFC", texto)
 
-    # Remover caracteres de controlo (exceto newlines e tabs)
-    texto = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]", "", texto)
-
-    # Substituir varios tipos de aspas por aspas normais
-    texto = re.sub(r"[""„]", '"', texto)
-    texto = re.sub(r"[''‚]", "'", texto)
-
-    # Substituir travessoes por hifens
-    texto = re.sub(r"[–—]", "-", texto)
+    # Remover caracteres de controlo e normalizar aspas, travessoes e
+    # reticencias, numa so passagem
+    return substituir_caracteres_especiais(texto)
 
-    # Substituir reticencias unicode por tres pontos
-    texto = texto.replace("…", "...")
 
-    return texto
+def substituir_caracteres_especiais(texto: str) -> str:
+    """Aplica SUBSTITUICOES_CARACTERES (e remove os de controlo) numa passagem."""
+    return RE_CARACTERES_ESPECIAIS.sub(lambda m: SUBSTITUICOES_CARACTERES.get(m[0], ""), texto)
 
 
 def normalizar_espacos(texto: str | None) -> str | None:
@@ -77,10 +102,10 @@ def normalizar_espacos(texto: str | None) -> str | None:
         return texto
 
     # Substituir multiplos espacos/tabs por espaco unico
-    texto = re.sub(r"[ \t]+", " ", texto)
+    texto = RE_ESPACOS.sub(" ", texto)
 
     # Substituir multiplas newlines por uma
-    texto = re.sub(r"\n{3,}", "\n\n", texto)
+    texto = RE_NEWLINES.sub("\n\n", texto)
 
     # Trim
     texto = texto.strip()
@@ -92,10 +117,10 @@ def limpar_texto_completo(texto: str | None) -> str | None:
     """
     Pipeline completo de limpeza de texto.
 
-    Aplica todas as funcoes de limpeza em sequencia:
-    1. Remove HTML
-    2. Normaliza caracteres especiais
-    3. Normaliza espacos
+    Mesmo resultado que aplicar em sequencia limpar_html,
+    limpar_caracteres_especiais e normalizar_espacos, mas com as passagens
+    fundidas: os caracteres especiais saem num so regex (em vez de quatro
+    re.sub e um replace) e sem as verificacoes/chamadas intermedias.
 
     Args:
         texto: Texto original
@@ -106,11 +131,20 @@ def limpar_texto_completo(texto: str | None) -> str | None:
     if not texto:
         return texto
 
-    texto = limpar_html(texto)
-    texto = limpar_caracteres_especiais(texto)
-    texto = normalizar_espacos(texto)
+    # Atalho para o caso comum (sobretudo titulos): texto ja limpo e em NFC
+    # custa uma so passagem do regex
+    if not RE_PRECISA_LIMPEZA.search(texto) and (
+        texto.isascii() or unicodedata.is_normalized("NFC", texto)
+    ):
+        return texto.strip()
 
-    return texto
+    texto = html.unescape(texto)
+    if "<" in texto:
+        texto = RE_TAG_HTML.sub(" ", texto)
+    texto = substituir_caracteres_especiais(unicodedata.normalize("NFC", texto))
+    texto = RE_NEWLINES.sub("\n\n", RE_ESPACOS.sub(" ", texto))
+
+    return texto.strip()
 
 
 def extrair_dominio(url: str | None) -> str | None:
@@ -127,7 +161,7 @@ def extrair_dominio(url: str | None) -> str | None:
         return None
 
     # Regex para extrair dominio
-    match = re.search(r"https?://(?:www\.)?([^/]+)", url)
+    match = RE_DOMINIO.search(url)
     if match:
         return match.group(1)
 
@@ -147,6 +181,5 @@ def contar_palavras(texto: str | None) -> int:
     if not texto:
         return 0
 
-    # Dividir por espacos e filtrar vazios
-    palavras = [p for p in texto.split() if p]
-    return len(palavras)
+    # split() sem argumentos ja descarta vazios (sem lista filtrada extra)
+    return len(texto.split())
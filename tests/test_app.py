@@ -0,0 +1,60 @@
+"""
+Testes unitários para as queries do dashboard (app.py).
+
+Corre as queries sobre uma base de dados em memória com tabelas gold.
+"""
+
+import sqlite3
+import pytest
+
+from app import SQL_TRENDING_TOPICS
+from src.gold.aggregate import criar_tabelas_gold
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def conn():
+    """Conexão SQLite em memória com as tabelas gold."""
+    connection = sqlite3.connect(":memory:")
+    criar_tabelas_gold(connection)
+    yield connection
+    connection.close()
+
+
+# ============================================================================
+# TESTES DE TRENDING TOPICS
+# ============================================================================
+
+class TestTrendingTopics:
+    """Testes para a query do gráfico de trending topics."""
+
+    def test_so_o_dia_mais_recente(self, conn):
+        """Testa que cada termo aparece uma vez, com a frequência do último dia."""
+        conn.executemany("""
+            INSERT INTO gold_trending_topics (topic_date, term, term_type, frequency)
+            VALUES (?, ?, 'word', ?)
+        """, [
+            ("2026-02-08", "economia", 5),
+            ("2026-02-08", "forte", 4),
+            ("2026-02-09", "economia", 2),
+            ("2026-02-09", "forte", 3),
+            ("2026-02-09", "cresce", 3),
+        ])
+
+        rows = conn.execute(SQL_TRENDING_TOPICS, (15,)).fetchall()
+
+        assert rows == [("cresce", 3), ("forte", 3), ("economia", 2)]
+
+    def test_respeita_limite(self, conn):
+        """Testa o LIMIT."""
+        conn.executemany("""
+            INSERT INTO gold_trending_topics (topic_date, term, term_type, frequency)
+            VALUES ('2026-02-09', ?, 'word', ?)
+        """, [("economia", 2), ("forte", 3), ("cresce", 1)])
+
+        rows = conn.execute(SQL_TRENDING_TOPICS, (2,)).fetchall()
+
+        assert rows == [("forte", 3), ("economia", 2)]
@@ -16,6 +16,7 @@ from src.bronze.ingest import (
     salvar_json_raw,
     salvar_csv,
     salvar_parquet,
+    COLUNAS_BRONZE,
 )
 
 
@@ -110,6 +111,19 @@ class TestJsonToDataframe:
         # Creator pode ser None/NaN
         assert df.iloc[0]["creator"] == "João Silva"
         assert pd.isna(df.iloc[1]["creator"])
+
+    def test_listas_vazias_como_none(self):
+        """Testa que listas vazias ou em falta ficam None"""
+        data = {"results": [
+            {"article_id": "a1", "category": [], "country": ["portugal", "brazil"]},
+            {"article_id": "a2"},
+        ]}
+        df = json_to_dataframe(data)
+
+        assert pd.isna(df.iloc[0]["category"])
+        assert pd.isna(df.iloc[1]["category"])
+        assert df.iloc[0]["country"] == "portugal, brazil"
+        assert list(df.columns) == COLUNAS_BRONZE
     
     def test_resultados_vazios(self):
         """Testa resposta sem resultados"""
@@ -179,7 +193,7 @@ class TestSalvarFicheiros:
 class TestFetchNews:
     """Testes para fetch_news com mock"""
 
-    @patch("src.bronze.ingest.requests.get")
+    @patch("src.bronze.ingest.SESSION.get")
     def test_fetch_sucesso(self, mock_get, mock_api_response):
         """Testa request bem-sucedido"""
         mock_response = Mock()
@@ -196,7 +210,7 @@ class TestFetchNews:
         assert result["status"] == "success"
         assert len(result["results"]) == 2
 
-    @patch("src.bronze.ingest.requests.get")
+    @patch("src.bronze.ingest.SESSION.get")
     def test_fetch_erro(self, mock_get):
         """Testa tratamento de erro da API"""
         mock_response = Mock()
@@ -210,7 +224,7 @@ class TestFetchNews:
                 endpoint="latestPT"
             )
 
-    @patch("src.bronze.ingest.requests.get")
+    @patch("src.bronze.ingest.SESSION.get")
     def test_fetch_diferentes_endpoints(self, mock_get, mock_api_response):
         """Testa diferentes endpoints"""
         mock_response = Mock()
@@ -230,7 +244,7 @@ class TestFetchNews:
 class TestIntegracao:
     """Testes de integracao do pipeline completo"""
 
-    @patch("src.bronze.ingest.requests.get")
+    @patch("src.bronze.ingest.SESSION.get")
     def test_pipeline_completo(self, mock_get, mock_api_response, temp_output):
         """Testa pipeline: API -> JSON -> DataFrame -> CSV + Parquet"""
         # Setup mock
@@ -271,7 +285,7 @@ class TestIntegracao:
         parquet_loaded = pd.read_parquet(parquet_path)
         assert len(csv_loaded) == len(parquet_loaded) == 2
 
-    @patch("src.bronze.ingest.requests.get")
+    @patch("src.bronze.ingest.SESSION.get")
     def test_pipeline_sem_resultados(self, mock_get, temp_output):
         """Testa pipeline com resposta vazia da API"""
         mock_response = Mock()
@@ -10,8 +10,12 @@ import pandas as pd
 from pathlib import Path
 
 from src.db.loader import (
+    abrir_conexao,
     criar_tabela,
     carregar_csv,
+    carregar_dataframe,
+    carregar_parquet,
+    filtrar_existentes,
     extrair_endpoint,
 )
 
@@ -105,6 +109,26 @@ class TestCriarTabela:
         assert cursor.fetchone()[0] == 0
 
 
+class TestAbrirConexao:
+    """Testes para a configuração da conexão de escrita."""
+
+    def test_wal_e_synchronous(self, tmp_path):
+        conn = abrir_conexao(tmp_path / "teste.db")
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        finally:
+            conn.close()
+
+    def test_pragmas_de_carga(self, tmp_path):
+        conn = abrir_conexao(tmp_path / "teste.db")
+        try:
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+        finally:
+            conn.close()
+
+
 # ============================================================================
 # TESTES DE CARREGAMENTO
 # ============================================================================
@@ -145,6 +169,21 @@ class TestCarregarCsv:
         cursor = conn.execute("SELECT COUNT(*) FROM artigos")
         assert cursor.fetchone()[0] == 2  # Não duplicou
 
+    def test_campos_vazios_como_null(self, conn, csv_file):
+        """Testa que campos vazios no CSV ficam NULL."""
+        carregar_csv(conn, csv_file, "latestPT")
+
+        cursor = conn.execute("SELECT creator, image_url FROM artigos WHERE article_id = 'def456'")
+        assert cursor.fetchone() == (None, None)
+
+    def test_sem_commit_fica_na_transaccao(self, conn, csv_file):
+        """Testa que commit=False deixa a transacção aberta para quem chama."""
+        carregar_csv(conn, csv_file, "latestPT", commit=False)
+        assert conn.in_transaction
+
+        conn.rollback()
+        assert conn.execute("SELECT COUNT(*) FROM artigos").fetchone()[0] == 0
+
     def test_csv_vazio(self, conn, tmp_path):
         """Testa carregamento de CSV vazio."""
         path = tmp_path / "vazio.csv"
@@ -154,6 +193,63 @@ class TestCarregarCsv:
         assert inseridos == 0
 
 
+class TestCarregarDataframe:
+    """Testes para carregamento directo de DataFrame e Parquet."""
+
+    def test_carrega_dataframe(self, conn, csv_file):
+        df = pd.read_csv(csv_file)
+        inseridos = carregar_dataframe(conn, df, "latestPT")
+        assert inseridos == 2
+
+        cursor = conn.execute("SELECT endpoint, creator FROM artigos WHERE article_id = 'def456'")
+        endpoint, creator = cursor.fetchone()
+        assert endpoint == "latestPT"
+        assert creator is None  # NaN -> NULL
+
+    def test_colunas_em_falta_como_null(self, conn):
+        df = pd.DataFrame([{"article_id": "x1", "title": "Só título"}])
+        carregar_dataframe(conn, df, "tech")
+
+        cursor = conn.execute("SELECT title, source_id, endpoint FROM artigos WHERE article_id = 'x1'")
+        assert cursor.fetchone() == ("Só título", None, "tech")
+
+    def test_nao_altera_dataframe_original(self, conn, csv_file):
+        df = pd.read_csv(csv_file)
+        colunas = list(df.columns)
+        carregar_dataframe(conn, df, "latestPT")
+        assert list(df.columns) == colunas
+
+    def test_dataframe_vazio(self, conn):
+        assert carregar_dataframe(conn, pd.DataFrame(), "test") == 0
+
+    def test_carrega_parquet(self, conn, csv_file, tmp_path):
+        path = tmp_path / "newsdata_latestPT_tabular_20240115T103000Z.parquet"
+        pd.read_csv(csv_file).to_parquet(path, index=False)
+
+        inseridos = carregar_parquet(conn, path, "latestPT")
+        assert inseridos == 2
+
+
+class TestFiltrarExistentes:
+    """Testes para deduplicação contra a tabela artigos."""
+
+    def test_db_vazia_mantem_todos(self, conn, csv_file):
+        df = pd.read_csv(csv_file)
+        assert len(filtrar_existentes(conn, df)) == 2
+
+    def test_remove_existentes(self, conn, csv_file):
+        carregar_csv(conn, csv_file, "latestPT")
+        df = pd.read_csv(csv_file)
+        novo = df.iloc[[0]].assign(article_id="novo999")
+        df = pd.concat([df, novo], ignore_index=True)
+
+        df_novos = filtrar_existentes(conn, df)
+        assert df_novos["article_id"].tolist() == ["novo999"]
+
+    def test_dataframe_vazio(self, conn):
+        assert filtrar_existentes(conn, pd.DataFrame()).empty
+
+
 # ============================================================================
 # TESTES DE UTILIDADES
 # ============================================================================
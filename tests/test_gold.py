@@ -12,14 +12,20 @@ from src.silver.transform import criar_tabela_silver
 from src.db.loader import criar_tabela
 
 from src.gold.aggregate import (
+    abrir_conexao_gold,
     criar_tabelas_gold,
     calcular_daily_summary,
     calcular_source_stats,
     calcular_trending_topics,
+    atualizar_trending_topics,
+    atualizar_silver_daily_counts,
     calcular_sentiment_timeline,
     calcular_category_matrix,
     processar_gold,
+    mostrar_planos,
     extrair_palavras_significativas,
+    contar_palavras,
+    contar_palavras_fts,
     STOPWORDS,
 )
 
@@ -96,11 +102,80 @@ class TestExtrairPalavrasSignificativas:
         palavras = extrair_palavras_significativas("a to be or not to be")
         assert all(len(p) > 2 for p in palavras)
 
+    def test_pontuacao_separa_palavras(self):
+        palavras = extrair_palavras_significativas("Benfica-Porto: golo às 90'! Acção, ok.")
+        assert palavras == ("benfica", "porto", "golo", "acção")
+
     def test_texto_none(self):
-        assert extrair_palavras_significativas(None) == []
+        assert extrair_palavras_significativas(None) == ()
 
     def test_texto_vazio(self):
-        assert extrair_palavras_significativas("") == []
+        assert extrair_palavras_significativas("") == ()
+
+    def test_resultado_em_cache(self):
+        extrair_palavras_significativas.cache_clear()
+        primeiro = extrair_palavras_significativas("Portugal vence jogo importante")
+        segundo = extrair_palavras_significativas("Portugal vence jogo importante")
+        assert primeiro is segundo
+        assert extrair_palavras_significativas.cache_info().hits == 1
+
+
+class TestContarPalavras:
+    """Testes para a contagem de palavras (ciclo Python e FTS5)."""
+
+    ROWS = [
+        ("Portugal vence jogo importante", "fonte_a", "sports", 0.5),
+        ("Portugal perde, jogo decisivo!", "fonte_b", "sports", None),
+        ("A república e a economia", "fonte_a", "politics", -0.2),
+        (None, "fonte_c", None, 0.1),
+        ("Economia: Portugal cresce", None, "business", 0.3),
+    ]
+
+    @pytest.fixture
+    def conn_dia(self, conn):
+        conn.executemany("""
+            INSERT INTO artigos_silver (
+                article_id, title_clean, source_id, category_primary, sentiment_polarity, pub_date
+            ) VALUES (?, ?, ?, ?, ?, '2026-02-10')
+        """, [(f"id{i}", *row) for i, row in enumerate(self.ROWS)])
+        return conn
+
+    def test_conta_uma_vez_por_artigo(self):
+        top, _ = contar_palavras([("jogo jogo jogo", "f", "c", 0.0)], 5)
+        assert top == [("jogo", 1)]
+
+    def test_fts_igual_ao_ciclo(self, conn_dia):
+        top_py, artigos_py = contar_palavras(self.ROWS, 20)
+        top_fts, artigos_fts = contar_palavras_fts(conn_dia, "2026-02-10", 20)
+
+        assert top_fts == top_py
+        assert top_fts[:3] == [("portugal", 3), ("economia", 2), ("jogo", 2)]
+        assert "república" in dict(top_fts)
+        for palavra, _ in top_fts:
+            assert artigos_fts[palavra] == artigos_py[palavra]
+
+    def test_empate_no_corte_igual_nos_dois_caminhos(self, conn):
+        rows = [("Zebra casa", "f", "c", 0.0), ("Zebra amor", "f", "c", 0.0)]
+        conn.executemany("""
+            INSERT INTO artigos_silver (article_id, title_clean, source_id, category_primary,
+                                        sentiment_polarity, pub_date)
+            VALUES (?, ?, ?, ?, ?, '2026-02-10')
+        """, [(f"id{i}", *row) for i, row in enumerate(rows)])
+
+        top_py, _ = contar_palavras(rows, 2)
+        top_fts, _ = contar_palavras_fts(conn, "2026-02-10", 2)
+
+        assert top_py == top_fts == [("zebra", 2), ("amor", 1)]
+
+    def test_fts_respeita_top_n(self, conn_dia):
+        top, artigos = contar_palavras_fts(conn_dia, "2026-02-10", 2)
+        assert top == [("portugal", 3), ("economia", 2)]
+        assert set(artigos) == {"portugal", "economia"}
+
+    def test_fts_remove_tabelas_temporarias(self, conn_dia):
+        contar_palavras_fts(conn_dia, "2026-02-10", 5)
+        cursor = conn_dia.execute("SELECT COUNT(*) FROM sqlite_temp_master WHERE name LIKE 'trending_%'")
+        assert cursor.fetchone()[0] == 0
 
 
 class TestStopwords:
@@ -144,6 +219,20 @@ class TestCriarTabelasGold:
         # Não deve dar erro
 
 
+class TestAbrirConexaoGold:
+    """Testes para a configuracao da conexao das agregacoes."""
+
+    def test_pragmas_de_analise(self, tmp_path):
+        conn = abrir_conexao_gold(tmp_path / "teste.db")
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -131072
+            assert conn.execute("PRAGMA threads").fetchone()[0] == 4
+        finally:
+            conn.close()
+
+
 # ============================================================================
 # TESTES DE DAILY SUMMARY
 # ============================================================================
@@ -221,6 +310,15 @@ class TestCalcularSourceStats:
         row = cursor.fetchone()
         assert row[0] >= 2  # Pelo menos 2 categorias
 
+    def test_categoria_principal(self, conn_com_silver):
+        calcular_source_stats(conn_com_silver)
+
+        cursor = conn_com_silver.execute(
+            "SELECT source_id, primary_category FROM gold_source_stats ORDER BY source_id"
+        )
+        # fonte_a: 2 sports, 1 technology, 1 business; fonte_b: empate -> ordem alfabetica
+        assert cursor.fetchall() == [("fonte_a", "sports"), ("fonte_b", "business")]
+
     def test_calcula_sentimento(self, conn_com_silver):
         calcular_source_stats(conn_com_silver)
 
@@ -278,6 +376,106 @@ class TestCalcularTrendingTopics:
             titles = json.loads(row[0])
             assert isinstance(titles, list)
 
+    def test_caminho_fts(self, conn_com_silver, monkeypatch):
+        monkeypatch.setattr("src.gold.aggregate.LIMIAR_CONTAGEM_FTS", 0)
+        n = calcular_trending_topics(conn_com_silver, "2026-02-08")
+        assert n > 0
+
+        cursor = conn_com_silver.execute("""
+            SELECT frequency, sources FROM gold_trending_topics
+            WHERE topic_date = '2026-02-08' AND term = 'jogo'
+        """)
+        frequency, sources = cursor.fetchone()
+        assert frequency == 1
+        assert json.loads(sources) == ["fonte_a"]
+
+
+class TestAtualizarTrendingTopics:
+    """Testes para o calculo incremental de trending topics."""
+
+    def test_primeira_execucao_todas_datas(self, conn_com_silver):
+        atualizar_trending_topics(conn_com_silver)
+
+        cursor = conn_com_silver.execute(
+            "SELECT DISTINCT topic_date FROM gold_trending_topics ORDER BY topic_date"
+        )
+        assert [r[0] for r in cursor.fetchall()] == ["2026-02-08", "2026-02-09"]
+
+    def test_sem_novos_artigos_so_recalcula_a_fronteira(self, conn_com_silver):
+        conn_com_silver.execute("""
+            UPDATE artigos_silver SET processed_at = CASE pub_date
+                WHEN '2026-02-08' THEN '2026-02-09 10:00:00' ELSE '2026-02-09 12:00:00' END
+        """)
+        atualizar_trending_topics(conn_com_silver, calculated_at="primeira")
+        atualizar_trending_topics(conn_com_silver, calculated_at="segunda")
+
+        # So o dia com processed_at igual a marca de agua volta a ser calculado
+        cursor = conn_com_silver.execute(
+            "SELECT DISTINCT topic_date FROM gold_trending_topics WHERE calculated_at = 'segunda'"
+        )
+        assert [r[0] for r in cursor.fetchall()] == ["2026-02-09"]
+
+    def test_recalcula_so_datas_novas(self, conn_com_silver):
+        conn_com_silver.execute("UPDATE artigos_silver SET processed_at = '2026-02-09 12:00:00'")
+        atualizar_trending_topics(conn_com_silver)
+
+        conn_com_silver.execute("""
+            INSERT INTO artigos_silver (article_id, title_clean, pub_date, source_id, processed_at)
+            VALUES ('id007', 'Portugal vence outra vez', '2026-02-08', 'fonte_a', '2026-02-10 08:00:00')
+        """)
+        atualizar_trending_topics(conn_com_silver)
+
+        cursor = conn_com_silver.execute("""
+            SELECT frequency FROM gold_trending_topics
+            WHERE topic_date = '2026-02-08' AND term = 'portugal'
+        """)
+        assert cursor.fetchone()[0] == 2
+
+        cursor = conn_com_silver.execute(
+            "SELECT processed_at FROM gold_watermarks WHERE table_name = 'gold_trending_topics'"
+        )
+        assert cursor.fetchone()[0] == "2026-02-10 08:00:00"
+
+
+# ============================================================================
+# TESTES DE CONTAGENS DIARIAS
+# ============================================================================
+
+class TestAtualizarSilverDailyCounts:
+    """Testes para as contagens diarias materializadas."""
+
+    def test_agrupa_por_dia_fonte_categoria(self, conn_com_silver):
+        assert atualizar_silver_daily_counts(conn_com_silver) == 2
+
+        cursor = conn_com_silver.execute("""
+            SELECT article_count, positive_count, sum_word_count
+            FROM silver_daily_counts
+            WHERE pub_date = '2026-02-08' AND source_id = 'fonte_a' AND category_primary = 'sports'
+        """)
+        assert cursor.fetchone() == (2, 1, 180)
+
+    def test_so_recalcula_dias_novos(self, conn_com_silver):
+        conn_com_silver.execute("""
+            UPDATE artigos_silver SET processed_at = CASE pub_date
+                WHEN '2026-02-08' THEN '2026-02-09 10:00:00' ELSE '2026-02-09 12:00:00' END
+        """)
+        atualizar_silver_daily_counts(conn_com_silver)
+        # Sem artigos novos so o dia da fronteira (processed_at = marca) volta
+        assert atualizar_silver_daily_counts(conn_com_silver) == 1
+
+        conn_com_silver.execute("""
+            INSERT INTO artigos_silver (article_id, pub_date, source_id, category_primary, processed_at)
+            VALUES ('id007', '2026-02-08', 'fonte_a', 'sports', '2026-02-10 08:00:00')
+        """)
+        # O dia do artigo novo mais o da fronteira anterior
+        assert atualizar_silver_daily_counts(conn_com_silver) == 2
+
+        cursor = conn_com_silver.execute("""
+            SELECT article_count, polarity_count FROM silver_daily_counts
+            WHERE pub_date = '2026-02-08' AND source_id = 'fonte_a' AND category_primary = 'sports'
+        """)
+        assert cursor.fetchone() == (3, 2)  # polaridade NULL nao conta para a media
+
 
 # ============================================================================
 # TESTES DE SENTIMENT TIMELINE
@@ -322,6 +520,16 @@ class TestCalcularSentimentTimeline:
         row = cursor.fetchone()
         assert row[0] <= row[1]  # min <= max
 
+    def test_filtro_com_aspas(self, conn_com_silver):
+        """Os filtros sao parametros: aspas no valor nao partem o SQL."""
+        conn_com_silver.execute("UPDATE artigos_silver SET source_id = 'fonte_a''s' WHERE source_id = 'fonte_a'")
+
+        n = calcular_sentiment_timeline(conn_com_silver, "daily", source_id="fonte_a's")
+        assert n == 2
+
+        cursor = conn_com_silver.execute("SELECT DISTINCT source_id FROM gold_sentiment_timeline")
+        assert cursor.fetchall() == [("fonte_a's",)]
+
 
 # ============================================================================
 # TESTES DE CATEGORY MATRIX
@@ -364,6 +572,21 @@ class TestCalcularCategoryMatrix:
         """)
         assert cursor.fetchone()[0] == 3
 
+    def test_categoria_nula_conta_no_total_da_fonte(self, conn_com_silver):
+        conn_com_silver.execute("""
+            INSERT INTO artigos_silver (article_id, pub_date, source_id, source_name)
+            VALUES ('id007', '2026-02-09', 'fonte_b', 'Fonte B')
+        """)
+        calcular_category_matrix(conn_com_silver)
+
+        cursor = conn_com_silver.execute("""
+            SELECT category_primary, pct_of_source FROM gold_category_matrix
+            WHERE source_id = 'fonte_b' ORDER BY category_primary
+        """)
+        rows = cursor.fetchall()
+        assert [r[0] for r in rows] == ["business", "sports"]
+        assert rows[0][1] == pytest.approx(100 / 3)
+
 
 # ============================================================================
 # TESTES DE PROCESSAMENTO GOLD COMPLETO
@@ -392,11 +615,102 @@ class TestProcessarGold:
         results1 = processar_gold(conn_com_silver, verbose=False)
         results2 = processar_gold(conn_com_silver, verbose=False)
 
-        # Gold usa INSERT OR REPLACE, então não deve duplicar
+        # Gold usa UPSERT (ON CONFLICT DO UPDATE), então não deve duplicar
         cursor = conn_com_silver.execute("SELECT COUNT(*) FROM gold_daily_summary")
         count = cursor.fetchone()[0]
         assert count == results1["daily_summary"]
 
+    def test_artigos_com_o_processed_at_da_marca_nao_se_perdem(self, conn_com_silver):
+        # A silver grava uma execucao (um so processed_at) em varios commits:
+        # um processar_gold entre dois blocos ja deixou a marca nesse valor
+        conn_com_silver.execute("UPDATE artigos_silver SET processed_at = '2026-02-10 08:00:00'")
+        conn_com_silver.commit()
+        processar_gold(conn_com_silver, verbose=False)
+
+        conn_com_silver.execute("""
+            INSERT INTO artigos_silver (
+                article_id, title_clean, pub_date, source_id, source_name,
+                category_primary, sentiment_polarity, sentiment_label, processed_at
+            ) VALUES
+                ('id007', 'Governo aprova orçamento', '2026-02-09', 'fonte_a', 'Fonte A',
+                 'business', 0.1, 'neutral', '2026-02-10 08:00:00'),
+                ('id008', 'Chuva forte no norte', '2026-02-10', 'fonte_b', 'Fonte B',
+                 'sports', -0.1, 'neutral', '2026-02-10 08:00:00')
+        """)
+        conn_com_silver.commit()
+        processar_gold(conn_com_silver, verbose=False)
+
+        cursor = conn_com_silver.execute("SELECT SUM(article_count) FROM gold_daily_summary")
+        assert cursor.fetchone()[0] == 8
+        cursor = conn_com_silver.execute("""
+            SELECT SUM(total_articles) FROM gold_source_stats
+            WHERE id IN (SELECT MAX(id) FROM gold_source_stats GROUP BY source_id)
+        """)
+        assert cursor.fetchone()[0] == 8
+        cursor = conn_com_silver.execute(
+            "SELECT COUNT(*) FROM gold_trending_topics WHERE topic_date = '2026-02-10'"
+        )
+        assert cursor.fetchone()[0] > 0
+
+    def test_transaccao_unica(self, conn_com_silver, monkeypatch):
+        # Se a ultima agregacao falha, nenhuma das anteriores fica gravada
+        def falha(conn, **kwargs):
+            raise sqlite3.OperationalError("falha simulada")
+
+        monkeypatch.setattr("src.gold.aggregate.calcular_category_matrix", falha)
+        with pytest.raises(sqlite3.OperationalError):
+            processar_gold(conn_com_silver, verbose=False)
+
+        cursor = conn_com_silver.execute("SELECT COUNT(*) FROM gold_daily_summary")
+        assert cursor.fetchone()[0] == 0
+
+    def test_actualiza_contagens_diarias_uma_vez(self, conn_com_silver):
+        conn_com_silver.execute("UPDATE artigos_silver SET processed_at = '2026-02-10 08:00:00'")
+        conn_com_silver.commit()
+        processar_gold(conn_com_silver, verbose=False)
+
+        statements = []
+        conn_com_silver.set_trace_callback(statements.append)
+        processar_gold(conn_com_silver, verbose=False)
+        conn_com_silver.set_trace_callback(None)
+
+        assert sum("DELETE FROM silver_daily_counts" in s for s in statements) == 1
+
+    def test_mostrar_planos(self, conn_com_silver, capsys):
+        statements = []
+        conn_com_silver.set_trace_callback(statements.append)
+        processar_gold(conn_com_silver, verbose=False)
+        conn_com_silver.set_trace_callback(None)
+
+        mostrar_planos(conn_com_silver, statements)
+        saida = capsys.readouterr().out
+        assert "[PLAN] INSERT INTO gold_daily_summary" in saida
+        assert saida.count("[PLAN] SELECT title_clean") == 1  # um plano, varios dias
+
+    def test_mesmo_calculated_at_em_todas_as_tabelas(self, conn_com_silver):
+        processar_gold(conn_com_silver, verbose=False)
+
+        timestamps = set()
+        for tabela in ("gold_daily_summary", "gold_source_stats", "gold_trending_topics",
+                       "gold_sentiment_timeline", "gold_category_matrix"):
+            cursor = conn_com_silver.execute(f"SELECT DISTINCT calculated_at FROM {tabela}")
+            timestamps.update(row[0] for row in cursor.fetchall())
+        assert len(timestamps) == 1
+
+    def test_sem_commit_fica_na_transaccao(self, conn_com_silver):
+        calcular_daily_summary(conn_com_silver, commit=False)
+        assert conn_com_silver.in_transaction
+
+    def test_upsert_mantem_ids(self, conn_com_silver):
+        # ON CONFLICT DO UPDATE actualiza a linha existente (sem DELETE+INSERT)
+        processar_gold(conn_com_silver, verbose=False)
+        ids1 = conn_com_silver.execute("SELECT id FROM gold_category_matrix ORDER BY id").fetchall()
+
+        processar_gold(conn_com_silver, verbose=False)
+        ids2 = conn_com_silver.execute("SELECT id FROM gold_category_matrix ORDER BY id").fetchall()
+
+        assert ids1 == ids2
+
 
 # ============================================================================
 # TESTES DE EDGE CASES
@@ -11,6 +11,7 @@ import pandas as pd
 
 from src.silver.transform import (
     parse_pub_date,
+    parse_pub_dates,
     normalizar_categoria,
     validar_url,
     analisar_sentimento,
@@ -18,8 +19,10 @@ from src.silver.transform import (
     detectar_lingua,
     calcular_metricas_texto,
     transformar_artigo,
+    calcular_colunas_lote,
     criar_tabela_silver,
     processar_silver,
+    SQL_ARTIGOS_PENDENTES,
 )
 
 from src.utils.text_processing import (
@@ -31,7 +34,7 @@ from src.utils.text_processing import (
     contar_palavras,
 )
 
-from src.db.loader import criar_tabela, carregar_csv
+from src.db.loader import criar_tabela, carregar_dataframe
 
 
 # ============================================================================
@@ -49,7 +52,7 @@ def conn():
 
 
 @pytest.fixture
-def conn_com_dados(conn, tmp_path):
+def conn_com_dados(conn):
     """Conexão com dados de teste na tabela bronze."""
     df = pd.DataFrame([
         {
@@ -85,9 +88,7 @@ def conn_com_dados(conn, tmp_path):
             "image_url": None,
         },
     ])
-    path = tmp_path / "test_data.csv"
-    df.to_csv(path, index=False, encoding="utf-8")
-    carregar_csv(conn, path, "test")
+    carregar_dataframe(conn, df, "test")
     return conn
 
 
@@ -122,6 +123,10 @@ class TestLimparCaracteresEspeciais:
         result = limpar_caracteres_especiais('"teste"')
         assert '"' in result
 
+    def test_normaliza_aspas_tipograficas(self):
+        result = limpar_caracteres_especiais("\u201cOlá\u201d, \u2018disse\u2019\u2026")
+        assert result == '"Olá", \'disse\'...'
+
     def test_normaliza_travessoes(self):
         result = limpar_caracteres_especiais("a–b—c")
         assert result == "a-b-c"
@@ -152,6 +157,16 @@ class TestLimparTextoCompleto:
         assert "Texto & mais" in result
         assert result == result.strip()
 
+    def test_igual_as_funcoes_em_sequencia(self):
+        texto = "<p>O &amp; \u201cacordo\u201d \u2014 <b>x</b>\x01\t\t fim\u2026</p>\n\n\n\n"
+        esperado = normalizar_espacos(limpar_caracteres_especiais(limpar_html(texto)))
+        assert limpar_texto_completo(texto) == esperado == 'O & "acordo" - x fim...'
+
+    def test_atalho_texto_ja_limpo(self):
+        for texto in ["  Governo aprova or\u00e7amento  ", "Linha\n\nOutra", "Cafe\u0301 aberto", "A\u00a0B"]:
+            esperado = normalizar_espacos(limpar_caracteres_especiais(limpar_html(texto)))
+            assert limpar_texto_completo(texto) == esperado
+
     def test_texto_none(self):
         assert limpar_texto_completo(None) is None
 
@@ -214,6 +229,10 @@ class TestParsePubDate:
         result = parse_pub_date("invalido")
         assert result["pub_date"] is None
 
+    def test_vectorizada_igual_a_linha_a_linha(self):
+        datas = ["2026-02-09 14:30:00", None, "", "2026-02-09T14:30:00Z", "invalido", "2025-12-31 23:59:59"]
+        assert parse_pub_dates(datas) == [parse_pub_date(d) for d in datas]
+
 
 # ============================================================================
 # TESTES DE NORMALIZAÇÃO
@@ -236,6 +255,11 @@ class TestNormalizarCategoria:
         result = normalizar_categoria("tech")
         assert result["category_primary"] == "technology"
 
+    def test_sinonimos_sem_repetidas(self):
+        result = normalizar_categoria("Tech, science, , top, technology")
+        assert json.loads(result["category_list"]) == ["technology", "general"]
+        assert result["category_count"] == 2
+
     def test_categoria_none(self):
         result = normalizar_categoria(None)
         assert result["category_primary"] == "general"
@@ -301,6 +325,20 @@ class TestExtrairEntidades:
         locations = json.loads(result["entities_locations"])
         assert len(locations) > 0
 
+    def test_locais_numa_passagem(self):
+        result = extrair_entidades("De Nova York a LISBOA: voos para Lisboa e Rio de Janeiro. Portugália não conta.")
+        locations = json.loads(result["entities_locations"])
+        assert sorted(locations) == ["LISBOA", "Nova York", "Rio de Janeiro"]
+
+    def test_extrai_organizacoes(self):
+        result = extrair_entidades("Galp Energia SA assina acordo.")
+        orgs = json.loads(result["entities_orgs"])
+        assert orgs == ["Galp Energia SA"]
+
+    def test_sem_sufixo_sem_organizacoes(self):
+        result = extrair_entidades("A casa de Lisboa vendeu sapatos a Maria Silva.")
+        assert json.loads(result["entities_orgs"]) == []
+
     def test_extrai_nomes(self):
         result = extrair_entidades("António Costa reuniu com Maria Silva.")
         persons = json.loads(result["entities_persons"])
@@ -338,6 +376,12 @@ class TestDetectarLingua:
         assert result["language_detected"] == "en"
         assert result["language_match"] == 1
 
+    def test_usa_so_o_inicio_do_texto(self):
+        texto = "Este é um texto em português com várias palavras. " * 25
+        texto += "This is a much longer text written in English language. " * 100
+        result = detectar_lingua(texto, "portuguese")
+        assert result["language_detected"] == "pt"
+
     def test_texto_curto(self):
         result = detectar_lingua("Hi", "english")
         assert result["language_detected"] is None
@@ -401,6 +445,29 @@ class TestTransformarArtigo:
         assert result["link_valid"] == 1
         assert result["processed_at"] is not None
 
+    def test_nlp_limitado_mas_metricas_completas(self):
+        conteudo = "palavra " * 2000 + "Lisboa"
+        result = transformar_artigo({"article_id": "longo", "title": "Titulo", "content": conteudo})
+
+        assert result["word_count"] == 2002
+        # "Lisboa" esta depois do limite do texto NLP
+        assert "Lisboa" not in json.loads(result["entities_locations"])
+
+    def test_colunas_em_lote_iguais(self):
+        artigos = [
+            {"article_id": "a1", "title": "Governo anuncia plano", "pubDate": "2026-02-09 14:30:00",
+             "category": "Politics, top", "link": "https://www.publico.pt/x"},
+            {"article_id": "a2", "title": "Benfica vence", "pubDate": "2026-02-09T08:00:00Z",
+             "category": "sports", "link": "invalido"},
+            {"article_id": "a3", "title": "Sem data", "pubDate": None, "category": None, "link": None},
+        ]
+        for artigo, colunas in zip(artigos, calcular_colunas_lote(artigos)):
+            em_lote = transformar_artigo(artigo, colunas)
+            sozinho = transformar_artigo(artigo)
+            em_lote.pop("processed_at")
+            sozinho.pop("processed_at")
+            assert em_lote == sozinho
+
 
 # ============================================================================
 # TESTES DE PROCESSAMENTO SILVER
@@ -435,6 +502,67 @@ class TestProcessarSilver:
         assert row[1] == "sports"
         assert row[2] == "2026-02-09"
 
+    def test_erro_num_artigo_nao_trava_o_lote(self, conn_com_dados, monkeypatch):
+        from src.silver import transform
+
+        original = transform.transformar_artigo
+
+        def falha_no_primeiro(row, colunas=None, processed_at=None):
+            if row["article_id"] == "test001":
+                raise ValueError("falha simulada")
+            return original(row, colunas, processed_at)
+
+        monkeypatch.setattr(transform, "transformar_artigo", falha_no_primeiro)
+        assert processar_silver(conn_com_dados, verbose=False) == 1
+
+        cursor = conn_com_dados.execute("SELECT article_id FROM artigos_silver")
+        assert [row[0] for row in cursor.fetchall()] == ["test002"]
+
+    def test_paralelo_igual_ao_sequencial(self, conn_com_dados, monkeypatch):
+        monkeypatch.setattr("src.silver.transform.LIMIAR_PARALELO", 0)
+        assert processar_silver(conn_com_dados, verbose=False, workers=2) == 2
+
+        cursor = conn_com_dados.execute("""
+            SELECT article_id, title_clean, sentiment_label, category_primary
+            FROM artigos_silver ORDER BY article_id
+        """)
+        paralelo = cursor.fetchall()
+
+        conn_com_dados.execute("DELETE FROM artigos_silver")
+        processar_silver(conn_com_dados, verbose=False, workers=1)
+        cursor = conn_com_dados.execute("""
+            SELECT article_id, title_clean, sentiment_label, category_primary
+            FROM artigos_silver ORDER BY article_id
+        """)
+        assert cursor.fetchall() == paralelo
+
+    def test_carga_inicial_recria_indices(self, conn_com_dados):
+        sql = "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'artigos_silver' ORDER BY name"
+        antes = conn_com_dados.execute(sql).fetchall()
+        processar_silver(conn_com_dados, verbose=False)
+        assert conn_com_dados.execute(sql).fetchall() == antes
+
+    def test_commit_por_blocos(self, conn_com_dados, monkeypatch):
+        monkeypatch.setattr("src.silver.transform.TAMANHO_LOTE_COMMIT", 1)
+        assert processar_silver(conn_com_dados, verbose=False) == 2
+        assert not conn_com_dados.in_transaction
+
+        cursor = conn_com_dados.execute("SELECT COUNT(*) FROM artigos_silver")
+        assert cursor.fetchone()[0] == 2
+
+    def test_processed_at_unico_por_lote(self, conn_com_dados):
+        processar_silver(conn_com_dados, verbose=False)
+        cursor = conn_com_dados.execute("SELECT COUNT(DISTINCT processed_at) FROM artigos_silver")
+        assert cursor.fetchone()[0] == 1
+
+    def test_atualiza_estatisticas(self, conn_com_dados):
+        processar_silver(conn_com_dados, verbose=False)
+
+        cursor = conn_com_dados.execute(
+            "SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'artigos_silver'"
+        )
+        assert cursor.fetchone()[0] > 0
+
 
 class TestCriarTabelaSilver:
     """Testes para criação da tabela silver."""
@@ -455,6 +583,42 @@ class TestCriarTabelaSilver:
         }
         assert esperadas.issubset(colunas)
 
+    def test_indices_dashboard(self, conn):
+        cursor = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='artigos_silver'"
+        )
+        indices = {row[0] for row in cursor.fetchall()}
+        assert "idx_silver_recent" in indices
+        assert not {"idx_silver_dashboard", "idx_silver_pub_date", "idx_silver_date_title"} & indices
+
+    def test_refresh_gold_usa_indice_de_cobertura(self, conn):
+        cursor = conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT pub_date, source_id, category_primary, MAX(source_name),
+                   SUM(sentiment_polarity), SUM(sentiment_subjectivity), SUM(word_count)
+            FROM artigos_silver
+            WHERE pub_date IN ('2026-02-08', '2026-02-09')
+            GROUP BY pub_date, source_id, category_primary
+        """)
+        plano = " ".join(row[3] for row in cursor.fetchall())
+        assert "COVERING INDEX idx_silver_gold_covering" in plano
+
+    def test_trending_procura_pelo_indice_de_pub_date(self, conn):
+        cursor = conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT title_clean, source_id, category_primary, sentiment_polarity
+            FROM artigos_silver
+            WHERE pub_date = '2026-02-09' AND title_clean IS NOT NULL AND length(title_clean) >= 3
+        """)
+        plano = " ".join(row[3] for row in cursor.fetchall())
+        assert "SEARCH artigos_silver USING INDEX" in plano
+        assert "(pub_date=?)" in plano
+
+    def test_pendentes_usa_indice_da_chave_primaria(self, conn):
+        cursor = conn.execute("EXPLAIN QUERY PLAN " + SQL_ARTIGOS_PENDENTES)
+        plano = " ".join(row[3] for row in cursor.fetchall())
+        assert "USING COVERING INDEX sqlite_autoindex_artigos_silver_1" in plano
+
     def test_idempotente(self, conn):
         criar_tabela_silver(conn)  # Segunda vez
         cursor = conn.execute("SELECT COUNT(*) FROM artigos_silver")
@@ -4,6 +4,7 @@ Testes unitários para o módulo de Web Scraping da Wikipédia.
 Utiliza mocks para não fazer requests reais durante os testes.
 """
 
+import io
 import json
 import sqlite3
 import pytest
@@ -16,14 +17,19 @@ from src.bronze.wiki_scraper import (
     obter_aleatorias,
     extrair_titulos_de_urls,
     extrair_resumo,
+    extrair_resumos_em_lote,
     scrape_paginas,
     salvar_json_raw,
     resultados_to_dataframe,
     salvar_csv,
     criar_tabela_wiki,
+    criar_tabela_http_cache,
     carregar_na_db,
+    carregar_wiki_db,
     obter_urls,
     escolher_idioma,
+    obter_titulos,
+    main,
     MAX_PAGINAS,
 )
 
@@ -87,7 +93,7 @@ def temp_output(tmp_path):
 class TestPesquisarPorTema:
     """Testes para pesquisa por tema na Wikipédia."""
 
-    @patch("src.bronze.wiki_scraper.requests.get")
+    @patch("src.bronze.wiki_scraper.SESSION.get")
     def test_pesquisa_sucesso(self, mock_get):
         """Testa pesquisa com resultados."""
         mock_response = Mock()
@@ -106,7 +112,7 @@ class TestPesquisarPorTema:
         assert len(titulos) == 2
         assert "Python" in titulos
 
-    @patch("src.bronze.wiki_scraper.requests.get")
+    @patch("src.bronze.wiki_scraper.SESSION.get")
     def test_pesquisa_sem_resultados(self, mock_get):
         """Testa pesquisa sem resultados."""
         mock_response = Mock()
@@ -118,7 +124,7 @@ class TestPesquisarPorTema:
 
         assert titulos == []
 
-    @patch("src.bronze.wiki_scraper.requests.get")
+    @patch("src.bronze.wiki_scraper.SESSION.get")
     def test_pesquisa_respeita_limite(self, mock_get):
         """Testa que o limite máximo é respeitado."""
         mock_response = Mock()
@@ -140,7 +146,7 @@ class TestPesquisarPorTema:
 class TestObterAleatorias:
     """Testes para obtenção de páginas aleatórias."""
 
-    @patch("src.bronze.wiki_scraper.requests.get")
+    @patch("src.bronze.wiki_scraper.SESSION.get")
     def test_aleatorias_sucesso(self, mock_get):
         """Testa obtenção de páginas aleatórias."""
         mock_response = Mock()
@@ -161,7 +167,7 @@ class TestObterAleatorias:
         assert len(titulos) == 3
         assert "Artigo A" in titulos
 
-    @patch("src.bronze.wiki_scraper.requests.get")
+    @patch("src.bronze.wiki_scraper.SESSION.get")
     def test_aleatorias_respeita_limite(self, mock_get):
         """Testa que o limite máximo é respeitado."""
         mock_response = Mock()
@@ -196,6 +202,16 @@ class TestExtrairTitulosDeUrls:
 
         assert titulos[0] == "Linguagem de programação"
 
+    def test_url_com_query_e_mobile(self):
+        """Testa URLs com query string (fallback) e da versão móvel."""
+        urls = [
+            "https://pt.wikipedia.org/wiki/Lisboa?oldid=123",
+            "https://en.m.wikipedia.org/wiki/Linux/",
+        ]
+        titulos = extrair_titulos_de_urls(urls)
+
+        assert titulos == ["Lisboa", "Linux"]
+
     def test_url_invalido(self):
         """Testa que URLs inválidos são ignorados."""
         urls = ["https://example.com/pagina"]
@@ -210,6 +226,34 @@ class TestExtrairTitulosDeUrls:
 
         assert len(titulos) <= MAX_PAGINAS
 
+    def test_urls_repetidos(self):
+        """Testa que URLs repetidos dão um só título, pela ordem original."""
+        urls = [
+            "https://pt.wikipedia.org/wiki/Lisboa",
+            "https://pt.wikipedia.org/wiki/Porto",
+            "https://pt.wikipedia.org/wiki/Lisboa",
+        ]
+        titulos = extrair_titulos_de_urls(urls)
+
+        assert titulos == ["Lisboa", "Porto"]
+
+
+class TestObterTitulos:
+    """Testes para a obtenção de títulos por modo (sem menu)."""
+
+    def test_modo_urls(self):
+        titulos = obter_titulos("urls", TEST_API_URL, urls=["https://pt.wikipedia.org/wiki/Lisboa"])
+        assert titulos == ["Lisboa"]
+
+    def test_tema_vazio(self):
+        with pytest.raises(ValueError):
+            obter_titulos("tema", TEST_API_URL, tema="")
+
+    @patch("src.bronze.wiki_scraper.obter_aleatorias", return_value=["A", "B"])
+    def test_modo_aleatorio(self, mock_aleatorias):
+        assert obter_titulos("aleatorio", TEST_API_URL) == ["A", "B"]
+        mock_aleatorias.assert_called_once_with(TEST_API_URL)
+
 
 # ============================================================================
 # TESTES DE EXTRAÇÃO DE RESUMO
@@ -218,7 +262,7 @@ class TestExtrairTitulosDeUrls:
 class TestExtrairResumo:
     """Testes para extração de resumo de uma página."""
 
-    @patch("src.bronze.wiki_scraper.requests.get")
+    @patch("src.bronze.wiki_scraper.SESSION.get")
     def test_extrair_sucesso(self, mock_get, mock_resumo):
         """Testa extração bem-sucedida."""
         mock_response = Mock()
@@ -232,7 +276,7 @@ class TestExtrairResumo:
         assert resultado["titulo"] == "Python (linguagem de programação)"
         assert "alto nível" in resultado["resumo"]
 
-    @patch("src.bronze.wiki_scraper.requests.get")
+    @patch("src.bronze.wiki_scraper.SESSION.get")
     def test_extrair_erro(self, mock_get):
         """Testa tratamento de erro na extração."""
         import requests as req
@@ -243,6 +287,107 @@ class TestExtrairResumo:
         assert resultado is None
 
 
+class TestExtrairResumosEmLote:
+    """Testes para a extração de resumos num só pedido."""
+
+    @pytest.fixture
+    def resposta_lote(self):
+        return {
+            "query": {
+                "normalized": [{"from": "python", "to": "Python"}],
+                "redirects": [{"from": "Python", "to": "Python (linguagem de programação)"}],
+                "pages": {
+                    "12345": {
+                        "pageid": 12345,
+                        "title": "Python (linguagem de programação)",
+                        "extract": "Python é uma linguagem de programação.",
+                        "fullurl": "https://pt.wikipedia.org/wiki/Python",
+                    },
+                    "-1": {"title": "Inexistente", "missing": ""},
+                },
+            }
+        }
+
+    @patch("src.bronze.wiki_scraper.SESSION.get")
+    def test_segue_normalizacao_e_redirects(self, mock_get, resposta_lote):
+        """Testa que os títulos pedidos são mapeados para as páginas finais."""
+        mock_get.return_value = Mock(raise_for_status=Mock(), json=Mock(return_value=resposta_lote))
+
+        resumos = extrair_resumos_em_lote(["python", "Inexistente"], TEST_API_URL)
+
+        assert list(resumos) == ["python"]
+        assert resumos["python"]["pageid"] == 12345
+        assert mock_get.call_count == 1
+        assert mock_get.call_args.kwargs["params"]["titles"] == "python|Inexistente"
+
+    @patch("src.bronze.wiki_scraper.extrair_resumo")
+    @patch("src.bronze.wiki_scraper.SESSION.get")
+    def test_scrape_usa_rest_so_para_em_falta(self, mock_get, mock_extrair, resposta_lote):
+        """Testa que a REST API só é usada para títulos fora do lote."""
+        mock_get.return_value = Mock(raise_for_status=Mock(), json=Mock(return_value=resposta_lote))
+        mock_extrair.return_value = None
+
+        resultados = scrape_paginas(["python", "Inexistente"], TEST_REST_URL, api_url=TEST_API_URL)
+
+        assert len(resultados) == 1
+        mock_extrair.assert_called_once_with("Inexistente", TEST_REST_URL, None)
+
+
+class TestSessao:
+    """Testes para a configuração da sessão HTTP."""
+
+    def test_retry_em_erros_transitorios(self):
+        from src.bronze.wiki_scraper import SESSION
+
+        retry = SESSION.get_adapter("https://pt.wikipedia.org").max_retries
+        assert retry.total == 3
+        assert {429, 503} <= set(retry.status_forcelist)
+        assert retry.respect_retry_after_header
+
+
+class TestCacheHttp:
+    """Testes para os pedidos condicionais (ETag / Last-Modified)."""
+
+    @pytest.fixture
+    def cache_db(self, tmp_path):
+        """Base de dados com a tabela http_cache (criada uma vez, como no main)."""
+        cache_db = tmp_path / "wiki.db"
+        conn = sqlite3.connect(cache_db)
+        criar_tabela_http_cache(conn)
+        conn.close()
+        return cache_db
+
+    @patch("src.bronze.wiki_scraper.SESSION.get")
+    def test_revalida_com_etag(self, mock_get, mock_resumo, cache_db):
+        """Testa que o segundo pedido envia If-None-Match e usa a cache no 304."""
+        resposta_200 = Mock(status_code=200, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        resposta_200.content = json.dumps(mock_resumo).encode("utf-8")
+        resposta_200.json.return_value = mock_resumo
+        resposta_304 = Mock(status_code=304, headers={})
+        mock_get.side_effect = [resposta_200, resposta_304]
+
+        primeiro = extrair_resumo("Python", TEST_REST_URL, cache_db)
+        segundo = extrair_resumo("Python", TEST_REST_URL, cache_db)
+
+        assert primeiro == segundo
+        headers = mock_get.call_args_list[1].kwargs["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        resposta_304.json.assert_not_called()
+
+    @patch("src.bronze.wiki_scraper.SESSION.get")
+    def test_primeiro_pedido_sem_validadores(self, mock_get, mock_resumo, cache_db):
+        """Testa que sem cache o pedido não leva cabeçalhos condicionais."""
+        resposta = Mock(status_code=200, headers={})
+        resposta.content = json.dumps(mock_resumo).encode("utf-8")
+        resposta.json.return_value = mock_resumo
+        mock_get.return_value = resposta
+
+        extrair_resumo("Python", TEST_REST_URL, cache_db)
+
+        assert mock_get.call_args.kwargs["headers"] == {}
+
+
 # ============================================================================
 # TESTES DE SCRAPING COMPLETO
 # ============================================================================
@@ -265,6 +410,17 @@ class TestScrapePaginas:
         assert len(resultados) == 3
         assert all("timestamp_scrape" in r for r in resultados)
 
+    @patch("src.bronze.wiki_scraper.extrair_resumo")
+    def test_scrape_timestamp_da_execucao(self, mock_extrair):
+        """Testa que o timestamp passado é usado em todas as páginas."""
+        mock_extrair.side_effect = lambda titulo, rest_url, cache_db=None: {
+            "titulo": titulo, "resumo": "R", "url": "", "pageid": titulo,
+        }
+
+        resultados = scrape_paginas(["A", "B"], TEST_REST_URL, timestamp="2024-01-15T10:30:00+00:00")
+
+        assert {r["timestamp_scrape"] for r in resultados} == {"2024-01-15T10:30:00+00:00"}
+
     @patch("src.bronze.wiki_scraper.extrair_resumo")
     def test_scrape_com_falhas(self, mock_extrair):
         """Testa que falhas individuais não bloqueiam o pipeline."""
@@ -278,6 +434,46 @@ class TestScrapePaginas:
 
         assert len(resultados) == 2
 
+    @patch("src.bronze.wiki_scraper.extrair_resumo")
+    def test_scrape_mantem_ordem(self, mock_extrair):
+        """Testa que os pedidos paralelos mantêm a ordem dos títulos."""
+        import time
+
+        def resumo_lento(titulo, rest_url, cache_db=None):
+            time.sleep(0.05 if titulo == "Primeira" else 0)
+            return {"titulo": titulo, "resumo": "R", "url": "", "pageid": titulo}
+
+        mock_extrair.side_effect = resumo_lento
+
+        resultados = scrape_paginas(["Primeira", "Segunda", "Terceira"], TEST_REST_URL)
+
+        assert [r["titulo"] for r in resultados] == ["Primeira", "Segunda", "Terceira"]
+
+    @patch("src.bronze.wiki_scraper.extrair_resumo")
+    def test_scrape_limita_concorrencia(self, mock_extrair):
+        """Testa que nunca há mais pedidos em simultâneo que o limite."""
+        import threading
+        import time
+
+        lock = threading.Lock()
+        estado = {"activos": 0, "maximo": 0}
+
+        def resumo(titulo, rest_url, cache_db=None):
+            with lock:
+                estado["activos"] += 1
+                estado["maximo"] = max(estado["maximo"], estado["activos"])
+            time.sleep(0.02)
+            with lock:
+                estado["activos"] -= 1
+            return {"titulo": titulo, "resumo": "R", "url": "", "pageid": titulo}
+
+        mock_extrair.side_effect = resumo
+
+        resultados = scrape_paginas([f"P{i}" for i in range(6)], TEST_REST_URL, concurrency=2)
+
+        assert len(resultados) == 6
+        assert estado["maximo"] <= 2
+
     @patch("src.bronze.wiki_scraper.extrair_resumo")
     def test_scrape_respeita_limite(self, mock_extrair):
         """Testa que o limite de 10 páginas é respeitado."""
@@ -314,16 +510,17 @@ class TestSalvarFicheiros:
 
     def test_salvar_csv(self, mock_resultados, temp_output):
         """Testa salvar CSV."""
-        df = pd.DataFrame(mock_resultados)
         timestamp = "20240115T103000Z"
 
-        path = salvar_csv(df, temp_output, timestamp)
+        path = salvar_csv(mock_resultados, temp_output, timestamp)
 
         assert path.exists()
         assert path.name == f"wiki_scrape_tabular_{timestamp}.csv"
 
         loaded = pd.read_csv(path)
         assert len(loaded) == 2
+        assert list(loaded.columns) == ["titulo", "resumo", "url", "pageid", "timestamp_scrape"]
+        assert loaded.iloc[0]["titulo"] == "Python (linguagem de programação)"
 
 
 # ============================================================================
@@ -380,6 +577,15 @@ class TestIdioma:
         idioma = escolher_idioma()
         assert idioma == "en"
 
+    @patch("builtins.input")
+    def test_sem_terminal_nao_pede_input(self, mock_input, monkeypatch):
+        """Testa que sem terminal e sem --modo falha em vez de bloquear."""
+        monkeypatch.setattr("sys.argv", ["wiki_scraper"])
+        monkeypatch.setattr("sys.stdin", io.StringIO())
+
+        assert main() == 1
+        mock_input.assert_not_called()
+
 
 # ============================================================================
 # TESTES DE BASE DE DADOS SQLITE
@@ -429,6 +635,26 @@ class TestBaseDeDados:
         assert row[0] == "Python (linguagem de programação)"
         assert row[1] == "aleatorio"
 
+    def test_loaded_at_da_execucao(self, conn, mock_resultados):
+        """Testa que o loaded_at passado é usado em todas as linhas."""
+        carregar_na_db(conn, mock_resultados, "tema", loaded_at="2024-01-15 10:30:00")
+
+        cursor = conn.execute("SELECT DISTINCT loaded_at FROM paginas")
+        assert cursor.fetchall() == [("2024-01-15 10:30:00",)]
+
+    def test_carregar_wiki_db_em_thread(self, tmp_path, mock_resultados):
+        """Testa a carga com conexão própria, a partir de outra thread."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        db_path = tmp_path / "wiki.db"
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            inseridos = executor.submit(carregar_wiki_db, db_path, mock_resultados, "tema").result()
+
+        assert inseridos == 2
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM paginas").fetchone()[0] == 2
+        conn.close()
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])